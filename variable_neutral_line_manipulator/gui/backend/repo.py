@@ -13,6 +13,7 @@ class Repo(metaclass=Singleton):
             outer_diameter=5,
         )
         self._manipulator_model = ManipulatorMathModel()
+        self._solver_session = SolverSession(self._manipulator_model, SolverType.DIRECT)
         self._tension_inputs = TensionInputListDisplayModel()
         
     def publish_init_segments_config(self, *args):
@@ -67,6 +68,6 @@ class Repo(metaclass=Singleton):
 
     def computeTensions(self, *args):
         Logger.D("Compute tensions")
-        manipulator_state = eval_manipulator_state(self._manipulator_model, self._tension_inputs.to_pure_values(), solver_type=SolverType.DIRECT)
+        manipulator_state = self._solver_session.solve(self._tension_inputs.to_pure_values())
         return manipulator_state
     
\ No newline at end of file
@@ -16,22 +16,17 @@ def format_manipulator(manipulator_state:ManipulatorState):
     s = "Bottom joint angles (deg):\n"
     for i, disk_state in enumerate(manipulator_state.disk_states):
         s += f" {i+1}: {round_val(degrees(disk_state.bottom_joint_angle))}\n"
-        
-    s += "\nTransformation matrices (Base-disk-orientation):\n"
-    for i in range(len(manipulator_state.disk_states)+1):
-        s+=f"{i}:\nBottom:\n"
-        s+=str(round_val(manipulator_state.get_TF(i,"b","bd")))
-        s+="\nTop:\n"
-        s+=str(round_val(manipulator_state.get_TF(i,"t","bd")))
-        s+="\n"
-        
-    s += "\nTransformation matrices (Bottom-curvature-orientation):\n"
-    for i in range(len(manipulator_state.disk_states)+1):
-        s+=f"{i}:\nBottom:\n"
-        s+=str(round_val(manipulator_state.get_TF(i,"b","bc")))
-        s+="\nTop:\n"
-        s+=str(round_val(manipulator_state.get_TF(i,"t","bc")))
-        s+="\n"
+    
+    # (n_disks, side, frame, 4, 4)
+    TFs = round_val(manipulator_state.TFs)
+    for title, frame_sys in (("Base-disk-orientation", "bd"), ("Bottom-curvature-orientation", "bc")):
+        s += f"\nTransformation matrices ({title}):\n"
+        for i, tf in enumerate(TFs[:, :, TF_FRAME_SYSS.index(frame_sys)]):
+            s+=f"{i}:\nBottom:\n"
+            s+=str(tf[TF_SIDES.index("b")])
+            s+="\nTop:\n"
+            s+=str(tf[TF_SIDES.index("t")])
+            s+="\n"
     return s
 
 class StateManagement(metaclass=Singleton):
@@ -93,9 +93,10 @@ def plotRingDF(ax, ring: RingPlotGeometry, transform=np.identity(4), radialDivis
 
 
 def plot_TFs(ax, manipulator_state: ManipulatorState, max_ranges:Range3d, ref_frame_sys="bd"):
-    for i in range(len(manipulator_state.model.disks)):
-        tf_lower = manipulator_state.get_TF(i, "b", "bd")
-        tf_upper = manipulator_state.get_TF(i, "t", "bd")
+    disks = manipulator_state.model.disks
+    TFs = manipulator_state.TFs
+    for tf_lower, tf_upper in zip(TFs[:, TF_SIDES.index("b"), TF_FRAME_SYSS.index("bd")], 
+                                  TFs[:, TF_SIDES.index("t"), TF_FRAME_SYSS.index("bd")]):
         plot_args = {
             "xs": (tf_lower[0, 3], tf_upper[0, 3]),
             "ys": (tf_lower[1, 3], tf_upper[1, 3]),
@@ -107,9 +108,8 @@ def plot_TFs(ax, manipulator_state: ManipulatorState, max_ranges:Range3d, ref_fr
     if not ref_frame_sys:
         return
     
-    for i in range(len(manipulator_state.model.disks)):
-        tf = manipulator_state.get_TF(i, "b", ref_frame_sys)
-        _plot_frame(ax, tf, manipulator_state.model.disks[i].length*0.2)
+    for d, tf in zip(disks, TFs[:, TF_SIDES.index("b"), TF_FRAME_SYSS.index(ref_frame_sys)]):
+        _plot_frame(ax, tf, d.length*0.2)
 
 
 def _plot_frame(ax, tf, length):
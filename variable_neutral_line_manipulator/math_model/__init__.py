@@ -1,2 +1,13 @@
 from .models import *
 from .solver import *
+from .batch import *
+from .session import *
+from .inverse import *
+from .workspace import *
+from .compact import *
+from .sweep import *
+from .stream import *
+from .tendon import *
+from .kinematics import *
+from .load import *
+from .sensitivity import *
@@ -0,0 +1,455 @@
+from math import pi
+
+import numpy as np
+
+from .models import *
+from .calculation import *
+from .plan import *
+from .solver import ManipulatorState, _generate_disk_states, _rotate_columns
+from .load import ExternalLoad, eval_disk_loads
+
+
+def _solve_half_joint_angles_batch(P, Q, R):
+    """
+        Half bottom joint angles solving P*sin + Q*cos + R = 0, with the same branch selection as solve_direct
+        NaN where no root exists (|R| > sqrt(P**2+Q**2)), as solve_direct returns None
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        norm = np.sqrt(P**2 + Q**2)
+        phase = np.arctan(Q/P)
+        half_joint_angle = np.arcsin(R/norm) - phase
+        is_other_branch = np.abs(P*np.sin(half_joint_angle) + Q*np.cos(half_joint_angle) + R) > 1**-10
+        half_joint_angle = np.where(is_other_branch, np.arcsin(-R/norm) - phase, half_joint_angle)
+    has_no_root = (P != 0.0) & (np.abs(R) > norm)
+    half_joint_angle[np.isnan(half_joint_angle) | (P == 0.0)] = 0.0
+    half_joint_angle[has_no_root] = np.nan
+    return half_joint_angle
+
+
+def _solve_direct_batch(plan: SolvePlan, disk_index, tensions: np.ndarray, top_vec: np.ndarray):
+    """
+        Vectorised counterpart of solve_direct over N inputs
+        tensions: (N, n_tendons), top_vec: (N, 6)
+        return (N,) bottom joint angles, (N, 6) bottom contact reactions [force, total moment] in disk frame
+    """
+    start = plan.tendon_starts[disk_index]
+    length = plan.lengths[disk_index]
+    r = plan.bottom_curve_radii[disk_index]
+    
+    # Columns: sum of tensions, sums of tension-weighted x, y, z displacements of bottom guide ends
+    active_tensions = tensions[:, start:]
+    w = np.concatenate((np.sum(active_tensions, axis=1)[:, np.newaxis], 
+                        np.dot(active_tensions, plan.bottom_guide_disps[disk_index, start:])), axis=1)
+
+    # Refers to the note in solve_direct
+    P = r*top_vec[:, 2] + (length/2 - r)*w[:, 0] + w[:, 3]
+    Q = -r*top_vec[:, 1] - w[:, 2]
+    R = top_vec[:, 1]*(r - length/2) + top_vec[:, 3]
+
+    half_joint_angle = _solve_half_joint_angles_batch(P, Q, R)
+
+    # Sum of bottom guide force and moment components in closed form
+    s = np.sin(half_joint_angle)
+    c = np.cos(half_joint_angle)
+    bottom_guide_vecDF = np.stack((
+        np.zeros_like(s),
+        -w[:, 0]*s,
+        -w[:, 0]*c,
+        -w[:, 2]*c + w[:, 3]*s,
+        w[:, 1]*c,
+        -w[:, 1]*s
+    ), axis=1)
+
+    return 2*half_joint_angle, -top_vec - bottom_guide_vecDF
+
+
+def _eval_proximal_disk_top_components_batch(plan: SolvePlan, disk_index, tensions: np.ndarray, bottom_joint_angles: np.ndarray, bottom_contact_reactionsDF: np.ndarray,
+                                             proximal_disk_loadsDF: np.ndarray = None):
+    """
+        Vectorised counterpart of eval_proximal_disk_top_components over N states
+    """
+    proximal_index = disk_index - 1
+    top_orientationDF = plan.top_orientationsDF[proximal_index]
+
+    # distalToProximalFrame, applied to force and total moment at once
+    contact = distalToProximalFrameArray(bottom_contact_reactionsDF.reshape(-1, 2, 3), 
+                                         bottom_joint_angles[:, np.newaxis], top_orientationDF).reshape(-1, 6)
+
+    # All top guide forces share the same direction, so the tendons reduce to tension-weighted sums
+    start = plan.tendon_starts[disk_index]
+    active_tensions = tensions[:, start:]
+    u = evalTopGuideForceArray(1.0, bottom_joint_angles, top_orientationDF)
+    sum_tensions = np.sum(active_tensions, axis=1)
+    sum_disps = np.dot(active_tensions, plan.top_guide_disps[proximal_index, start:])
+
+    top_vec = contact + np.concatenate((sum_tensions[:, np.newaxis]*u, np.cross(sum_disps, u)), axis=1)
+    if proximal_disk_loadsDF is not None:
+        top_vec += proximal_disk_loadsDF
+    return top_vec
+
+
+def _eval_joint_angles_batch(plan: SolvePlan, tensions: np.ndarray, with_contact_reactions=False, disk_loads: np.ndarray = None):
+    """
+        disk_loads: (N, n_disks-1, 6) external loads in disk frame, see _solve_statics
+    """
+    if plan.has_friction:
+        raise NotImplementedError("Friction is not supported by batch solvers, solve with eval_manipulator_state instead")
+    n = tensions.shape[0]
+    joint_angles = np.zeros((n, plan.n_disks-1))
+    contact_reactions = np.zeros((n, plan.n_disks-1, 6)) if with_contact_reactions else None
+
+    top_vec = np.zeros((n, 6)) if disk_loads is None else disk_loads[:, -1].copy()
+    for i in range(plan.n_disks-1, 0, -1):
+        joint_angles[:, i-1], bottom_contact_reactionsDF = _solve_direct_batch(plan, i, tensions, top_vec)
+        if with_contact_reactions:
+            contact_reactions[:, i-1] = bottom_contact_reactionsDF
+        if i > 1:
+            top_vec = _eval_proximal_disk_top_components_batch(plan, i, tensions, joint_angles[:, i-1], bottom_contact_reactionsDF,
+                                                               None if disk_loads is None else disk_loads[:, i-2])
+
+    if with_contact_reactions:
+        return joint_angles, contact_reactions
+    return joint_angles
+
+
+def _eval_joint_angles_loaded_batch(plan: SolvePlan, tensions: np.ndarray, external_load: ExternalLoad, 
+                                    fixed_point_threshold=0.0000000001, max_fixed_point_iterations=100, anderson_depth=5, mixing=0.7, 
+                                    restart_ratio=4.0):
+    """
+        Vectorised counterpart of the fixed point iteration of _solve_statics_fixed_point with an external load, over N load cases
+        tensions: (N, n_tendons), external_load: batch shape () or (N,)
+        return (N, n_disks-1) bottom joint angles and (N, n_disks-1, 6) bottom contact reactions, 
+               NaN for load cases not converged or not balanced by the tensions
+    """
+    n = tensions.shape[0]
+    x = np.zeros((n, plan.n_disks-1))
+    is_failed = np.zeros(n, dtype=bool)
+    dxs = []
+    dfs = []
+    x_prev = f_prev = None
+    for n_iterations in range(max_fixed_point_iterations+1):
+        disk_loads = np.broadcast_to(eval_disk_loads(plan, external_load, _eval_TFs_DF_batch(plan, x)), (n, plan.n_disks-1, 6))
+        joint_angles, contact_reactions = _eval_joint_angles_batch(plan, tensions, True, disk_loads)
+        f = joint_angles - x
+        # Load cases the tensions cannot balance (NaN joint angles, see _solve_half_joint_angles_batch) are dropped
+        is_failed |= np.any(np.isnan(f), axis=1)
+        is_converged = (np.max(np.abs(f), axis=1, initial=0.0) <= fixed_point_threshold) & ~is_failed
+        if np.all(is_converged | is_failed) or n_iterations == max_fixed_point_iterations:
+            break
+        
+        # Anderson mixing of each load case, converged and failed ones are kept in place
+        # Zeroed differences drop out of the least squares, restarting the mixing of the load cases whose residual jumped
+        f[is_converged | is_failed] = 0.0
+        if f_prev is not None:
+            is_restarted = np.linalg.norm(f, axis=1) > restart_ratio*np.linalg.norm(f_prev, axis=1)
+            for dx, df in zip(dxs, dfs):
+                dx[is_restarted] = 0.0
+                df[is_restarted] = 0.0
+            dxs.append(np.where(is_restarted[:, np.newaxis], 0.0, x - x_prev))
+            dfs.append(np.where(is_restarted[:, np.newaxis], 0.0, f - f_prev))
+            if len(dfs) > anderson_depth:
+                dxs.pop(0)
+                dfs.pop(0)
+        x_prev, f_prev = x, f
+        step = mixing*f
+        if dfs:
+            dX = np.stack(dxs, axis=2)
+            dF = np.stack(dfs, axis=2)
+            step -= np.matmul(dX + mixing*dF, np.matmul(np.linalg.pinv(dF), f[..., np.newaxis]))[..., 0]
+        x = np.clip(x + step, -pi/2, pi/2)
+    joint_angles[~is_converged] = np.nan
+    contact_reactions[~is_converged] = np.nan
+    return joint_angles, contact_reactions
+
+
+def eval_manipulator_state_batch(manipulator_model: ManipulatorMathModel, tensions, with_contact_reactions=False, 
+                                 external_load: ExternalLoad = None, fixed_point_threshold=0.0000000001, max_fixed_point_iterations=100):
+    """
+        Evaluate the bottom joint angles of N tension inputs at once with the direct solver
+        tensions: (N, n_tendons) array, each row being the tension inputs flattened in the order of ManipulatorMathModel.tendons
+        external_load: ExternalLoad of N load cases (batch shape (N,)), or of one load case for all tension inputs. 
+                       Tensions of a single input, (n_tendons,) or (1, n_tendons), are shared by all load cases, e.g. for stiffness maps
+        fixed_point_threshold, max_fixed_point_iterations: see eval_manipulator_state
+        return (N, n_disks-1) bottom joint angles,
+               and (N, n_disks-1, 6) bottom contact reactions [force, total moment] in disk frame if with_contact_reactions
+               Load cases not converged within max_fixed_point_iterations are NaN
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+
+    tensions = np.asarray(tensions, dtype=float)
+    if tensions.ndim == 1:
+        tensions = tensions[np.newaxis, :]
+    if tensions.shape[1] != plan.n_tendons:
+        raise ValueError(f"Expect {plan.n_tendons} tensions per input, but got {tensions.shape[1]}")
+    if external_load is None:
+        return _eval_joint_angles_batch(plan, tensions, with_contact_reactions)
+    
+    batch_shape = external_load.batch_shape
+    if len(batch_shape) > 1:
+        raise ValueError(f"Expect load cases of batch shape () or (N,), but got {batch_shape}")
+    n = np.broadcast_shapes(tensions.shape[:1], batch_shape)[0]
+    joint_angles, contact_reactions = _eval_joint_angles_loaded_batch(plan, np.broadcast_to(tensions, (n, plan.n_tendons)), external_load,
+                                                                      fixed_point_threshold, max_fixed_point_iterations)
+    if with_contact_reactions:
+        return joint_angles, contact_reactions
+    return joint_angles
+
+
+class ManipulatorJacobian:
+    """
+        Joint angles and tip transformation (top of end disk, base-disk-orientation) of the direct solver,
+        with their derivatives w.r.t. the tensions indexed by tendon
+        Attributes may carry leading batch dimensions
+    """
+    def __init__(self, joint_angles, joint_angle_jacobian, tip_TF, tip_TF_jacobian):
+        self.joint_angles = joint_angles                    # (n_disks-1,)
+        self.joint_angle_jacobian = joint_angle_jacobian    # (n_disks-1, n_tendons)
+        self.tip_TF = tip_TF                                # (4, 4)
+        self.tip_TF_jacobian = tip_TF_jacobian              # (4, 4, n_tendons)
+        
+    @property
+    def tip_position_jacobian(self):
+        return self.tip_TF_jacobian[..., :3, 3, :]
+
+
+def _eval_guide_weights(plan: SolvePlan, guide_disps: np.ndarray):
+    """
+        (n_disks, n_tendons, 4) derivatives of [sum of tensions, sums of tension-weighted guide disps] of each disk w.r.t. tensions
+        guide_disps: (n_disks, n_tendons, 3), 0 for the tendons not through the disk
+    """
+    weights = np.empty((plan.n_disks, plan.n_tendons, 4))
+    weights[..., 0] = np.arange(plan.n_tendons)[np.newaxis, :] >= plan.tendon_starts[:, np.newaxis]
+    weights[..., 1:] = guide_disps
+    return weights
+
+
+def _stack_tangent_lanes(tensions, weights):
+    """
+        (N, n_disks, 1+n_tendons, 4) lanes of the weighted sums of each disk: 
+        lane 0 their values for (N, n_tendons) tensions, lane 1+k their derivatives w.r.t. tension k
+    """
+    lanes = np.empty((tensions.shape[0], weights.shape[0], 1 + weights.shape[1], 4))
+    lanes[:, :, 0] = np.einsum("nk,ikc->nic", tensions, weights)
+    lanes[:, :, 1:] = weights
+    return lanes
+
+
+# Entries (row, column, coefficients of [sin, cos, 1, sin(2*), cos(2*)] of the half joint angle) of the matrices of _eval_jacobian_batch
+_BOTTOM_GUIDE_ENTRIES = (
+    # [sum of tensions, sums of tension-weighted disps] to bottom guide components (see _solve_direct_batch), and its derivative
+    (0, 1, (-1, 0, 0, 0, 0)), (0, 2, (0, -1, 0, 0, 0)), (1, 4, (0, 1, 0, 0, 0)), (1, 5, (-1, 0, 0, 0, 0)), (2, 3, (0, -1, 0, 0, 0)), (3, 3, (1, 0, 0, 0, 0)),
+    (0, 7, (0, -1, 0, 0, 0)), (0, 8, (1, 0, 0, 0, 0)), (1, 10, (-1, 0, 0, 0, 0)), (1, 11, (0, -1, 0, 0, 0)), (2, 9, (1, 0, 0, 0, 0)), (3, 9, (0, 1, 0, 0, 0)),
+)
+_JOINT_ROTATION_ENTRIES = (
+    # Transposed rotation about x by the joint angle, and its derivative
+    (0, 0, (0, 0, 1, 0, 0)), (1, 1, (0, 0, 0, 0, 1)), (1, 2, (0, 0, 0, 1, 0)), (2, 1, (0, 0, 0, -1, 0)), (2, 2, (0, 0, 0, 0, 1)),
+    (1, 4, (0, 0, 0, -1, 0)), (1, 5, (0, 0, 0, 0, 1)), (2, 4, (0, 0, 0, 0, -1)), (2, 5, (0, 0, 0, -1, 0)),
+)
+
+
+def _eval_jacobian_constants(plan: SolvePlan):
+    """
+        Tension-independent arrays of _eval_jacobian_batch, to be reused across calls with the same plan:
+        guide weights (see _eval_guide_weights) of the bottom guides and of the top guides of the proximal disk, 
+        (n_disks, 6, 3) and (n_disks, 4, 3) coefficients of [P, Q, R] of _solve_direct_batch w.r.t. the top components and the bottom weighted sums,
+        and per-disk matrices of the recursion as coefficients of [sin, cos, 1, sin(2*), cos(2*)] of the half bottom joint angle, 
+        to be evaluated with a single product per disk: of (4, 12) bottom guide matrices, and of (3, 6) joint rotation matrices 
+        (with the top rotation) and (4, 12) top guide matrices of each disk as the proximal disk
+    """
+    bottom_weights = _eval_guide_weights(plan, plan.bottom_guide_disps)
+    # Indexed by the distal disk, as the tendons through it
+    top_weights = _eval_guide_weights(plan, np.concatenate((np.zeros((1, plan.n_tendons, 3)), plan.top_guide_disps[:-1])))
+    
+    pqr_top = np.zeros((plan.n_disks, 6, 3))
+    pqr_top[:, 2, 0] = plan.bottom_curve_radii
+    pqr_top[:, 1, 1] = -plan.bottom_curve_radii
+    pqr_top[:, 1, 2] = plan.bottom_curve_radii - plan.lengths/2
+    pqr_top[:, 3, 2] = 1.0
+    pqr_weights = np.zeros((plan.n_disks, 4, 3))
+    pqr_weights[:, 0, 0] = plan.lengths/2 - plan.bottom_curve_radii
+    pqr_weights[:, 3, 0] = 1.0
+    pqr_weights[:, 2, 1] = -1.0
+    
+    bottom_guide = np.zeros((5, 4, 12))
+    for row, col, coefficients in _BOTTOM_GUIDE_ENTRIES:
+        bottom_guide[:, row, col] = coefficients
+    
+    rotation = np.zeros((5, 3, 6))
+    for row, col, coefficients in _JOINT_ROTATION_ENTRIES:
+        rotation[:, row, col] = coefficients
+    # (Rz*Rx)^T = Rx^T*Rz^T, Rz of the top orientation of the proximal disk
+    rotations = np.matmul(rotation.reshape(1, 5, 3, 2, 3), np.swapaxes(plan.top_rotationsDF, 1, 2)[:, np.newaxis, np.newaxis]).reshape(-1, 5, 3, 6)
+    
+    # Top guide force direction u (see evalTopGuideForceArray) and its derivative, 
+    # applied to [sum of tensions, sums of tension-weighted disps] as [sum*u, disps x u]
+    u = np.zeros((plan.n_disks, 5, 2, 3))
+    sin_orientations = np.sin(plan.top_orientationsDF)[:, np.newaxis]
+    cos_orientations = np.cos(plan.top_orientationsDF)[:, np.newaxis]
+    u[:, 0, 0] = u[:, 1, 1] = np.concatenate((sin_orientations, -cos_orientations, np.zeros_like(sin_orientations)), axis=1)
+    u[:, 1, 0, 2] = 1.0
+    u[:, 0, 1, 2] = -1.0
+    top_guide = np.zeros((plan.n_disks, 5, 4, 12))
+    for k in range(2):
+        top_guide[..., 0, 6*k:6*k+3] = u[:, :, k]
+        # Rows of the skew-symmetric matrix, so that disps @ matrix = disps x u
+        top_guide[..., 1, 6*k+4], top_guide[..., 1, 6*k+5] = -u[:, :, k, 2], u[:, :, k, 1]
+        top_guide[..., 2, 6*k+3], top_guide[..., 2, 6*k+5] = u[:, :, k, 2], -u[:, :, k, 0]
+        top_guide[..., 3, 6*k+3], top_guide[..., 3, 6*k+4] = -u[:, :, k, 1], u[:, :, k, 0]
+    return (bottom_weights, top_weights, pqr_top, pqr_weights, 
+            bottom_guide.reshape(5, -1), rotations.reshape(plan.n_disks, 5, -1), top_guide.reshape(plan.n_disks, 5, -1))
+
+
+def _eval_TFs_DF_batch(plan: SolvePlan, joint_angles: np.ndarray):
+    """
+        Vectorised counterpart of eval_TFs_DF over (N, n_disks-1) bottom joint angles
+        return (N, n_disks, 4, 4) transformations from the top of the base frame to the bottom of each disk, in bottom-curvature-orientation
+    """
+    TFs_DF = np.empty((joint_angles.shape[0], plan.n_disks, 4, 4))
+    TFs_DF[:, 0] = np.identity(4)
+    for i in range(1, plan.n_disks):
+        np.matmul(np.matmul(TFs_DF[:, i-1], plan.top_TFsDF[i-1]),
+                  evalTFProximalTopToDistalBottomArray(joint_angles[:, i-1], plan.top_curve_radii[i-1]), out=TFs_DF[:, i])
+    return TFs_DF
+
+
+
+def _eval_tip_TF_derivatives_batch(plan: SolvePlan, joint_angles: np.ndarray):
+    """
+        Tip transformations of (N, n_disks-1) bottom joint angles as eval_tip_TF, 
+        with their derivatives w.r.t. each joint angle as angular and linear velocities in base-disk-orientation:
+        the derivative of the tip rotation is skew(axis)*rotation, and of the tip translation velocity + axis x translation
+        return (N, 4, 4) tip transformations, (N, n_disks-1, 3) joint axes, (N, n_disks-1, 3) velocities
+    """
+    n = joint_angles.shape[0]
+    # Rotations of the frames before each joint, only the rotations are accumulated in turn
+    rotations = np.tile(np.identity(3), (n, 1, 1))
+    joint_rotations = np.empty((n, plan.n_disks-1, 3, 3))
+    for i in range(plan.n_disks-1):
+        _rotate_columns(rotations, 0, 1, plan.top_orientationsDF[i])
+        joint_rotations[:, i] = rotations
+        _rotate_columns(rotations, 1, 2, joint_angles[:, i])
+    _rotate_columns(rotations, 0, 1, -plan.bottom_orientationsBF[-1])
+    
+    # Along each disk (unchanged by its top orientation) and rolling across the joint, and the derivative of the latter w.r.t. the joint angle
+    r = plan.top_curve_radii[:-1, np.newaxis]
+    half_c = np.cos(joint_angles/2)[..., np.newaxis]
+    half_s = np.sin(joint_angles/2)[..., np.newaxis]
+    disps = 2*r*(1 - half_c)
+    ys = joint_rotations[..., 1]
+    zs = joint_rotations[..., 2]
+    # Translations to the bottom of each distal disk, through which the joint rotates about the x axis of the frame
+    points = np.cumsum(plan.lengths[:-1, np.newaxis]*zs + disps*(half_c*zs - half_s*ys), axis=1)
+    velocities = (r*half_s*half_c - half_s*disps/2)*zs - (half_c*disps/2 + r*half_s**2)*ys
+    
+    tip_TFs = np.zeros((n, 4, 4))
+    tip_TFs[:, :3, :3] = rotations
+    tip_TFs[:, :3, 3] = (points[:, -1] if plan.n_disks > 1 else 0.0) + plan.lengths[-1]*rotations[..., 2]
+    tip_TFs[:, 3, 3] = 1.0
+    axes = joint_rotations[..., 0]
+    # axis x (tip translation - point) = axis x tip translation - axis x point
+    return tip_TFs, axes, velocities - np.cross(axes, points)
+
+
+def _eval_jacobian_batch(plan: SolvePlan, tensions, constants=None):
+    """
+        Forward-mode derivatives of the direct solver w.r.t. tensions, propagated as lanes along the values: 
+        lane 0 of each quantity is its value, lane 1+k its derivative w.r.t. tension k
+        constants: _eval_jacobian_constants of plan, evaluated if not given
+        return ((N, n_disks-1) joint angles, (N, n_disks-1, n_tendons) their derivatives, (N, n_disks-1, 6) contact reactions, 
+                (N, 4, 4) tip transformations, (N, 4, 4, n_tendons) their derivatives)
+    """
+    if plan.has_friction:
+        raise NotImplementedError("Friction is not supported by batch solvers, solve with eval_manipulator_state instead")
+    n = tensions.shape[0]
+    joint_angles = np.zeros((n, plan.n_disks-1))
+    d_joint_angles = np.zeros((n, plan.n_disks-1, plan.n_tendons))
+    contact_reactions = np.zeros((n, plan.n_disks-1, 6))
+    
+    bottom_weights, top_weights, pqr_top, pqr_weights, bottom_guide_coefficients, rotation_coefficients, top_guide_coefficients = \
+        _eval_jacobian_constants(plan) if constants is None else constants
+    bottom_lanes = _stack_tangent_lanes(tensions, bottom_weights)
+    top_lanes = _stack_tangent_lanes(tensions, top_weights)
+    # [P, Q, R] of _solve_direct_batch are linear in the top components and the bottom weighted sums
+    pqr_bottom = np.einsum("nilc,icd->nild", bottom_lanes, pqr_weights)
+    
+    # Statics, from distal to proximal
+    top_lanes_vec = np.zeros((n, 1 + plan.n_tendons, 6))
+    # [sin, cos, 1, sin(2*), cos(2*)] of the half joint angles
+    basis = np.ones((n, 5))
+    for i in range(plan.n_disks-1, 0, -1):
+        pqr = np.matmul(top_lanes_vec, pqr_top[i]) + pqr_bottom[:, i]
+        P, Q, R = pqr[:, 0, 0], pqr[:, 0, 1], pqr[:, 0, 2]
+        half_joint_angles = _solve_half_joint_angles_batch(P, Q, R)
+        basis[:, 0] = np.sin(half_joint_angles)
+        basis[:, 1] = np.cos(half_joint_angles)
+        
+        # Implicit differentiation of P*sin + Q*cos + R = 0
+        denom = P*basis[:, 1] - Q*basis[:, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d_half_joint_angles = np.where(denom[:, np.newaxis] != 0.0, -np.matmul(pqr[:, 1:], basis[:, :3, np.newaxis])[..., 0]/denom[:, np.newaxis], 0.0)
+        joint_angles[:, i-1] = 2*half_joint_angles
+        d_joint_angles[:, i-1] = 2*d_half_joint_angles
+        
+        # Bottom contact reactions balance the top components and the bottom guide components
+        guide = np.matmul(bottom_lanes[:, i], np.matmul(basis[:, :2], bottom_guide_coefficients[:2]).reshape(n, 4, 12))
+        contact_lanes = -top_lanes_vec - guide[..., :6]
+        contact_lanes[:, 1:] -= d_half_joint_angles[..., np.newaxis]*guide[:, 0:1, 6:]
+        contact_reactions[:, i-1] = contact_lanes[:, 0]
+        if i == 1:
+            break
+        
+        # Top components of the proximal disk: contact reactions in its frame, and the top guide components
+        basis[:, 3] = np.sin(joint_angles[:, i-1])
+        basis[:, 4] = np.cos(joint_angles[:, i-1])
+        rotated = np.matmul(contact_lanes.reshape(n, -1, 2, 3), np.matmul(basis, rotation_coefficients[i-1]).reshape(n, 1, 3, 6))
+        guide = np.matmul(top_lanes[:, i], np.matmul(basis[:, :2], top_guide_coefficients[i-1, :2]).reshape(n, 4, 12))
+        top_lanes_vec = guide[..., :6] - rotated[..., :3].reshape(n, -1, 6)
+        top_lanes_vec[:, 1:] += d_half_joint_angles[..., np.newaxis]*(guide[:, 0:1, 6:] - 2*rotated[:, 0:1, :, 3:].reshape(n, 1, 6))
+    
+    # Kinematics: tip derivative w.r.t. tension k = sum over joints of the joint derivatives w.r.t. joint angles * d_joint_angles
+    tip_TF, axes, velocities = _eval_tip_TF_derivatives_batch(plan, joint_angles)
+    angular = np.matmul(np.swapaxes(d_joint_angles, 1, 2), axes)
+    tip_TF_jacobian = np.zeros((n, plan.n_tendons, 4, 4))
+    tip_TF_jacobian[..., :3, :] = np.swapaxes(np.cross(angular[:, :, np.newaxis, :], np.swapaxes(tip_TF[:, np.newaxis, :3, :], 2, 3)), 2, 3)
+    tip_TF_jacobian[..., :3, 3] += np.matmul(np.swapaxes(d_joint_angles, 1, 2), velocities)
+    return joint_angles, d_joint_angles, contact_reactions, tip_TF, tip_TF_jacobian.transpose(0, 2, 3, 1)
+
+
+def eval_manipulator_jacobian_batch(manipulator_model: ManipulatorMathModel, tensions) -> ManipulatorJacobian:
+    """
+        Evaluate the joint angles and tip transformations of N tension inputs with the direct solver, 
+        together with their derivatives w.r.t. tensions in one forward-mode pass
+        tensions: (N, n_tendons) array, as in eval_manipulator_state_batch
+        return ManipulatorJacobian with leading dimension N
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    
+    tensions = np.asarray(tensions, dtype=float)
+    if tensions.ndim == 1:
+        tensions = tensions[np.newaxis, :]
+    if tensions.shape[1] != plan.n_tendons:
+        raise ValueError(f"Expect {plan.n_tendons} tensions per input, but got {tensions.shape[1]}")
+    
+    joint_angles, joint_angle_jacobian, _, tip_TF, tip_TF_jacobian = _eval_jacobian_batch(plan, tensions)
+    return ManipulatorJacobian(joint_angles, joint_angle_jacobian, tip_TF, tip_TF_jacobian)
+
+
+def eval_manipulator_state_with_jacobian(manipulator_model: ManipulatorMathModel, tension_inputs: List):
+    """
+        Evaluate the state of a tension input with the direct solver, together with its derivatives w.r.t. tensions
+        return (ManipulatorState, ManipulatorJacobian)
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    
+    tensions = plan.flatten_tension_inputs(tension_inputs)
+    joint_angles, joint_angle_jacobian, contact_reactions, tip_TF, tip_TF_jacobian = _eval_jacobian_batch(plan, tensions[np.newaxis, :])
+    disk_states = _generate_disk_states(manipulator_model, plan, tensions, joint_angles[0], contact_reactions[0], 
+                                        [None]*(plan.n_disks-1), plan.n_disks-1)
+    return (ManipulatorState(manipulator_model, tension_inputs, disk_states, tensions=tensions, solve_plan=plan),
+            ManipulatorJacobian(joint_angles[0], joint_angle_jacobian[0], tip_TF[0], tip_TF_jacobian[0]))
@@ -0,0 +1,83 @@
+"""
+    Scaling benchmark of the solvers w.r.t. the number of disks
+    Run: python -m variable_neutral_line_manipulator.math_model.benchmark [n_joints ...]
+    Each stage is expected to scale linearly, i.e. with a fitted log-log slope close to 1
+"""
+import sys
+from math import pi
+from time import perf_counter
+
+import numpy as np
+
+from .models import *
+from .solver import *
+from .batch import *
+from .kinematics import eval_tip_TFs
+
+
+def _eval_best_time(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def create_model(n_joints) -> ManipulatorMathModel:
+    """
+        Near-continuum manipulator of 2 segments of 2 DoF, with n_joints in total
+    """
+    return ManipulatorMathModel([
+        SegmentMathConfig(is_2_DoF=True, n_joints=n_joints//2, disk_length=5, orientationBF=0, curve_radius=3, tendon_dist_from_axis=1, end_disk_length=5),
+        SegmentMathConfig(is_2_DoF=True, n_joints=n_joints - n_joints//2, disk_length=5, orientationBF=pi/4, curve_radius=3, tendon_dist_from_axis=1, end_disk_length=5),
+    ], base_disk_length=5, outer_diameter=5)
+
+
+def _eval_central_difference_jacobian(model, tensions, step=0.000001):
+    """
+        (4, 4, n_tendons) derivatives of the tip transformation w.r.t. tensions by central differences, 
+        with all perturbed inputs solved in one stacked eval_manipulator_state_batch call
+    """
+    perturbations = step*np.identity(len(tensions))
+    tip_TFs = eval_tip_TFs(model, eval_manipulator_state_batch(model, np.concatenate((tensions + perturbations, tensions - perturbations))))
+    return np.moveaxis((tip_TFs[:len(tensions)] - tip_TFs[len(tensions):])/(2*step), 0, -1)
+
+
+def benchmark(n_joints_list=(50, 100, 200, 400, 800, 1600), n_batch_samples=100):
+    """
+        return {stage: (times in seconds for each of n_joints_list, fitted log-log slope)}
+    """
+    stages = ("compile", "direct", "Brent", "direct (Numba)", "get_TF", f"batch x{n_batch_samples}", "Jacobian", "central diff.")
+    times = {stage: [] for stage in stages}
+    for n_joints in n_joints_list:
+        model = create_model(n_joints)
+        plan = model.compile()
+        tensions = np.random.RandomState(0).uniform(0, 1, (n_batch_samples, plan.n_tendons))
+        tension_inputs = [list(tensions[0, :4]), list(tensions[0, 4:])]
+        state = eval_manipulator_state(model, tension_inputs, SolverType.DIRECT)
+
+        times["compile"].append(_eval_best_time(lambda: SolvePlan(model.disks, model.tendons)))
+        times["direct"].append(_eval_best_time(lambda: eval_manipulator_state(model, tension_inputs, SolverType.DIRECT)))
+        times["Brent"].append(_eval_best_time(lambda: eval_manipulator_state(model, tension_inputs, SolverType.BRENT)))
+        eval_joint_angles(model, tensions[0], SolverType.DIRECT, backend=SolverBackend.NUMBA)
+        times["direct (Numba)"].append(_eval_best_time(lambda: eval_joint_angles(model, tensions[0], SolverType.DIRECT, backend=SolverBackend.NUMBA)))
+        times["get_TF"].append(_eval_best_time(lambda: [state.get_TF(i, "t", "bd") for i in range(plan.n_disks)]))
+        times[f"batch x{n_batch_samples}"].append(_eval_best_time(lambda: eval_manipulator_state_batch(model, tensions)))
+        # Tip Jacobian of one input, expected to take less time than central differences
+        times["Jacobian"].append(_eval_best_time(lambda: eval_manipulator_jacobian_batch(model, tensions[0])))
+        times["central diff."].append(_eval_best_time(lambda: _eval_central_difference_jacobian(model, tensions[0])))
+
+    return {stage: (ts, np.polyfit(np.log(n_joints_list), np.log(ts), 1)[0]) for stage, ts in times.items()}
+
+
+def main(argv):
+    n_joints_list = [int(n) for n in argv] if argv else (50, 100, 200, 400, 800, 1600)
+    results = benchmark(n_joints_list)
+    print(f"{'n_joints':>16}" + "".join(f"{n:>10}" for n in n_joints_list) + f"{'slope':>10}")
+    for stage, (ts, slope) in results.items():
+        print(f"{stage:>16}" + "".join(f"{t*1000:>8.2f}ms" for t in ts) + f"{slope:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
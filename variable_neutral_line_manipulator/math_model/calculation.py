@@ -111,3 +111,126 @@ def evalTFProximalTopToDistalBottom(jointAngle: float, curveRadius: float):
                      rot)) # (Wrong) Trick: m_rot * m_trans * m_rot = m_rot * (m_trans + m_rot)
     
     
+# Array counterparts of the kernels above, broadcasting over any leading batch dimensions of the arguments
+# Vectors are returned as (..., 3) arrays and matrices as (..., 3, 3) or (..., 4, 4) arrays
+
+def m3MatrixRotationXArray(radian):
+    radian = np.asarray(radian, dtype=float)
+    c = np.cos(radian)
+    s = np.sin(radian)
+    mat = np.zeros(radian.shape + (3, 3))
+    mat[..., 0, 0] = 1.0
+    mat[..., 1, 1] = mat[..., 2, 2] = c
+    mat[..., 1, 2] = -s
+    mat[..., 2, 1] = s
+    return mat
+
+def m3MatrixRotationZArray(radian):
+    radian = np.asarray(radian, dtype=float)
+    c = np.cos(radian)
+    s = np.sin(radian)
+    mat = np.zeros(radian.shape + (3, 3))
+    mat[..., 0, 0] = mat[..., 1, 1] = c
+    mat[..., 0, 1] = -s
+    mat[..., 1, 0] = s
+    mat[..., 2, 2] = 1.0
+    return mat
+
+def m4MatrixTranslationArray(vec):
+    vec = np.asarray(vec, dtype=float)
+    mat = np.zeros(vec.shape[:-1] + (4, 4))
+    mat[..., 0, 0] = mat[..., 1, 1] = mat[..., 2, 2] = mat[..., 3, 3] = 1.0
+    mat[..., :3, 3] = vec
+    return mat
+
+def m4MatrixRotationXArray(radian):
+    mat = np.zeros(np.shape(radian) + (4, 4))
+    mat[..., :3, :3] = m3MatrixRotationXArray(radian)
+    mat[..., 3, 3] = 1.0
+    return mat
+
+def m4MatrixRotationZArray(radian):
+    mat = np.zeros(np.shape(radian) + (4, 4))
+    mat[..., :3, :3] = m3MatrixRotationZArray(radian)
+    mat[..., 3, 3] = 1.0
+    return mat
+
+def _stackVec(x, y, z):
+    x, y, z = np.broadcast_arrays(x, y, z)
+    return np.stack((x, y, z), axis=-1)
+
+def distalToProximalFrameArray(distalDiskBottomVecDF: np.ndarray,
+                               topJointAngle: np.ndarray,
+                               topOrientationDF: np.ndarray) -> np.ndarray:
+    rot = np.matmul(m3MatrixRotationZArray(topOrientationDF), m3MatrixRotationXArray(topJointAngle))
+    return -np.matmul(rot, np.asarray(distalDiskBottomVecDF, dtype=float)[..., np.newaxis])[..., 0]
+
+def evalTopGuideForceArray(tensionInDisk: np.ndarray,
+                           topJointAngle: np.ndarray,
+                           topOrientationDF: np.ndarray) -> np.ndarray:
+    halfJointAngle = np.asarray(topJointAngle)/2
+    return _stackVec(tensionInDisk*np.sin(halfJointAngle)*np.sin(topOrientationDF),
+                     -tensionInDisk*np.sin(halfJointAngle)*np.cos(topOrientationDF),
+                     tensionInDisk*np.cos(halfJointAngle))
+
+def evalBottomGuideForceArray(tensionInDisk: np.ndarray,
+                              bottomJointAngle: np.ndarray) -> np.ndarray:
+    halfJointAngle = np.asarray(bottomJointAngle)/2
+    return _stackVec(0.0,
+                     -tensionInDisk*np.sin(halfJointAngle),
+                     -tensionInDisk*np.cos(halfJointAngle))
+
+def evalTopGuideEndDispArray(length: np.ndarray,
+                             topcurve_radius: np.ndarray,
+                             tendonDistFromAxis: np.ndarray,
+                             tendonOrientationDF: np.ndarray,
+                             topOrientationDF: np.ndarray) -> np.ndarray:
+    horizontalDispAlongCurve = tendonDistFromAxis*np.sin(np.subtract(tendonOrientationDF, topOrientationDF))
+    return _stackVec(tendonDistFromAxis*np.cos(tendonOrientationDF),
+                     tendonDistFromAxis*np.sin(tendonOrientationDF),
+                     np.sqrt(np.square(topcurve_radius) - horizontalDispAlongCurve**2) + np.divide(length, 2) - topcurve_radius)
+
+def evalBottomGuideEndDispArray(length: np.ndarray,
+                                bottomcurve_radius: np.ndarray,
+                                tendonDistFromAxis: np.ndarray,
+                                tendonOrientationDF: np.ndarray) -> np.ndarray:
+    horizontalDispAlongCurve = tendonDistFromAxis*np.sin(tendonOrientationDF)
+    return _stackVec(tendonDistFromAxis*np.cos(tendonOrientationDF),
+                     tendonDistFromAxis*np.sin(tendonOrientationDF),
+                     -np.sqrt(np.square(bottomcurve_radius) - horizontalDispAlongCurve**2) + bottomcurve_radius - np.divide(length, 2))
+
+def evalTopContactDispArray(length: np.ndarray,
+                            topcurve_radius: np.ndarray,
+                            topJointAngle: np.ndarray,
+                            topOrientationDF: np.ndarray) -> np.ndarray:
+    halfJointAngle = np.asarray(topJointAngle)/2
+    return _stackVec(topcurve_radius*np.sin(halfJointAngle)*np.sin(topOrientationDF),
+                     -topcurve_radius*np.sin(halfJointAngle)*np.cos(topOrientationDF),
+                     topcurve_radius*np.cos(halfJointAngle) + np.divide(length, 2) - topcurve_radius)
+
+def evalBottomContactDispArray(length: np.ndarray,
+                               bottomcurve_radius: np.ndarray,
+                               bottomJointAngle: np.ndarray) -> np.ndarray:
+    halfJointAngle = np.asarray(bottomJointAngle)/2
+    return _stackVec(0.0,
+                     -bottomcurve_radius*np.sin(halfJointAngle),
+                     -bottomcurve_radius*np.cos(halfJointAngle) + bottomcurve_radius - np.divide(length, 2))
+
+def evalTFProximalTopToDistalBottomArray(jointAngle: np.ndarray, curveRadius: np.ndarray) -> np.ndarray:
+    """
+        Closed form of Rx(jointAngle/2) * T(0, 0, 2*curveRadius*(1 - cos(jointAngle/2))) * Rx(jointAngle/2)
+    """
+    jointAngle, curveRadius = np.broadcast_arrays(np.asarray(jointAngle, dtype=float), np.asarray(curveRadius, dtype=float))
+    halfJointAngle = jointAngle/2
+    disp = 2*curveRadius*(1 - np.cos(halfJointAngle))
+    mat = m4MatrixRotationXArray(jointAngle)
+    mat[..., 1, 3] = -np.sin(halfJointAngle)*disp
+    mat[..., 2, 3] = np.cos(halfJointAngle)*disp
+    return mat
+
+def evalCapstanArray(tensionEnd: np.ndarray, frictionCoefficient: np.ndarray, totalAngle: np.ndarray) -> np.ndarray:
+    """
+        Evaluate the tension of a tendon past guides wrapping it by totalAngle in total, from the end with tensionEnd
+        totalAngle is negative if the tendon slides towards that end (tension rises past the guides)
+    """
+    return tensionEnd*np.exp(-frictionCoefficient*totalAngle)
@@ -0,0 +1,104 @@
+from typing import List
+
+import numpy as np
+
+from .models import *
+from .plan import *
+from .plan import _get_side_frame_indices
+from .solver import ManipulatorState, eval_TFs_DF, eval_span_tensions, _generate_disk_states
+from .batch import _eval_joint_angles_batch
+
+
+class CompactManipulatorState:
+    """
+        Array-backed counterpart of ManipulatorState for keeping many states, e.g. of a trajectory
+        Arrays are indexed as in ManipulatorState, entry i-1 belongs to disk i
+        TFs_DF and TFs are evaluated on first access, and disk_states on every access
+    """
+    __slots__ = ("model", "solve_plan", "tensions", "bottom_joint_angles", "bottom_contact_reactionsDF", "solver_stats", "_TFs_DF", "_TFs")
+
+    def __init__(self, manipulator_model: ManipulatorMathModel, solve_plan: SolvePlan, tensions: np.ndarray,
+                 bottom_joint_angles: np.ndarray, bottom_contact_reactionsDF: np.ndarray, solver_stats: List = None):
+        self.model = manipulator_model
+        self.solve_plan = solve_plan
+        self.tensions = tensions                                        # (n_tendons,) tensions indexed by tendon
+        self.bottom_joint_angles = bottom_joint_angles                  # (n_disks-1,)
+        self.bottom_contact_reactionsDF = bottom_contact_reactionsDF    # (n_disks-1, 6) [force, total moment] in disk frame
+        self.solver_stats = solver_stats                                # None for the direct solver
+        self._TFs_DF = None
+        self._TFs = None
+
+    @staticmethod
+    def from_state(state: ManipulatorState):
+        return CompactManipulatorState(state.model, state.solve_plan, state.tensions,
+                                       np.array([s.bottom_joint_angle for s in state.disk_states]),
+                                       np.array([s.bottom_contact_reactionDF.flat_total for s in state.disk_states]).reshape(-1, 6),
+                                       None if all(s is None for s in state.solver_stats) else state.solver_stats)
+
+    @property
+    def tension_inputs(self):
+        plan = self.solve_plan
+        return [list(self.tensions[plan.knob_starts[i]:plan.knob_ends[i]])
+                for i in range(1, plan.n_disks) if plan.knob_ends[i] > plan.knob_starts[i]]
+
+    def get_tensions_at_disk(self, disk_index):
+        """
+            Tensions of the tendons through a disk, as a view of tensions
+        """
+        return self.tensions[self.solve_plan.tendon_starts[disk_index]:]
+
+    @property
+    def disk_states(self):
+        plan = self.solve_plan
+        tensions = eval_span_tensions(plan, self.tensions, self.bottom_joint_angles) if plan.has_friction else self.tensions
+        return _generate_disk_states(self.model, plan, tensions, self.bottom_joint_angles, self.bottom_contact_reactionsDF,
+                                     self.solver_stats or [None]*(plan.n_disks-1), plan.n_disks-1)
+
+    @property
+    def TFs_DF(self):
+        """
+            (n_disks, 4, 4) transformations from the top of the base frame to the bottom of each disk, in bottom-curvature-orientation
+        """
+        if self._TFs_DF is None:
+            self._TFs_DF = eval_TFs_DF(self.solve_plan, self.bottom_joint_angles)
+        return self._TFs_DF
+
+    @property
+    def TFs(self):
+        """
+            (n_disks, side, frame, 4, 4) transformations of get_TF, with side and frame indexed as TF_SIDES and TF_FRAME_SYSS
+        """
+        if self._TFs is None:
+            self._TFs = np.matmul(self.TFs_DF[:, np.newaxis, np.newaxis], self.solve_plan.side_frame_TFsDF)
+        return self._TFs
+
+    def get_TF(self, disk_index, side, frame_sys):
+        """
+            Get the transformation matrix from the top of the base frame, as a view of TFs
+            side = "b": bottom, "c": center, "t": top
+            frame_sys = "bd": base-disk-orientation, "bc": bottom-curvature-orientation, "tc": top-curvature-orientation
+        """
+        return self.TFs[(disk_index,) + _get_side_frame_indices(side, frame_sys)]
+
+    def __repr__(self):
+        return f"<CompactManipulatorState> [disks={self.solve_plan.n_disks}, tensions={self.tensions}]"
+
+
+def eval_compact_manipulator_states(manipulator_model: ManipulatorMathModel, tensions) -> List[CompactManipulatorState]:
+    """
+        Evaluate the states of N tension inputs at once with the direct solver
+        tensions: (N, n_tendons) array, as in eval_manipulator_state_batch
+        The states share the memory of the (N, ...) result arrays
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+
+    tensions = np.asarray(tensions, dtype=float)
+    if tensions.ndim == 1:
+        tensions = tensions[np.newaxis, :]
+    if tensions.shape[1] != plan.n_tendons:
+        raise ValueError(f"Expect {plan.n_tendons} tensions per input, but got {tensions.shape[1]}")
+
+    joint_angles, contact_reactions = _eval_joint_angles_batch(plan, tensions, with_contact_reactions=True)
+    return [CompactManipulatorState(manipulator_model, plan, tensions[k], joint_angles[k], contact_reactions[k]) for k in range(len(tensions))]
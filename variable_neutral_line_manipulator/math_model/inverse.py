@@ -0,0 +1,134 @@
+import numpy as np
+
+from .models import *
+from .solver import SolverBackend
+from .batch import *
+from .batch import _eval_jacobian_batch, _eval_jacobian_constants
+from . import jit
+
+
+class InverseSolution:
+    """
+        Tensions indexed by tendon which bring the tip (top of end disk, base-disk-orientation) to a target transformation
+    """
+    def __init__(self, tensions, tip_TF, position_error, orientation_error, n_iterations, n_evaluations, converged):
+        self.tensions = tensions
+        self.tip_TF = tip_TF
+        self.position_error = position_error
+        self.orientation_error = orientation_error
+        self.n_iterations = n_iterations
+        self.n_evaluations = n_evaluations
+        self.converged = converged
+
+    def __repr__(self):
+        return (f"<InverseSolution> [tensions={self.tensions}, position error={self.position_error}, orientation error={self.orientation_error}, "
+                f"iterations={self.n_iterations}, evaluations={self.n_evaluations}, converged={self.converged}]")
+
+
+def _eval_tip_residual(tip_TF, tip_TF_jacobian, target_TF, position_weight, orientation_weight):
+    """
+        Weighted residual [position error, orientation error] of the tip and its derivative w.r.t. tensions
+        Orientation error = 1/2 * sum of (target axis x tip axis), which vanishes when the orientations match,
+        i.e. the axial vector of the antisymmetric part of tip rotation * target rotation^T
+        return residual, derivative, position error norm, orientation error norm
+    """
+    position_residual = tip_TF[:3, 3] - target_TF[:3, 3]
+    rotation = np.dot(tip_TF[:3, :3], target_TF[:3, :3].T)
+    d_rotation = np.einsum("ijk,lj->ilk", tip_TF_jacobian[:3, :3], target_TF[:3, :3])
+    orientation_residual = 0.5*np.array((rotation[2, 1] - rotation[1, 2], rotation[0, 2] - rotation[2, 0], rotation[1, 0] - rotation[0, 1]))
+    d_orientation_residual = 0.5*np.stack((d_rotation[2, 1] - d_rotation[1, 2], d_rotation[0, 2] - d_rotation[2, 0], d_rotation[1, 0] - d_rotation[0, 1]))
+    return (np.concatenate((position_weight*position_residual, orientation_weight*orientation_residual)),
+            np.concatenate((position_weight*tip_TF_jacobian[:3, 3, :], orientation_weight*d_orientation_residual)),
+            np.linalg.norm(position_residual), np.linalg.norm(orientation_residual))
+
+
+def _create_tip_jacobian_evaluator(plan: SolvePlan, backend:SolverBackend):
+    """
+        Evaluator of the tip transformation and its (4, 4, n_tendons) derivatives w.r.t. (n_tendons,) tensions of plan,
+        with the arrays of plan gathered once for all evaluations
+    """
+    if backend == SolverBackend.NUMBA and jit.HAS_NUMBA:
+        plan_arrays = (plan.lengths, plan.bottom_curve_radii, plan.top_orientationsDF, plan.tendon_starts, plan.bottom_guide_disps, 
+                       plan.top_guide_disps, plan.top_curve_radii, -plan.bottom_orientationsBF[-1])
+        joint_angles = np.empty(plan.n_disks-1)
+        d_joint_angles = np.empty((plan.n_disks-1, plan.n_tendons))
+
+        def _evaluate(tensions):
+            tip_TF = np.empty((4, 4))
+            tip_TF_jacobian = np.empty((4, 4, plan.n_tendons))
+            jit.eval_tip_jacobian(*plan_arrays, tensions, joint_angles, d_joint_angles, tip_TF, tip_TF_jacobian)
+            return tip_TF, tip_TF_jacobian
+        return _evaluate
+    
+    constants = _eval_jacobian_constants(plan)
+
+    def _evaluate(tensions):
+        _, _, _, tip_TF, tip_TF_jacobian = _eval_jacobian_batch(plan, tensions[np.newaxis, :], constants)
+        return tip_TF[0], tip_TF_jacobian[0]
+    return _evaluate
+
+
+def solve_inverse(manipulator_model: ManipulatorMathModel, target_TF, bounds=(0.0, 100.0), init=None,
+                  position_weight=1.0, orientation_weight=1.0, damping=0.01,
+                  position_threshold=0.000001, orientation_threshold=0.000001, gradient_threshold=1e-10, max_iterations=50,
+                  backend:SolverBackend=SolverBackend.NUMPY) -> InverseSolution:
+    """
+        Evaluate tensions bringing the tip (ManipulatorState.get_TF(-1, "t", "bd")) to target_TF,
+        by damped least squares (Levenberg-Marquardt) iterations on the analytic Jacobian of the direct solver
+        bounds: (lower, upper) tension bounds, each either a scalar or an array indexed by tendon
+        init: initial tensions indexed by tendon, e.g. InverseSolution.tensions of the previous target. Defaults to the middle of bounds
+        orientation_weight: set to 0 to reach a target position regardless of orientation
+        Iterations stop at a least-squares optimum (max |J^T * residual| < gradient_threshold) if the target cannot be reached,
+        e.g. a full pose target for a manipulator with less than 6 DoF, with converged = False
+        backend: SolverBackend of the Jacobian, NUMBA takes a few ms per target, and NUMPY tens of ms
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    if plan.has_friction:
+        raise NotImplementedError("Friction is not supported by batch solvers, solve with eval_manipulator_state instead")
+
+    target_TF = np.asarray(target_TF, dtype=float)
+    lower = np.broadcast_to(np.asarray(bounds[0], dtype=float), (plan.n_tendons,))
+    upper = np.broadcast_to(np.asarray(bounds[1], dtype=float), (plan.n_tendons,))
+
+    _eval_tip_jacobian = _create_tip_jacobian_evaluator(plan, backend)
+
+    def _evaluate(tensions):
+        tip_TF, tip_TF_jacobian = _eval_tip_jacobian(tensions)
+        residual, d_residual, position_error, orientation_error = _eval_tip_residual(tip_TF, tip_TF_jacobian, target_TF, 
+                                                                                     position_weight, orientation_weight)
+        is_converged = (position_error <= position_threshold or position_weight == 0) and \
+                       (orientation_error <= orientation_threshold or orientation_weight == 0)
+        return tip_TF, residual, d_residual, position_error, orientation_error, is_converged
+
+    tensions = np.clip((lower + upper)/2 if init is None else np.asarray(init, dtype=float), lower, upper)
+    tip_TF, residual, d_residual, position_error, orientation_error, converged = _evaluate(tensions)
+    cost = np.dot(residual, residual)
+    n_iterations = 0
+    n_evaluations = 1
+
+    while not converged and n_iterations < max_iterations:
+        gradient = np.dot(d_residual.T, residual)
+        if np.max(np.abs(gradient)) < gradient_threshold:
+            break
+        n_iterations += 1
+        jtj = np.dot(d_residual.T, d_residual)
+        step = np.linalg.solve(jtj + damping*np.diag(np.diag(jtj) + 1e-12), -gradient)
+        new_tensions = np.clip(tensions + step, lower, upper)
+        new_evaluation = _evaluate(new_tensions)
+        n_evaluations += 1
+        new_cost = np.dot(new_evaluation[1], new_evaluation[1])
+
+        if new_cost < cost:
+            # Accept, and move towards Gauss-Newton
+            tensions, cost = new_tensions, new_cost
+            tip_TF, residual, d_residual, position_error, orientation_error, converged = new_evaluation
+            damping = max(damping/3, 1e-9)
+        else:
+            # Reject, and move towards gradient descent
+            damping *= 4
+            if damping > 1e9:
+                break
+
+    return InverseSolution(tensions, tip_TF, position_error, orientation_error, n_iterations, n_evaluations, converged)
@@ -0,0 +1,632 @@
+"""
+    JIT-compiled kernels of the per-disk solvers and the transformation chain, over the arrays of SolvePlan
+    Compiled with Numba in nopython mode if installed (HAS_NUMBA), otherwise left as plain Python functions,
+    in which case solvers use their NumPy implementation instead (see SolverBackend)
+"""
+from math import sin, cos, asin, atan, sqrt, isnan, pi
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Codes of SolverType in kernels
+SOLVER_CODE_DIRECT = 0
+SOLVER_CODE_BINARY = 1
+SOLVER_CODE_NEWTON = 2
+SOLVER_CODE_BRENT = 3
+SOLVER_CODE_ILLINOIS = 4
+
+_EPS = 2.220446049250313e-16
+
+
+@njit(cache=True)
+def _residual(P, Q, R, x):
+    # Bottom contact pure moment about x, see solver._eval_equilibrium_coefficients
+    return -(P*sin(x/2) + Q*cos(x/2) + R)
+
+
+@njit(cache=True)
+def _binary_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations):
+    """
+        Port of solver.equation_binary_search
+        return (found, x, n_iterations, n_evaluations, converged)
+    """
+    n_iterations = 0
+    n_evaluations = 2
+    y_lower = _residual(P, Q, R, lower)
+    y_upper = _residual(P, Q, R, upper)
+    if y_lower*y_upper > 0:
+        return False, 0.0, n_iterations, n_evaluations, False
+    if abs(y_lower) <= threshold:
+        return True, lower, n_iterations, n_evaluations, True
+    if abs(y_upper) <= threshold:
+        return True, upper, n_iterations, n_evaluations, True
+    if y_lower > 0:
+        lower, upper = upper, lower
+
+    x = init if has_init else (lower + upper)/2
+    y = _residual(P, Q, R, x)
+    n_evaluations += 1
+    converged = True
+    while abs(y) > threshold and abs(upper - lower) > x_threshold:
+        if n_iterations >= max_iterations:
+            converged = False
+            break
+        if y < 0:
+            lower = x
+        else:
+            upper = x
+        x = (lower + upper)/2
+        y = _residual(P, Q, R, x)
+        n_iterations += 1
+        n_evaluations += 1
+    return True, x, n_iterations, n_evaluations, converged
+
+
+@njit(cache=True)
+def _newton_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations):
+    """
+        Port of solver.equation_newton_search
+    """
+    n_iterations = 0
+    n_evaluations = 2
+    y_lower = _residual(P, Q, R, lower)
+    y_upper = _residual(P, Q, R, upper)
+    if y_lower*y_upper > 0:
+        return False, 0.0, n_iterations, n_evaluations, False
+    if abs(y_lower) <= threshold:
+        return True, lower, n_iterations, n_evaluations, True
+    if abs(y_upper) <= threshold:
+        return True, upper, n_iterations, n_evaluations, True
+    if y_lower > 0:
+        lower, upper = upper, lower
+
+    x = init if has_init else (lower + upper)/2
+    y = _residual(P, Q, R, x)
+    dy = -(P*cos(x/2) - Q*sin(x/2))/2
+    n_evaluations += 1
+    converged = True
+    while abs(y) > threshold and abs(upper - lower) > x_threshold:
+        if n_iterations >= max_iterations:
+            converged = False
+            break
+        if y < 0:
+            lower = x
+        else:
+            upper = x
+        is_bisection = dy == 0
+        if not is_bisection:
+            x_next = x - y/dy
+            is_bisection = not min(lower, upper) < x_next < max(lower, upper)
+        if is_bisection:
+            x_next = (lower + upper)/2
+        x = x_next
+        y = _residual(P, Q, R, x)
+        dy = -(P*cos(x/2) - Q*sin(x/2))/2
+        n_iterations += 1
+        n_evaluations += 1
+    return True, x, n_iterations, n_evaluations, converged
+
+
+@njit(cache=True)
+def _illinois_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations):
+    """
+        Port of solver.equation_illinois_search
+    """
+    n_iterations = 0
+    n_evaluations = 2
+    a, b = lower, upper
+    y_a = _residual(P, Q, R, a)
+    y_b = _residual(P, Q, R, b)
+    if y_a*y_b > 0:
+        return False, 0.0, n_iterations, n_evaluations, False
+
+    if has_init and min(a, b) < init < max(a, b):
+        y = _residual(P, Q, R, init)
+        n_evaluations += 1
+        if y*y_b > 0:
+            b, y_b = init, y
+        else:
+            a, y_a = init, y
+
+    side = 0
+    if abs(y_a) < abs(y_b):
+        x, y = a, y_a
+    else:
+        x, y = b, y_b
+    converged = True
+    while abs(y) > threshold and abs(b - a) > x_threshold:
+        if n_iterations >= max_iterations:
+            converged = False
+            break
+        x = (a*y_b - b*y_a)/(y_b - y_a)
+        y = _residual(P, Q, R, x)
+        n_iterations += 1
+        n_evaluations += 1
+        if y*y_b > 0:
+            b, y_b = x, y
+            if side == -1:
+                y_a /= 2
+            side = -1
+        else:
+            a, y_a = x, y
+            if side == 1:
+                y_b /= 2
+            side = 1
+    return True, x, n_iterations, n_evaluations, converged
+
+
+@njit(cache=True)
+def _brent_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations):
+    """
+        Port of solver.equation_brent_search
+    """
+    n_iterations = 0
+    n_evaluations = 2
+    a, b = lower, upper
+    y_a = _residual(P, Q, R, a)
+    y_b = _residual(P, Q, R, b)
+    if y_a*y_b > 0:
+        return False, 0.0, n_iterations, n_evaluations, False
+
+    if has_init and min(a, b) < init < max(a, b):
+        y = _residual(P, Q, R, init)
+        n_evaluations += 1
+        if y*y_b > 0:
+            b, y_b = init, y
+        else:
+            a, y_a = init, y
+
+    c, y_c = b, y_b
+    d = e = b - a
+    converged = True
+    while True:
+        if y_b*y_c > 0:
+            c, y_c = a, y_a
+            d = e = b - a
+        if abs(y_c) < abs(y_b):
+            a, y_a = b, y_b
+            b, y_b = c, y_c
+            c, y_c = a, y_a
+
+        tol = 2*_EPS*abs(b) + x_threshold/2
+        m = (c - b)/2
+        if abs(y_b) <= threshold or abs(m) <= tol:
+            break
+        if n_iterations >= max_iterations:
+            converged = False
+            break
+
+        if abs(e) >= tol and abs(y_a) > abs(y_b):
+            s = y_b/y_a
+            if a == c:
+                p = 2*m*s
+                q = 1 - s
+            else:
+                q = y_a/y_c
+                r = y_b/y_c
+                p = s*(2*m*q*(q - r) - (b - a)*(r - 1))
+                q = (q - 1)*(r - 1)*(s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2*p < min(3*m*q - abs(tol*q), abs(e*q)):
+                e, d = d, p/q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, y_a = b, y_b
+        if abs(d) > tol:
+            b += d
+        else:
+            b += tol if m > 0 else -tol
+        y_b = _residual(P, Q, R, b)
+        n_iterations += 1
+        n_evaluations += 1
+    return True, b, n_iterations, n_evaluations, converged
+
+
+@njit(cache=True)
+def _search(solver_code, P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations):
+    if solver_code == SOLVER_CODE_NEWTON:
+        return _newton_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations)
+    if solver_code == SOLVER_CODE_BRENT:
+        return _brent_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations)
+    if solver_code == SOLVER_CODE_ILLINOIS:
+        return _illinois_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations)
+    return _binary_search(P, Q, R, lower, upper, has_init, init, threshold, x_threshold, max_iterations)
+
+
+@njit(cache=True)
+def _solve_direct_half_joint_angle(P, Q, R):
+    # Port of solver.solve_direct
+    if P == 0.0:
+        return 0.0
+    norm = sqrt(P**2 + Q**2)
+    if abs(R) > norm:
+        # No root, NaN
+        return np.nan
+    half_joint_angle = asin(R/norm) - atan(Q/P)
+    if isnan(half_joint_angle):
+        return 0.0
+    if abs(P*sin(half_joint_angle) + Q*cos(half_joint_angle) + R) > 1**-10:
+        print("ERROR:", P*sin(half_joint_angle) + Q*cos(half_joint_angle) + R)
+        half_joint_angle = asin(-R/norm) - atan(Q/P)
+    return half_joint_angle
+
+
+@njit(cache=True)
+def solve_statics(lengths, bottom_curve_radii, top_orientationsDF, tendon_starts, bottom_guide_disps, top_guide_disps,
+                  tensions, solver_code, start_disk_index, top_vec, disk_loads, has_init_joint_angles, init_joint_angles, bracket_half_width,
+                  threshold, x_threshold, max_iterations, joint_angles, contact_reactions, solver_stats):
+    """
+        Recursion of solver.eval_manipulator_state from start_disk_index to disk 1, given the top components of start_disk_index
+        tensions: (n_disks, n_tendons) tensions of the tendon spans below each disk, indexed by tendon
+        disk_loads: (n_disks-1, 6) external loads on disks 1 to n_disks-1 in disk frame, added to the top components
+        Writes joint_angles, contact_reactions and solver_stats ((n_disks-1, 3) of iterations, evaluations, converged) in place
+        bracket_half_width: NaN for no bracket
+        return False if no solution is found
+    """
+    n_disks = len(lengths)
+    n_tendons = tensions.shape[1]
+    top = top_vec.copy()
+    if start_disk_index > 0:
+        for p in range(6):
+            top[p] += disk_loads[start_disk_index-1, p]
+    for i in range(start_disk_index, 0, -1):
+        # Bottom guide weights, see solver.eval_bottom_guide_weights
+        w0 = w1 = w2 = w3 = 0.0
+        for k in range(tendon_starts[i], n_tendons):
+            t = tensions[i, k]
+            w0 += t
+            w1 += t*bottom_guide_disps[i, k, 0]
+            w2 += t*bottom_guide_disps[i, k, 1]
+            w3 += t*bottom_guide_disps[i, k, 2]
+
+        length = lengths[i]
+        r = bottom_curve_radii[i]
+        P = r*top[2] + (length/2 - r)*w0 + w3
+        Q = -r*top[1] - w2
+        R = top[1]*(r - length/2) + top[3]
+
+        if solver_code == SOLVER_CODE_DIRECT:
+            joint_angle = 2*_solve_direct_half_joint_angle(P, Q, R)
+            if isnan(joint_angle):
+                joint_angles[i-1] = np.nan
+                solver_stats[i-1, 2] = False
+                return False
+        else:
+            has_init = True
+            if has_init_joint_angles:
+                init = init_joint_angles[i-1]
+            elif i < n_disks-1:
+                init = joint_angles[i]
+            else:
+                init = 0.0
+
+            if not has_init_joint_angles or isnan(bracket_half_width):
+                found, joint_angle, n_iterations, n_evaluations, converged = _search(
+                    solver_code, P, Q, R, -pi/2, pi/2, has_init, init, threshold, x_threshold, max_iterations)
+            else:
+                found, joint_angle, n_iterations, n_evaluations, converged = _search(
+                    solver_code, P, Q, R, max(-pi/2, init - bracket_half_width), min(pi/2, init + bracket_half_width),
+                    has_init, init, threshold, x_threshold, max_iterations)
+                if not found:
+                    found, joint_angle, n_iterations, n_evaluations, converged = _search(
+                        solver_code, P, Q, R, -pi/2, pi/2, has_init, init, threshold, x_threshold, max_iterations)
+                    n_evaluations += 2
+            if not found:
+                return False
+            solver_stats[i-1, 0] = n_iterations
+            solver_stats[i-1, 1] = n_evaluations
+            solver_stats[i-1, 2] = converged
+        joint_angles[i-1] = joint_angle
+
+        # Bottom contact reaction, see solver._eval_bottom_contact_reaction
+        s = sin(joint_angle/2)
+        c = cos(joint_angle/2)
+        contact = contact_reactions[i-1]
+        contact[0] = -top[0]
+        contact[1] = -top[1] + w0*s
+        contact[2] = -top[2] + w0*c
+        contact[3] = -top[3] + w2*c - w3*s
+        contact[4] = -top[4] - w1*c
+        contact[5] = -top[5] + w1*s
+
+        if i > 1:
+            # Top components of the proximal disk, see solver.eval_proximal_disk_top_components
+            proximal_index = i - 1
+            v0 = v1 = v2 = v3 = 0.0
+            for k in range(tendon_starts[i], n_tendons):
+                t = tensions[i, k]
+                v0 += t
+                v1 += t*top_guide_disps[proximal_index, k, 0]
+                v2 += t*top_guide_disps[proximal_index, k, 1]
+                v3 += t*top_guide_disps[proximal_index, k, 2]
+            cj = cos(joint_angle)
+            sj = sin(joint_angle)
+            cz = cos(top_orientationsDF[proximal_index])
+            sz = sin(top_orientationsDF[proximal_index])
+            fx = contact[0]
+            fy = cj*contact[1] - sj*contact[2]
+            fz = sj*contact[1] + cj*contact[2]
+            mx = contact[3]
+            my = cj*contact[4] - sj*contact[5]
+            mz = sj*contact[4] + cj*contact[5]
+            ux = s*sz
+            uy = -s*cz
+            uz = c
+            top[0] = -(cz*fx - sz*fy) + v0*ux
+            top[1] = -(sz*fx + cz*fy) + v0*uy
+            top[2] = -fz + v0*uz
+            top[3] = -(cz*mx - sz*my) + v2*uz - v3*uy
+            top[4] = -(sz*mx + cz*my) + v3*ux - v1*uz
+            top[5] = -mz + v1*uy - v2*ux
+            for p in range(6):
+                top[p] += disk_loads[i-2, p]
+    return True
+
+
+@njit(cache=True)
+def eval_TFs_DF(top_TFsDF, top_curve_radii, joint_angles, out):
+    """
+        Transformation chain of ManipulatorState.TFs_DF, written into out (n_disks, 4, 4)
+    """
+    a = np.zeros((4, 4))
+    b = np.zeros((4, 4))
+    out[0] = 0.0
+    for j in range(4):
+        out[0, j, j] = 1.0
+    for i in range(1, len(out)):
+        # a = evalTFProximalTopToDistalBottom(joint angle, top curvature radius of proximal disk)
+        angle = joint_angles[i-1]
+        disp = 2*top_curve_radii[i-1]*(1 - cos(angle/2))
+        a[:] = 0.0
+        a[0, 0] = a[3, 3] = 1.0
+        a[1, 1] = a[2, 2] = cos(angle)
+        a[1, 2] = -sin(angle)
+        a[2, 1] = sin(angle)
+        a[1, 3] = -sin(angle/2)*disp
+        a[2, 3] = cos(angle/2)*disp
+
+        # out[i] = out[i-1] * top_TFsDF[i-1] * a
+        for p in range(4):
+            for q in range(4):
+                acc = 0.0
+                for k in range(4):
+                    acc += out[i-1, p, k]*top_TFsDF[i-1, k, q]
+                b[p, q] = acc
+        for p in range(4):
+            for q in range(4):
+                acc = 0.0
+                for k in range(4):
+                    acc += b[p, k]*a[k, q]
+                out[i, p, q] = acc
+    return out
+
+
+@njit(cache=True)
+def eval_tip_TF(lengths, top_orientationsDF, top_curve_radii, tip_orientationDF, joint_angles, out):
+    """
+        Tip transformation of solver.eval_tip_TF, accumulated as solver._accumulate_tip_TF, written into out (4, 4)
+    """
+    rot = np.identity(3)
+    trans = np.zeros(3)
+    for i in range(len(joint_angles) + 1):
+        # Along the disk, then about its top orientation (top_TFsDF), or the tip orientation of the end disk
+        for p in range(3):
+            trans[p] += lengths[i]*rot[p, 2]
+        angle = top_orientationsDF[i] if i < len(joint_angles) else tip_orientationDF
+        c = cos(angle)
+        s = sin(angle)
+        for p in range(3):
+            r0 = rot[p, 0]
+            rot[p, 0] = c*r0 + s*rot[p, 1]
+            rot[p, 1] = c*rot[p, 1] - s*r0
+        if i == len(joint_angles):
+            break
+        
+        # Rolling across the joint (evalTFProximalTopToDistalBottom)
+        angle = joint_angles[i]
+        disp = 2*top_curve_radii[i]*(1 - cos(angle/2))
+        c = cos(angle)
+        s = sin(angle)
+        for p in range(3):
+            trans[p] += disp*(cos(angle/2)*rot[p, 2] - sin(angle/2)*rot[p, 1])
+            r1 = rot[p, 1]
+            rot[p, 1] = c*r1 + s*rot[p, 2]
+            rot[p, 2] = c*rot[p, 2] - s*r1
+    out[:] = 0.0
+    out[:3, :3] = rot
+    out[:3, 3] = trans
+    out[3, 3] = 1.0
+    return out
+
+
+@njit(cache=True)
+def eval_tip_jacobian(lengths, bottom_curve_radii, top_orientationsDF, tendon_starts, bottom_guide_disps, top_guide_disps,
+                      top_curve_radii, tip_orientationDF, tensions, joint_angles, d_joint_angles, tip_TF, tip_TF_jacobian):
+    """
+        Direct solve of solve_statics with (n_tendons,) tensions of a frictionless manipulator without external load, 
+        and tip transformation of eval_tip_TF, with their forward-mode derivatives w.r.t. tensions as batch._eval_jacobian_batch
+        Writes joint_angles (n_disks-1,), d_joint_angles (n_disks-1, n_tendons), tip_TF (4, 4) and tip_TF_jacobian (4, 4, n_tendons) in place
+    """
+    n_disks = len(lengths)
+    n_tendons = len(tensions)
+    top = np.zeros(6)
+    d_top = np.zeros((n_tendons, 6))
+    contact = np.zeros(6)
+    d_contact = np.zeros((n_tendons, 6))
+    d_half_joint_angles = np.zeros(n_tendons)
+    for i in range(n_disks-1, 0, -1):
+        start = tendon_starts[i]
+        w0 = w1 = w2 = w3 = 0.0
+        for k in range(start, n_tendons):
+            t = tensions[k]
+            w0 += t
+            w1 += t*bottom_guide_disps[i, k, 0]
+            w2 += t*bottom_guide_disps[i, k, 1]
+            w3 += t*bottom_guide_disps[i, k, 2]
+        length = lengths[i]
+        r = bottom_curve_radii[i]
+        P = r*top[2] + (length/2 - r)*w0 + w3
+        Q = -r*top[1] - w2
+        R = top[1]*(r - length/2) + top[3]
+        half_joint_angle = _solve_direct_half_joint_angle(P, Q, R)
+        s = sin(half_joint_angle)
+        c = cos(half_joint_angle)
+        joint_angles[i-1] = 2*half_joint_angle
+        for p in range(6):
+            contact[p] = -top[p]
+        contact[1] += w0*s
+        contact[2] += w0*c
+        contact[3] += w2*c - w3*s
+        contact[4] -= w1*c
+        contact[5] += w1*s
+        
+        # Implicit differentiation of P*sin + Q*cos + R = 0, and the derivatives of the bottom contact reaction
+        denom = P*c - Q*s
+        for k in range(n_tendons):
+            # Derivatives of the bottom guide weights w.r.t. tension k
+            if k >= start:
+                dw0, dw1, dw2, dw3 = 1.0, bottom_guide_disps[i, k, 0], bottom_guide_disps[i, k, 1], bottom_guide_disps[i, k, 2]
+            else:
+                dw0 = dw1 = dw2 = dw3 = 0.0
+            dP = r*d_top[k, 2] + (length/2 - r)*dw0 + dw3
+            dQ = -r*d_top[k, 1] - dw2
+            dR = d_top[k, 1]*(r - length/2) + d_top[k, 3]
+            dh = -(dP*s + dQ*c + dR)/denom if denom != 0.0 else 0.0
+            d_half_joint_angles[k] = dh
+            d_joint_angles[i-1, k] = 2*dh
+            d_contact[k, 0] = -d_top[k, 0]
+            d_contact[k, 1] = -d_top[k, 1] + dw0*s + w0*c*dh
+            d_contact[k, 2] = -d_top[k, 2] + dw0*c - w0*s*dh
+            d_contact[k, 3] = -d_top[k, 3] + dw2*c - dw3*s - (w2*s + w3*c)*dh
+            d_contact[k, 4] = -d_top[k, 4] - dw1*c + w1*s*dh
+            d_contact[k, 5] = -d_top[k, 5] + dw1*s + w1*c*dh
+        if i == 1:
+            break
+        
+        # Top components of the proximal disk, as solve_statics
+        proximal_index = i - 1
+        v0 = v1 = v2 = v3 = 0.0
+        for k in range(start, n_tendons):
+            t = tensions[k]
+            v0 += t
+            v1 += t*top_guide_disps[proximal_index, k, 0]
+            v2 += t*top_guide_disps[proximal_index, k, 1]
+            v3 += t*top_guide_disps[proximal_index, k, 2]
+        cj = cos(2*half_joint_angle)
+        sj = sin(2*half_joint_angle)
+        cz = cos(top_orientationsDF[proximal_index])
+        sz = sin(top_orientationsDF[proximal_index])
+        fx = contact[0]
+        fy = cj*contact[1] - sj*contact[2]
+        fz = sj*contact[1] + cj*contact[2]
+        mx = contact[3]
+        my = cj*contact[4] - sj*contact[5]
+        mz = sj*contact[4] + cj*contact[5]
+        ux = s*sz
+        uy = -s*cz
+        uz = c
+        top[0] = -(cz*fx - sz*fy) + v0*ux
+        top[1] = -(sz*fx + cz*fy) + v0*uy
+        top[2] = -fz + v0*uz
+        top[3] = -(cz*mx - sz*my) + v2*uz - v3*uy
+        top[4] = -(sz*mx + cz*my) + v3*ux - v1*uz
+        top[5] = -mz + v1*uy - v2*ux
+        for k in range(n_tendons):
+            if k >= start:
+                dv0, dv1, dv2, dv3 = 1.0, top_guide_disps[proximal_index, k, 0], top_guide_disps[proximal_index, k, 1], top_guide_disps[proximal_index, k, 2]
+            else:
+                dv0 = dv1 = dv2 = dv3 = 0.0
+            dh = d_half_joint_angles[k]
+            # Rotation about x by the joint angle, and its derivative
+            dfx = d_contact[k, 0]
+            dfy = cj*d_contact[k, 1] - sj*d_contact[k, 2] - 2*fz*dh
+            dfz = sj*d_contact[k, 1] + cj*d_contact[k, 2] + 2*fy*dh
+            dmx = d_contact[k, 3]
+            dmy = cj*d_contact[k, 4] - sj*d_contact[k, 5] - 2*mz*dh
+            dmz = sj*d_contact[k, 4] + cj*d_contact[k, 5] + 2*my*dh
+            dux = c*sz*dh
+            duy = -c*cz*dh
+            duz = -s*dh
+            d_top[k, 0] = -(cz*dfx - sz*dfy) + dv0*ux + v0*dux
+            d_top[k, 1] = -(sz*dfx + cz*dfy) + dv0*uy + v0*duy
+            d_top[k, 2] = -dfz + dv0*uz + v0*duz
+            d_top[k, 3] = -(cz*dmx - sz*dmy) + dv2*uz + v2*duz - dv3*uy - v3*duy
+            d_top[k, 4] = -(sz*dmx + cz*dmy) + dv3*ux + v3*dux - dv1*uz - v1*duz
+            d_top[k, 5] = -dmz + dv1*uy + v1*duy - dv2*ux - v2*dux
+    
+    # Kinematics as eval_tip_TF, with the axis and the velocity of each joint, see batch._eval_tip_TF_derivatives_batch
+    n_joints = n_disks - 1
+    axes = np.zeros((n_joints, 3))
+    velocities = np.zeros((n_joints, 3))
+    rot = np.identity(3)
+    trans = np.zeros(3)
+    for i in range(n_disks):
+        for p in range(3):
+            trans[p] += lengths[i]*rot[p, 2]
+        angle = top_orientationsDF[i] if i < n_joints else tip_orientationDF
+        c = cos(angle)
+        s = sin(angle)
+        for p in range(3):
+            r0 = rot[p, 0]
+            rot[p, 0] = c*r0 + s*rot[p, 1]
+            rot[p, 1] = c*rot[p, 1] - s*r0
+        if i == n_joints:
+            break
+        
+        angle = joint_angles[i]
+        r = top_curve_radii[i]
+        half_c = cos(angle/2)
+        half_s = sin(angle/2)
+        disp = 2*r*(1 - half_c)
+        dy = -(half_c*disp/2 + r*half_s**2)
+        dz = r*half_s*half_c - half_s*disp/2
+        for p in range(3):
+            trans[p] += disp*(half_c*rot[p, 2] - half_s*rot[p, 1])
+            axes[i, p] = rot[p, 0]
+            velocities[i, p] = dy*rot[p, 1] + dz*rot[p, 2]
+        # velocity - axis x point
+        velocities[i, 0] -= axes[i, 1]*trans[2] - axes[i, 2]*trans[1]
+        velocities[i, 1] -= axes[i, 2]*trans[0] - axes[i, 0]*trans[2]
+        velocities[i, 2] -= axes[i, 0]*trans[1] - axes[i, 1]*trans[0]
+        c = cos(angle)
+        s = sin(angle)
+        for p in range(3):
+            r1 = rot[p, 1]
+            rot[p, 1] = c*r1 + s*rot[p, 2]
+            rot[p, 2] = c*rot[p, 2] - s*r1
+    tip_TF[:] = 0.0
+    tip_TF[:3, :3] = rot
+    tip_TF[:3, 3] = trans
+    tip_TF[3, 3] = 1.0
+    
+    tip_TF_jacobian[:] = 0.0
+    for k in range(n_tendons):
+        wx = wy = wz = 0.0
+        for j in range(n_joints):
+            d = d_joint_angles[j, k]
+            wx += axes[j, 0]*d
+            wy += axes[j, 1]*d
+            wz += axes[j, 2]*d
+            for p in range(3):
+                tip_TF_jacobian[p, 3, k] += velocities[j, p]*d
+        # skew(angular) * [rotation, translation]
+        for q in range(4):
+            tip_TF_jacobian[0, q, k] += wy*tip_TF[2, q] - wz*tip_TF[1, q]
+            tip_TF_jacobian[1, q, k] += wz*tip_TF[0, q] - wx*tip_TF[2, q]
+            tip_TF_jacobian[2, q, k] += wx*tip_TF[1, q] - wy*tip_TF[0, q]
+    return tip_TF_jacobian
@@ -0,0 +1,51 @@
+import numpy as np
+
+from .models import *
+from .plan import *
+from .plan import _get_side_frame_indices
+from .solver import eval_tip_TF
+from .batch import _eval_TFs_DF_batch
+
+
+def _as_joint_angles_batch(plan: SolvePlan, joint_angles):
+    """
+        return (N, n_disks-1) joint angles, and whether a single (n_disks-1,) input is given
+    """
+    joint_angles = np.asarray(joint_angles, dtype=float)
+    is_single = joint_angles.ndim == 1
+    joint_angles = np.atleast_2d(joint_angles)
+    if joint_angles.shape[1] != plan.n_disks-1:
+        raise ValueError(f"Expect {plan.n_disks-1} joint angles per input, but got {joint_angles.shape[1]}")
+    return joint_angles, is_single
+
+
+def eval_tip_TFs(manipulator_model: ManipulatorMathModel, joint_angles) -> np.ndarray:
+    """
+        Forward kinematics of known joint angles, e.g. from encoders, without solving the statics
+        joint_angles: (N, n_disks-1) bottom joint angles, entry i-1 belongs to disk i, or (n_disks-1,) of one pose
+        return (N, 4, 4) transformations of the top of end disk in base-disk-orientation (ManipulatorState.get_TF(-1, "t", "bd")), 
+               or (4, 4) of one pose
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    joint_angles, is_single = _as_joint_angles_batch(plan, joint_angles)
+    tip_TFs = eval_tip_TF(plan, joint_angles)
+    return tip_TFs[0] if is_single else tip_TFs
+
+
+def eval_disk_TFs(manipulator_model: ManipulatorMathModel, joint_angles, side="b", frame_sys="bc") -> np.ndarray:
+    """
+        Forward kinematics of all disks, as eval_tip_TFs
+        side, frame_sys: as ManipulatorState.get_TF. The default gives ManipulatorState.TFs_DF
+        return (N, n_disks, 4, 4) transformations from the top of the base frame, or (n_disks, 4, 4) of one pose
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    side_index, frame_index = _get_side_frame_indices(side, frame_sys)
+    joint_angles, is_single = _as_joint_angles_batch(plan, joint_angles)
+    TFs = _eval_TFs_DF_batch(plan, joint_angles)
+    if side_index != 0 or frame_index != 1:
+        TFs = np.matmul(TFs, plan.side_frame_TFsDF[:, side_index, frame_index])
+    return TFs[0] if is_single else TFs
@@ -0,0 +1,49 @@
+import numpy as np
+
+from .models import *
+from .plan import *
+
+
+class ExternalLoad:
+    """
+        External loads on the manipulator in base frame, the frame of ManipulatorState.TFs_DF
+        Attributes may carry leading batch dimensions of load cases, e.g. (N, 3) directions, see eval_manipulator_state_batch
+    """
+    def __init__(self, tip_force=(0.0, 0, 0), tip_moment=(0.0, 0, 0), gravity=(0.0, 0, 0)):
+        self.tip_force = np.asarray(tip_force, dtype=float)     # (..., 3) force on the center of the top of end disk, e.g. of a payload
+        self.tip_moment = np.asarray(tip_moment, dtype=float)   # (..., 3) moment on the end disk
+        self.gravity = np.asarray(gravity, dtype=float)         # (..., 3) gravitational acceleration on the disk masses at the disk centers
+    
+    @property
+    def batch_shape(self):
+        return np.broadcast_shapes(self.tip_force.shape[:-1], self.tip_moment.shape[:-1], self.gravity.shape[:-1])
+    
+    def __repr__(self):
+        return f"<ExternalLoad> [tip force={self.tip_force}, tip moment={self.tip_moment}, gravity={self.gravity}]"
+
+
+def eval_disk_loads(plan: SolvePlan, external_load: ExternalLoad, TFs_DF):
+    """
+        Force and moment components of the external load on disks 1 to n_disks-1 in disk frame, 
+        to be added to the top components of each disk (see eval_proximal_disk_top_components)
+        The recursion carries the total moments of the contact reactions across the joints by rotation only, 
+        so the moment of the load forces on the distal disks about the disk center is carried to each disk here
+        TFs_DF: (..., n_disks, 4, 4) transformations of the disks (see eval_TFs_DF), broadcast against the batch shape of the load
+        return (..., n_disks-1, 6) components
+    """
+    TFs_DF = np.asarray(TFs_DF)
+    rotations = TFs_DF[..., 1:, :3, :3]
+    centers = TFs_DF[..., 1:, :3, 3] + plan.lengths[1:, np.newaxis]/2*rotations[..., 2]
+    
+    # Forces and moments about the disk centers in base frame
+    forces = plan.masses[1:, np.newaxis]*external_load.gravity[..., np.newaxis, :] + np.zeros(centers.shape)
+    forces[..., -1, :] += external_load.tip_force
+    moments = np.zeros(forces.shape)
+    moments[..., -1, :] = external_load.tip_moment + np.cross(plan.lengths[-1]/2*rotations[..., -1, :, 2], external_load.tip_force)
+    distal_forces = np.cumsum(forces[..., :0:-1, :], axis=-2)[..., ::-1, :]
+    moments[..., :-1, :] += np.cross(centers[..., 1:, :] - centers[..., :-1, :], distal_forces)
+    
+    # Columns of the rotations are the disk axes in base frame, so their transposes change base frame to disk frame
+    rotationsT = np.swapaxes(rotations, -1, -2)
+    return np.concatenate((np.matmul(rotationsT, forces[..., np.newaxis])[..., 0], 
+                           np.matmul(rotationsT, moments[..., np.newaxis])[..., 0]), axis=-1)
@@ -5,6 +5,7 @@ import numpy as np
 from ..common import ErrorDict
 from .calculation import *
 from .vec import *
+from .plan import *
 
 
 
@@ -19,7 +20,8 @@ class SegmentMathConfig:
     """
         Geometry definition of segment
     """
-    def __init__(self, is_2_DoF, n_joints, disk_length, orientationBF, curve_radius, tendon_dist_from_axis, end_disk_length):
+    def __init__(self, is_2_DoF, n_joints, disk_length, orientationBF, curve_radius, tendon_dist_from_axis, end_disk_length, friction_coefficient=0.0,
+                 disk_mass=0.0, end_disk_mass=0.0):
         self.n_joints = n_joints
         self.is_2_DoF = is_2_DoF
         self.disk_length = disk_length
@@ -27,6 +29,9 @@ class SegmentMathConfig:
         self.curve_radius = curve_radius
         self.tendon_dist_from_axis = tendon_dist_from_axis
         self.end_disk_length = end_disk_length
+        self.friction_coefficient = friction_coefficient # Capstan friction coefficient between tendons and guides of the disks
+        self.disk_mass = disk_mass # Masses of the disks for their weight under ExternalLoad.gravity
+        self.end_disk_mass = end_disk_mass
     
             
 class TendonMathModel:
@@ -45,24 +50,29 @@ class DiskMathModel:
     """
         Geometry of disk 
     """
-    def __init__(self, outer_diameter, length, bottom_orientationBF=0.0, bottom_curve_radius=None, top_orientationBF=None, top_curve_radius=None):
+    def __init__(self, outer_diameter, length, bottom_orientationBF=0.0, bottom_curve_radius=None, top_orientationBF=None, top_curve_radius=None,
+                 friction_coefficient=0.0, mass=0.0):
         self.outer_diameter = outer_diameter
         self.length = length
         self.bottom_orientationBF = bottom_orientationBF
         self.bottom_curve_radius = bottom_curve_radius
         self.top_orientationBF = top_orientationBF
         self.top_curve_radius = top_curve_radius
+        self.friction_coefficient = friction_coefficient
+        self.mass = mass
     
     @staticmethod
-    def Base(outer_diameter, length, top_orientationBF, top_curve_radius):
-        return DiskMathModel(outer_diameter, length, top_orientationBF=top_orientationBF, top_curve_radius=top_curve_radius)
+    def Base(outer_diameter, length, top_orientationBF, top_curve_radius, friction_coefficient=0.0):
+        return DiskMathModel(outer_diameter, length, top_orientationBF=top_orientationBF, top_curve_radius=top_curve_radius, 
+                             friction_coefficient=friction_coefficient)
         
     @staticmethod
-    def End(outer_diameter, length, bottom_orientationBF, bottom_curve_radius):
-        return DiskMathModel(outer_diameter, length, bottom_orientationBF, bottom_curve_radius, top_orientationBF=bottom_orientationBF)
+    def End(outer_diameter, length, bottom_orientationBF, bottom_curve_radius, friction_coefficient=0.0, mass=0.0):
+        return DiskMathModel(outer_diameter, length, bottom_orientationBF, bottom_curve_radius, top_orientationBF=bottom_orientationBF, 
+                             friction_coefficient=friction_coefficient, mass=mass)
     
     def __repr__(self):
-        return f"<DiskMathModel> [outer diameter={self.outer_diameter}, length={self.length}, bottom orientation={self.bottom_orientationBF}, bottom curvature radius={self.bottom_curve_radius}, top orientation={self.top_orientationBF}, top curvature radius={self.top_curve_radius}]"
+        return f"<DiskMathModel> [outer diameter={self.outer_diameter}, length={self.length}, bottom orientation={self.bottom_orientationBF}, bottom curvature radius={self.bottom_curve_radius}, top orientation={self.top_orientationBF}, top curvature radius={self.top_curve_radius}, friction coefficient={self.friction_coefficient}, mass={self.mass}]"
     
 class ManipulatorMathModel:
     def __init__(self, segment_configs:List[SegmentMathConfig]=[], base_disk_length:float=0., outer_diameter:float=0.):
@@ -72,6 +82,7 @@ class ManipulatorMathModel:
         self._outer_diameter = outer_diameter
         self._disks:List[DiskMathModel] = []
         self._tendons:List[TendonMathModel] = []
+        self._solve_plan:SolvePlan = None
         self._error_dict = ErrorDict()
         
         self.ensure_generation()
@@ -108,17 +119,27 @@ class ManipulatorMathModel:
     def get_tendons_at_disk(self, index):
         if not self.ensure_generation():
             return []
-        return [t for t in self._tendons if t.n_joints >= index]
+        return self._tendons[self._search_tendons(index, "left"):]
     
     def get_knobbed_tendons_at_disk(self, index):
         if not self.ensure_generation():
             return []
-        return [t for t in self._tendons if t.n_joints == index]
+        return self._tendons[self._search_tendons(index, "left"):self._search_tendons(index, "right")]
     
     def get_unkobbed_tendons_at_disk(self, index):
         if not self.ensure_generation():
             return []
-        return [t for t in self._tendons if t.n_joints > index]
+        return self._tendons[self._search_tendons(index, "right"):]
+    
+    def _search_tendons(self, n_joints, side):
+        """
+            Index of the first tendon with n_joints >= (side = "left") or > (side = "right") the given one
+            as tendons are sorted by n_joints
+        """
+        plan = self.compile()
+        if plan is None:
+            return len(self._tendons)
+        return int(np.searchsorted(plan.tendon_n_joints, n_joints, side=side))
     
     @property
     def error_dict(self):
@@ -148,6 +169,7 @@ class ManipulatorMathModel:
 
         self._disks.clear()
         self._tendons.clear()
+        self._solve_plan = None
         self._error_dict.clear()
         
         if outer_diameter is not None:
@@ -171,28 +193,35 @@ class ManipulatorMathModel:
             elif s.curve_radius - sqrt(s.curve_radius**2 - (self._outer_diameter/2)**2) > s.disk_length/2:
                 self._error_dict.add(s, "Physical compatibility: The disk length is too small and not achivable with the configured curvature radius and outer diameter")
 
+            if s.friction_coefficient < 0:
+                self._error_dict.add(s, "Physical compatibility: Friction coefficient must be non-negative")
+
+            if s.disk_mass < 0 or s.end_disk_mass < 0:
+                self._error_dict.add(s, "Physical compatibility: Disk masses must be non-negative")
+
         return not self._error_dict.has_errors()
         
     
     def generate_models(self) -> bool:
+        self._solve_plan = None
         if not self.is_config_valid():
             return None
         
         scs = self._segment_configs
         
         # Disk
-        self._disks = [DiskMathModel.Base(self._outer_diameter, self._base_disk_length, scs[0].orientationBF, scs[0].curve_radius),]
+        self._disks = [DiskMathModel.Base(self._outer_diameter, self._base_disk_length, scs[0].orientationBF, scs[0].curve_radius, scs[0].friction_coefficient),]
         for i,sc in enumerate(scs):
             orientationFlag = False
             for _ in range(sc.n_joints-1):
-                self._disks.append(DiskMathModel(self._outer_diameter, sc.disk_length, sc.orientationBF + (pi/2 if sc.is_2_DoF and orientationFlag else 0), sc.curve_radius, sc.orientationBF + (pi/2 if sc.is_2_DoF and not orientationFlag else 0), sc.curve_radius))
+                self._disks.append(DiskMathModel(self._outer_diameter, sc.disk_length, sc.orientationBF + (pi/2 if sc.is_2_DoF and orientationFlag else 0), sc.curve_radius, sc.orientationBF + (pi/2 if sc.is_2_DoF and not orientationFlag else 0), sc.curve_radius, sc.friction_coefficient, sc.disk_mass))
                 orientationFlag = not orientationFlag
                 
             if i >= len(scs)-1:
-                self._disks.append(DiskMathModel.End(self._outer_diameter, sc.end_disk_length, sc.orientationBF + (pi/2 if sc.is_2_DoF and orientationFlag else 0), sc.curve_radius))
+                self._disks.append(DiskMathModel.End(self._outer_diameter, sc.end_disk_length, sc.orientationBF + (pi/2 if sc.is_2_DoF and orientationFlag else 0), sc.curve_radius, sc.friction_coefficient, sc.end_disk_mass))
                 break
             
-            self._disks.append(DiskMathModel(self._outer_diameter, sc.end_disk_length, sc.orientationBF + (pi/2 if sc.is_2_DoF and orientationFlag else 0), sc.curve_radius, scs[i+1].orientationBF, scs[i+1].curve_radius))
+            self._disks.append(DiskMathModel(self._outer_diameter, sc.end_disk_length, sc.orientationBF + (pi/2 if sc.is_2_DoF and orientationFlag else 0), sc.curve_radius, scs[i+1].orientationBF, scs[i+1].curve_radius, sc.friction_coefficient, sc.end_disk_mass))
         
         # Tendon
         self._tendons = []
@@ -205,6 +234,16 @@ class ManipulatorMathModel:
                 self._tendons += [TendonMathModel(o, sc.tendon_dist_from_axis, n_jointsThrough) for o in (np.array((-pi/2, pi/2)) + sc.orientationBF)]
         return True
     
+    def compile(self) -> SolvePlan:
+        """
+            Flat array representation of the generated disks and tendons for solvers, evaluated once per generation
+        """
+        if not self.ensure_generation() or not self._disks:
+            return None
+        if self._solve_plan is None:
+            self._solve_plan = SolvePlan(self._disks, self._tendons)
+        return self._solve_plan
+    
     def ensure_generation(self):
         if (not self._disks or not self._tendons) and self._segment_configs:
             return self.generate_models()
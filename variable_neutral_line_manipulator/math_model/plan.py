@@ -0,0 +1,102 @@
+import numpy as np
+
+from .calculation import *
+
+
+# Sides and frame systems of ManipulatorState.get_TF, in the order of the side and frame axes of transformation tensors
+TF_SIDES = ("b", "c", "t")
+TF_FRAME_SYSS = ("bd", "bc", "tc")
+
+
+def _get_side_frame_indices(side, frame_sys):
+    if side not in TF_SIDES:
+        raise AttributeError(f"'side' must not be {side}, but either 'b', 'c' or 't'") 
+    if frame_sys not in TF_FRAME_SYSS:
+        raise AttributeError(f"'frame' must not be {frame_sys}, but either 'bd', 'bc' or 'tc'") 
+    return TF_SIDES.index(side), TF_FRAME_SYSS.index(frame_sys)
+
+
+class SolvePlan:
+    """
+        Flat array representation of the geometry of a manipulator, evaluated once for solvers
+        Disks are indexed as ManipulatorMathModel.disks (0: base disk), tendons as ManipulatorMathModel.tendons
+        The tendons through disk i are the contiguous tail starting at tendon_starts[i],
+        of which the ones knobbed at disk i are in [knob_starts[i], knob_ends[i])
+        Entries of tendons not passing through a disk are 0 in the guide displacement tables
+    """
+    def __init__(self, disks, tendons):
+        n = len(disks)
+        m = len(tendons)
+        self.n_disks = n
+        self.n_tendons = m
+
+        # Disk
+        self.lengths = np.array([d.length for d in disks], dtype=float)
+        self.bottom_orientationsBF = np.array([d.bottom_orientationBF for d in disks], dtype=float)
+        self.top_orientationsBF = np.array([d.top_orientationBF for d in disks], dtype=float)
+        self.bottom_curve_radii = np.array([np.nan if d.bottom_curve_radius is None else d.bottom_curve_radius for d in disks])
+        self.top_curve_radii = np.array([np.nan if d.top_curve_radius is None else d.top_curve_radius for d in disks])
+        self.friction_coefficients = np.array([d.friction_coefficient for d in disks], dtype=float)
+        self.has_friction = bool(np.any(self.friction_coefficients))
+        self.masses = np.array([d.mass for d in disks], dtype=float)
+        # Orientation of the top curvature in disk frame, which equals the bottom orientation of the distal disk in disk frame
+        self.top_orientationsDF = self.top_orientationsBF - self.bottom_orientationsBF
+        self.top_rotationsDF = m3MatrixRotationZArray(self.top_orientationsDF)
+        # Transformation from the bottom of disk to its top, in the orientation of the top curvature
+        self.top_TFsDF = np.matmul(m4MatrixTranslationArray(np.outer(self.lengths, (0, 0, 1.0))), m4MatrixRotationZArray(self.top_orientationsDF))
+
+        # Transformations from the bottom of disk in bottom-curvature-orientation to its sides in each frame system,
+        # as (n_disks, TF_SIDES, TF_FRAME_SYSS, 4, 4)
+        side_offsets = np.zeros((n, 3, 1, 3))
+        side_offsets[..., 2] = np.outer(self.lengths, (0.0, 0.5, 1.0))[:, :, np.newaxis]
+        frame_angles = np.stack((-self.bottom_orientationsBF, np.zeros(n), self.top_orientationsDF), axis=1)[:, np.newaxis, :]
+        self.side_frame_TFsDF = np.matmul(m4MatrixTranslationArray(side_offsets), m4MatrixRotationZArray(frame_angles))
+
+        # Tendon
+        self.tendon_orientationsBF = np.array([t.orientationBF for t in tendons], dtype=float)
+        self.tendon_dists_from_axis = np.array([t.dist_from_axis for t in tendons], dtype=float)
+        self.tendon_n_joints = np.array([t.n_joints for t in tendons], dtype=int)
+
+        # Tendons are sorted by the index of their knobbed disk
+        self.tendon_starts = np.searchsorted(self.tendon_n_joints, np.arange(n), side="left")
+        self.knob_starts = self.tendon_starts.copy()
+        self.knob_ends = np.append(self.tendon_starts[1:], m)
+
+        # Rows of disks 1 to n-1 against all tendons, with entries of tendons not passing through the disk masked to 0
+        is_active = (np.arange(m)[np.newaxis, :] >= self.tendon_starts[1:, np.newaxis])[..., np.newaxis]
+        dists = self.tendon_dists_from_axis[np.newaxis, :]
+        self.bottom_guide_disps = np.zeros((n, m, 3))
+        self.top_guide_disps = np.zeros((n, m, 3))
+        with np.errstate(invalid="ignore"):
+            self.bottom_guide_disps[1:] = np.where(is_active, evalBottomGuideEndDispArray(
+                self.lengths[1:, np.newaxis], self.bottom_curve_radii[1:, np.newaxis], dists,
+                self.tendon_orientationsBF[np.newaxis, :] - self.bottom_orientationsBF[1:, np.newaxis]), 0.0)
+            self.top_guide_disps[:-1] = np.where(is_active, evalTopGuideEndDispArray(
+                self.lengths[:-1, np.newaxis], self.bottom_curve_radii[1:, np.newaxis], dists,
+                self.tendon_orientationsBF[np.newaxis, :] - self.bottom_orientationsBF[:-1, np.newaxis], self.top_orientationsDF[:-1, np.newaxis]), 0.0)
+
+        # Coefficients of the tendon spans across joints 1 to n-1 (see eval_span_lengths), 0 for tendons not across a joint
+        self.span_curve_radii = np.where(is_active[..., 0], self.bottom_curve_radii[1:, np.newaxis], 0.0)
+        self.span_guide_heights = np.where(is_active[..., 0], self.bottom_guide_disps[1:, :, 2] + self.lengths[1:, np.newaxis]/2, 0.0)
+        
+        # Lengths of the straight guides of the tendons through each disk, from the bottom end (bottom of base disk) to the top end
+        # (top of end disk, or the knob on the top curvature of the knobbed disk)
+        passes = np.arange(m)[np.newaxis, :] >= self.tendon_starts[:, np.newaxis]
+        bottom_ends = self.bottom_guide_disps[:, :, 2].copy()
+        bottom_ends[:1] = -self.lengths[:1, np.newaxis]/2
+        top_ends = np.empty((n, m))
+        top_ends[-1:] = self.lengths[-1:, np.newaxis]/2
+        with np.errstate(invalid="ignore"):
+            top_ends[:-1] = evalTopGuideEndDispArray(
+                self.lengths[:-1, np.newaxis], self.bottom_curve_radii[1:, np.newaxis], dists,
+                self.tendon_orientationsBF[np.newaxis, :] - self.bottom_orientationsBF[:-1, np.newaxis], self.top_orientationsDF[:-1, np.newaxis])[..., 2]
+        self.guide_lengths = np.where(passes, top_ends - bottom_ends, 0.0)
+
+    def flatten_tension_inputs(self, tension_inputs) -> np.ndarray:
+        """
+            Convert nested tension inputs (one list per knobbed disk, from proximal to distal) into tensions indexed by tendon
+        """
+        tensions = np.array([t for ts in tension_inputs for t in ts], dtype=float)
+        if len(tensions) != self.n_tendons:
+            raise ValueError(f"Expect {self.n_tendons} tensions, but got {len(tensions)}")
+        return tensions
@@ -0,0 +1,143 @@
+import numpy as np
+
+from .models import *
+from .plan import *
+from .solver import eval_tip_TF
+from .batch import _solve_direct_batch, _eval_proximal_disk_top_components_batch, _eval_joint_angles_batch
+
+
+# Geometry parameters of sensitivity analysis, of each SegmentMathConfig and of ManipulatorMathModel
+SEGMENT_GEOMETRY_PARAMETERS = ("curve_radius", "tendon_dist_from_axis", "disk_length")
+MANIPULATOR_GEOMETRY_PARAMETERS = ("outer_diameter",)
+
+# Per-disk geometry of SolvePlan entering the statics (see _eval_last_changed_disk)
+_STATICS_GEOMETRY = ("lengths", "bottom_curve_radii", "top_curve_radii", "top_orientationsDF", "bottom_guide_disps", "top_guide_disps")
+
+
+class GeometrySensitivity:
+    """
+        Joint angles and tip transformation (top of end disk, base-disk-orientation) of the direct solver,
+        with their derivatives w.r.t. geometry parameters by central differences
+        Attributes except parameters may carry leading batch dimensions
+    """
+    def __init__(self, parameters, joint_angles, joint_angle_sensitivity, tip_TF, tip_TF_sensitivity):
+        self.parameters = parameters                            # [(segment index, parameter name)], segment index is None for parameters of ManipulatorMathModel
+        self.joint_angles = joint_angles                        # (n_disks-1,)
+        self.joint_angle_sensitivity = joint_angle_sensitivity  # (n_disks-1, n_parameters)
+        self.tip_TF = tip_TF                                    # (4, 4)
+        self.tip_TF_sensitivity = tip_TF_sensitivity            # (4, 4, n_parameters)
+
+    @property
+    def tip_position_sensitivity(self):
+        return self.tip_TF_sensitivity[..., :3, 3, :]
+
+    def __repr__(self):
+        return f"<GeometrySensitivity> [parameters={self.parameters}, tip TF shape={self.tip_TF.shape}]"
+
+
+def _get_geometry_parameter(manipulator_model: ManipulatorMathModel, segment_index, name):
+    if segment_index is None:
+        return getattr(manipulator_model, name)
+    return getattr(manipulator_model.segment_configs[segment_index], name)
+
+
+def _perturb_geometry_parameter(manipulator_model: ManipulatorMathModel, segment_index, name, value) -> ManipulatorMathModel:
+    """
+        Copy of the model with one geometry parameter set to value
+    """
+    configs = manipulator_model.segment_configs
+    kwargs = {"base_disk_length": manipulator_model.base_disk_length, "outer_diameter": manipulator_model.outer_diameter}
+    if segment_index is None:
+        kwargs[name] = value
+    else:
+        configs[segment_index] = SegmentMathConfig(**dict(vars(configs[segment_index]), **{name: value}))
+    return ManipulatorMathModel(configs, **kwargs)
+
+
+def _eval_last_changed_disk(plan: SolvePlan, other: SolvePlan):
+    """
+        Index of the most distal disk whose geometry entering the statics differs between the plans, or -1 if none does
+        Disks distal to it have the same statics in both plans, as the recursion runs from distal to proximal
+    """
+    changed = np.zeros(plan.n_disks, dtype=bool)
+    for name in _STATICS_GEOMETRY:
+        a = getattr(plan, name).reshape(plan.n_disks, -1)
+        b = getattr(other, name).reshape(plan.n_disks, -1)
+        changed |= np.any((a != b) & ~(np.isnan(a) & np.isnan(b)), axis=1)
+    return int(np.flatnonzero(changed)[-1]) if np.any(changed) else -1
+
+
+def _resolve_joint_angles_batch(plan: SolvePlan, tensions, joint_angles, contact_reactions, last_changed):
+    """
+        Solve disks last_changed to 1 of plan with the direct solver,
+        reusing the (N, n_disks-1) joint angles and (N, n_disks-1, 6) contact reactions of the distal disks
+        return (N, n_disks-1) bottom joint angles
+    """
+    joint_angles = joint_angles.copy()
+    if last_changed < 1:
+        return joint_angles
+    if last_changed == plan.n_disks-1:
+        top_vec = np.zeros((tensions.shape[0], 6))
+    else:
+        top_vec = _eval_proximal_disk_top_components_batch(plan, last_changed+1, tensions, joint_angles[:, last_changed],
+                                                           contact_reactions[:, last_changed])
+    for i in range(last_changed, 0, -1):
+        joint_angles[:, i-1], bottom_contact_reactionsDF = _solve_direct_batch(plan, i, tensions, top_vec)
+        if i > 1:
+            top_vec = _eval_proximal_disk_top_components_batch(plan, i, tensions, joint_angles[:, i-1], bottom_contact_reactionsDF)
+    return joint_angles
+
+
+def eval_geometry_sensitivity_batch(manipulator_model: ManipulatorMathModel, tensions, parameters=None, rel_step=0.000001) -> GeometrySensitivity:
+    """
+        Evaluate the joint angles and tip transformations of N tension inputs with the direct solver,
+        together with their derivatives w.r.t. geometry parameters by central differences
+        tensions: (N, n_tendons) array, as in eval_manipulator_state_batch
+        parameters: [(segment index, parameter name)] of SEGMENT_GEOMETRY_PARAMETERS, or (None, parameter name) of MANIPULATOR_GEOMETRY_PARAMETERS.
+                    Defaults to all SEGMENT_GEOMETRY_PARAMETERS of each segment
+        rel_step: step of each parameter relative to its value (at least 1)
+        Each perturbed model is solved for all inputs at once, from its most distal changed disk,
+        as the solutions of the distal disks are shared with the unperturbed model.
+        outer_diameter only constrains the validity of the model, so its derivatives are 0, and it is evaluated only if given
+        return GeometrySensitivity with leading dimension N
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+
+    tensions = np.asarray(tensions, dtype=float)
+    if tensions.ndim == 1:
+        tensions = tensions[np.newaxis, :]
+    if tensions.shape[1] != plan.n_tendons:
+        raise ValueError(f"Expect {plan.n_tendons} tensions per input, but got {tensions.shape[1]}")
+    if parameters is None:
+        parameters = [(i, name) for i in range(len(manipulator_model.segment_configs)) for name in SEGMENT_GEOMETRY_PARAMETERS]
+    parameters = list(parameters)
+    for segment_index, name in parameters:
+        if name not in (MANIPULATOR_GEOMETRY_PARAMETERS if segment_index is None else SEGMENT_GEOMETRY_PARAMETERS):
+            raise ValueError(f"Unknown geometry parameter {name} of segment {segment_index}")
+
+    n = tensions.shape[0]
+    joint_angles, contact_reactions = _eval_joint_angles_batch(plan, tensions, True)
+    tip_TF = eval_tip_TF(plan, joint_angles)
+
+    joint_angle_sensitivity = np.zeros((n, plan.n_disks-1, len(parameters)))
+    tip_TF_sensitivity = np.zeros((n, 4, 4, len(parameters)))
+    for k, (segment_index, name) in enumerate(parameters):
+        value = _get_geometry_parameter(manipulator_model, segment_index, name)
+        step = rel_step*max(abs(value), 1.0)
+        results = []
+        for perturbed_value in (value + step, value - step):
+            perturbed_plan = _perturb_geometry_parameter(manipulator_model, segment_index, name, perturbed_value).compile()
+            if perturbed_plan is None:
+                raise ValueError(f"Model with {name} of segment {segment_index} perturbed to {perturbed_value} is invalid")
+            last_changed = _eval_last_changed_disk(plan, perturbed_plan)
+            if last_changed < 0:
+                results.append((joint_angles, tip_TF))
+                continue
+            perturbed_joint_angles = _resolve_joint_angles_batch(perturbed_plan, tensions, joint_angles, contact_reactions, last_changed)
+            results.append((perturbed_joint_angles, eval_tip_TF(perturbed_plan, perturbed_joint_angles)))
+        joint_angle_sensitivity[..., k] = (results[0][0] - results[1][0])/(2*step)
+        tip_TF_sensitivity[..., k] = (results[0][1] - results[1][1])/(2*step)
+
+    return GeometrySensitivity(parameters, joint_angles, joint_angle_sensitivity, tip_TF, tip_TF_sensitivity)
@@ -0,0 +1,271 @@
+"""
+    Local solve service holding compiled manipulator models, for tools sharing the same manipulators
+    Protocol: one JSON object per line over a UNIX socket (address: path) or localhost TCP (address: (host, port))
+        {"id": any, "method": "solve", "model": name, "tensions": [tensions indexed by tendon]}
+            -> {"id", "joint_angles": [n_disks-1], "tip_TF": 4x4, "latency": seconds, "batch_size": int}
+        {"id": any, "method": "register", "model": name, "segment_configs": [SegmentMathConfig kwargs],
+         "base_disk_length": float, "outer_diameter": float} -> {"id", "n_tendons": int}
+        {"id": any, "method": "metrics"} -> {"id", "metrics": SolveServerMetrics.summary()}
+        Failed requests are answered with {"id", "error": message}, id being None for lines that are not JSON objects
+    Concurrent solve requests of a model arriving within batch_window are solved as one batch with the direct solver
+    Run: python -m variable_neutral_line_manipulator.math_model.server [path | host:port]
+"""
+import asyncio
+import json
+import socket
+import sys
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+from .models import *
+from .solver import eval_tip_TF
+from .batch import eval_manipulator_state_batch
+
+
+class SolveServerMetrics:
+    """
+        Latencies (from arrival to result) of recent solve requests, and sizes of recent batches
+    """
+    def __init__(self, history=10000):
+        self.n_requests = 0
+        self.n_batches = 0
+        self.latencies = deque(maxlen=history)
+        self.batch_sizes = deque(maxlen=history)
+
+    def summary(self):
+        latencies = np.array(self.latencies)
+        batch_sizes = np.array(self.batch_sizes)
+        return {
+            "n_requests": self.n_requests,
+            "n_batches": self.n_batches,
+            "latency_mean": float(latencies.mean()) if len(latencies) else None,
+            "latency_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "latency_p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            "batch_size_mean": float(batch_sizes.mean()) if len(batch_sizes) else None,
+            "batch_size_max": int(batch_sizes.max()) if len(batch_sizes) else None,
+        }
+
+    def __repr__(self):
+        return f"<SolveServerMetrics> {self.summary()}"
+
+
+class SolveServer:
+    """
+        batch_window: seconds to wait for more requests after the first request of a batch
+        max_batch_size: solve a batch right away once it has this many requests
+    """
+    def __init__(self, models=None, batch_window=0.002, max_batch_size=1024):
+        self.models = dict(models or {})
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.metrics = SolveServerMetrics()
+
+        self._pending = {}  # {model name: [(tensions, arrival time, future)]}
+        self._flush_handles = {}
+        self._server = None
+
+    def register(self, name, manipulator_model: ManipulatorMathModel):
+        """
+            return number of tendons of the model
+        """
+        plan = manipulator_model.compile()
+        if plan is None:
+            raise ValueError(f"Model {name} is invalid")
+        self.models[name] = manipulator_model
+        return plan.n_tendons
+
+    async def solve(self, name, tensions):
+        """
+            Solve with the requests of the same model within the batch window
+            return ((n_disks-1,) bottom joint angles, (4, 4) tip transformation, batch size)
+        """
+        if name not in self.models:
+            raise KeyError(f"Unknown model {name}")
+        tensions = np.asarray(tensions, dtype=float)
+        n_tendons = self.models[name].compile().n_tendons
+        if tensions.shape != (n_tendons,):
+            raise ValueError(f"Expect {n_tendons} tensions, but got {tensions.shape}")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(name, [])
+        pending.append((tensions, perf_counter(), future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(name)
+        elif name not in self._flush_handles:
+            self._flush_handles[name] = loop.call_later(self.batch_window, self._flush, name)
+        return await future
+
+    def _flush(self, name):
+        handle = self._flush_handles.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+        requests = self._pending.pop(name, [])
+        if requests:
+            asyncio.ensure_future(self._solve_batch(name, requests))
+
+    async def _solve_batch(self, name, requests):
+        model = self.models[name]
+        tensions = np.array([t for t, _, _ in requests])
+
+        def _solve():
+            joint_angles = eval_manipulator_state_batch(model, tensions)
+            return joint_angles, eval_tip_TF(model.compile(), joint_angles)
+
+        try:
+            # Off the event loop, to keep accepting requests of the next batch
+            joint_angles, tip_TFs = await asyncio.get_running_loop().run_in_executor(None, _solve)
+        except Exception as e:
+            for _, _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = perf_counter()
+        self.metrics.n_batches += 1
+        self.metrics.batch_sizes.append(len(requests))
+        for k, (_, arrival, future) in enumerate(requests):
+            self.metrics.n_requests += 1
+            self.metrics.latencies.append(now - arrival)
+            if not future.done():
+                future.set_result((joint_angles[k], tip_TFs[k], len(requests)))
+
+    async def handle_request(self, request):
+        """
+            return the response of a decoded request
+        """
+        start = perf_counter()
+        if not isinstance(request, dict):
+            return {"id": None, "error": f"ValueError: Expect a JSON object, but got {type(request).__name__}"}
+        response = {"id": request.get("id")}
+        try:
+            method = request.get("method", "solve")
+            if method == "solve":
+                joint_angles, tip_TF, batch_size = await self.solve(request["model"], request["tensions"])
+                response.update(joint_angles=joint_angles.tolist(), tip_TF=tip_TF.tolist(),
+                                latency=perf_counter() - start, batch_size=batch_size)
+            elif method == "register":
+                model = ManipulatorMathModel([SegmentMathConfig(**c) for c in request["segment_configs"]],
+                                             base_disk_length=request.get("base_disk_length", 0.),
+                                             outer_diameter=request.get("outer_diameter", 0.))
+                response.update(n_tendons=self.register(request["model"], model))
+            elif method == "metrics":
+                response.update(metrics=self.metrics.summary())
+            else:
+                raise ValueError(f"Unknown method {method}")
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+        return response
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def _respond(line):
+            try:
+                response = await self.handle_request(json.loads(line))
+            except json.JSONDecodeError as e:
+                response = {"id": None, "error": f"JSONDecodeError: {e}"}
+            # A line is written at once, responses of concurrent requests may be out of order
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(_respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, address):
+        """
+            address: path of UNIX socket, or (host, port) of TCP. Port 0 picks a free port
+            return the bound address
+        """
+        if isinstance(address, str):
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=address)
+            return address
+        self._server = await asyncio.start_server(self._handle_connection, host=address[0], port=address[1])
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self, address):
+        await self.start(address)
+        await self._server.serve_forever()
+
+
+class SolveClient:
+    """
+        Blocking client of SolveServer, one request at a time
+    """
+    def __init__(self, address, timeout=None):
+        if isinstance(address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(address)
+        self._file = self._socket.makefile("rwb")
+        self._next_id = 0
+
+    def request(self, method, **kwargs):
+        self._next_id += 1
+        self._file.write(json.dumps(dict(kwargs, id=self._next_id, method=method)).encode() + b"\n")
+        self._file.flush()
+        response = json.loads(self._file.readline())
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def register(self, name, segment_configs, base_disk_length=0., outer_diameter=0.):
+        """
+            segment_configs: list of SegmentMathConfig kwargs
+        """
+        return self.request("register", model=name, segment_configs=segment_configs,
+                            base_disk_length=base_disk_length, outer_diameter=outer_diameter)["n_tendons"]
+
+    def solve(self, name, tensions):
+        """
+            return ((n_disks-1,) bottom joint angles, (4, 4) tip transformation)
+        """
+        response = self.request("solve", model=name, tensions=list(map(float, tensions)))
+        return np.array(response["joint_angles"]), np.array(response["tip_TF"])
+
+    def metrics(self):
+        return self.request("metrics")["metrics"]
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main(argv):
+    address = argv[0] if argv else "127.0.0.1:8765"
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+        address = (host, int(port))
+    print(f"Serving on {address}")
+    asyncio.run(SolveServer().serve_forever(address))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
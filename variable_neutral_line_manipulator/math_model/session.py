@@ -0,0 +1,118 @@
+import numpy as np
+
+from .models import *
+from .solver import *
+from .solver import _solve_statics, _solve_statics_fixed_point
+
+
+class SolverSession:
+    """
+        Stateful solver for a stream of slightly varying tension inputs of a manipulator
+        The root search of each disk is seeded with the bottom joint angle of the disk in the previous solve,
+        within a bracket of +- bracket_half_width around it (widened to the full range if the root lies outside)
+        Disks unaffected by the changed tensions keep their previous solutions (see eval_manipulator_state)
+        solve returns new ManipulatorStates, which outlive the next call. solve_joint_angles writes into buffers of the session instead, 
+        allocated once per model generation and reused across calls
+    """
+    def __init__(self, manipulator_model:ManipulatorMathModel, solver_type=SolverType.BRENT, bracket_half_width=0.05, **search_kwargs):
+        self.model = manipulator_model
+        self.solver_type = solver_type
+        self.bracket_half_width = bracket_half_width
+        self.search_kwargs = search_kwargs
+        # Without friction or external load, the recursion is solved once and takes no arguments of the fixed point iteration
+        self._is_fixed_point = search_kwargs.get("external_load") is not None
+        self._statics_kwargs = {k: v for k, v in search_kwargs.items() 
+                                if k not in ("fixed_point_threshold", "max_fixed_point_iterations", "external_load")}
+
+        self._state:ManipulatorState = None
+        self._plan:SolvePlan = None
+        self._is_warm = False
+        self._tensions = np.zeros(0)
+        self._joint_angles = np.zeros(0)
+        self._init_joint_angles = np.zeros(0)
+        self._contact_reactions = np.zeros((0, 6))
+        self._top_vec = np.zeros(6)
+        self._solver_stats = []
+
+    @property
+    def state(self):
+        """
+            Previous manipulator state of solve, None before the first solve, after a failed solve or after solve_joint_angles
+        """
+        return self._state
+
+    def reset(self):
+        self._state = None
+        self._is_warm = False
+
+    def _ensure_buffers(self):
+        plan = self.model.compile()
+        if plan is not self._plan:
+            # Model has been regenerated
+            self._plan = plan
+            self.reset()
+            n_joints = 0 if plan is None else plan.n_disks-1
+            self._tensions = np.zeros(0 if plan is None else plan.n_tendons)
+            self._joint_angles = np.zeros(n_joints)
+            self._init_joint_angles = np.zeros(n_joints)
+            self._contact_reactions = np.zeros((n_joints, 6))
+            self._solver_stats = [None]*n_joints
+        return plan
+
+    def solve(self, tension_inputs) -> ManipulatorState:
+        if self._ensure_buffers() is None:
+            return None
+        np.copyto(self._init_joint_angles, self._joint_angles)
+        self._state = eval_manipulator_state(self.model, tension_inputs, self.solver_type,
+                                             init_joint_angles=self._init_joint_angles if self._is_warm else None,
+                                             bracket_half_width=self.bracket_half_width,
+                                             previous_state=self._state,
+                                             **self.search_kwargs)
+        self._is_warm = self._state is not None
+        if self._is_warm:
+            np.copyto(self._tensions, self._state.tensions)
+            for i, s in enumerate(self._state.disk_states):
+                self._joint_angles[i] = s.bottom_joint_angle
+                self._contact_reactions[i] = s.bottom_contact_reactionDF.flat_total
+        return self._state
+
+    def solve_joint_angles(self, tensions):
+        """
+            Lean counterpart of solve for real-time loops, without constructing the states (see eval_joint_angles)
+            tensions: (n_tendons,) tensions indexed by tendon
+            return ((n_disks-1,) bottom joint angles, (n_disks-1, 6) [force, total moment] of bottom contact reactions in disk frame) 
+                   as buffers of the session, which are overwritten by the next call, or None if no solution is found
+        """
+        plan = self._ensure_buffers()
+        if plan is None:
+            return None
+        tensions = np.asarray(tensions, dtype=float)
+        if tensions.shape != (plan.n_tendons,):
+            raise ValueError(f"Expect {plan.n_tendons} tensions, but got {tensions.shape}")
+        self._state = None
+        is_warm = self._is_warm
+        self._is_warm = False
+        np.copyto(self._init_joint_angles, self._joint_angles)
+        init_joint_angles = self._init_joint_angles if is_warm else None
+        bracket_half_width = self.bracket_half_width if is_warm else None
+
+        if plan.has_friction or self._is_fixed_point:
+            is_solved = _solve_statics_fixed_point(plan, tensions, self.solver_type, self._joint_angles, self._contact_reactions, self._solver_stats,
+                                                   init_joint_angles, bracket_half_width, **self.search_kwargs) is not None
+        else:
+            start_disk_index = plan.n_disks-1
+            self._top_vec.fill(0.0)
+            if is_warm:
+                # As eval_manipulator_state with previous_state
+                changed_tendon_indices = np.flatnonzero(tensions != self._tensions)
+                start_disk_index = plan.tendon_n_joints[changed_tendon_indices[-1]] if len(changed_tendon_indices) else 0
+                if start_disk_index < plan.n_disks-1:
+                    eval_proximal_disk_top_components(plan, start_disk_index+1, tensions, self._joint_angles[start_disk_index], 
+                                                      self._contact_reactions[start_disk_index], out=self._top_vec)
+            is_solved = _solve_statics(plan, tensions, self.solver_type, self._joint_angles, self._contact_reactions, self._solver_stats, 
+                                       start_disk_index, self._top_vec, init_joint_angles, bracket_half_width, **self._statics_kwargs)
+        if not is_solved:
+            return None
+        np.copyto(self._tensions, tensions)
+        self._is_warm = True
+        return self._joint_angles, self._contact_reactions
@@ -3,12 +3,21 @@ from math import cos, sin, asin, atan, atan2, sqrt, isnan
 from .models import *
 from .calculation import *
 from .vec import *
-from itertools import zip_longest
+from .plan import _get_side_frame_indices
+from .tendon import eval_span_lengths
+from .load import ExternalLoad, eval_disk_loads
+from . import jit
 
 class SolverType:
     DIRECT="direct"
     BINARY="binary"
     NEWTON="Newton"
+    BRENT="Brent"
+    ILLINOIS="Illinois"
+    
+class SolverBackend:
+    NUMPY="NumPy"
+    NUMBA="Numba" # Falls back to NumPy if Numba is not installed
     
 class TendonModelState():
     def __init__(self, tendon_model: TendonMathModel, tension_in_disk: float, is_knob: bool):
@@ -25,17 +34,36 @@ class TendonModelState():
 class DiskModelState():
     def __init__(self,
                  disk: DiskMathModel,
-                 tendon_states: List[TendonModelState],
+                 tendons: List[TendonMathModel],
+                 tensions: np.ndarray,
+                 tendon_start: int,
+                 knob_end: int,
                  bottom_contact_reactionDF: np.array,
-                 bottom_joint_angle: float):
+                 bottom_joint_angle: float,
+                 solver_stats=None):
         self.disk = disk
-        self.tendon_states:List[TendonModelState] = tendon_states
+        self.tendons:List[TendonMathModel] = tendons # Tendons of the manipulator, sorted as in SolvePlan
+        self.tensions = tensions # Tensions of the tendon spans below the disk indexed by tendon, shared by the disk states of a frictionless manipulator
+        self.tendon_start = tendon_start # Tendons [tendon_start:] pass through the disk
+        self.knob_end = knob_end # Tendons [tendon_start:knob_end] are knobbed at the disk
         self.bottom_contact_reactionDF = bottom_contact_reactionDF
         self.bottom_joint_angle = bottom_joint_angle
+        self.solver_stats = solver_stats # None for the direct solver
+        
+    @property
+    def tensions_in_disk(self):
+        """
+            Tensions of the tendons through the disk, as a view of tensions
+        """
+        return self.tensions[self.tendon_start:]
+        
+    @property
+    def tendon_states(self):
+        return [TendonModelState(self.tendons[k], self.tensions[k], k < self.knob_end) for k in range(self.tendon_start, len(self.tensions))]
         
     @property
     def marked_unknobbed_tendon_states(self):
-        return [TendonModelState(t.model, t.tension_in_disk, False) for t in self.tendon_states]
+        return [TendonModelState(self.tendons[k], self.tensions[k], False) for k in range(self.tendon_start, len(self.tensions))]
         
         
     def eval_proximal_disk_top_components(self, proximal_disk:DiskMathModel):
@@ -47,143 +75,442 @@ class DiskModelState():
         
         
         # tendon
-        for t in self.tendon_states:
-            c += ForceMomentVec(force=evalTopGuideForce(t.tension_in_disk, self.bottom_joint_angle, top_orientationDF),
+        for tendon, tension in zip(self.tendons[self.tendon_start:], self.tensions_in_disk):
+            c += ForceMomentVec(force=evalTopGuideForce(tension, self.bottom_joint_angle, top_orientationDF),
                                 disp=evalTopGuideEndDisp(
-                                    proximal_disk.length, self.disk.bottom_curve_radius, t.model.dist_from_axis, 
-                                    t.model.orientationBF - proximal_disk.bottom_orientationBF, top_orientationDF
+                                    proximal_disk.length, self.disk.bottom_curve_radius, tendon.dist_from_axis, 
+                                    tendon.orientationBF - proximal_disk.bottom_orientationBF, top_orientationDF
                                 )).flat_total
         return c
     
 class ManipulatorState:
     def __init__(self, manipulator_model:ManipulatorMathModel, 
                  tension_inputs:List, 
-                 disk_states:List[DiskModelState]):
+                 disk_states:List[DiskModelState],
+                 tensions:np.ndarray=None,
+                 solve_plan:SolvePlan=None,
+                 backend:SolverBackend=SolverBackend.NUMPY,
+                 fixed_point_stats=None,
+                 external_load:ExternalLoad=None):
         super().__init__()
         self.model = manipulator_model
         self.tension_inputs = tension_inputs
         self.disk_states:List[DiskModelState] = disk_states
+        self.tensions = tensions # Tensions indexed by tendon
+        self.solve_plan = solve_plan # Plan of the model at the time of solving
+        self.fixed_point_stats = fixed_point_stats # Fixed point iteration of the span tensions and external load, None without either
+        self.external_load = external_load
         
         self.TFs_DF = []
-        self._generate_TFs()
+        self._TFs = None
+        self._generate_TFs(backend)
         
-    def _generate_TFs(self):
-        tf = np.identity(4)
-        self.TFs_DF.append(tf)
+    @property
+    def solver_stats(self):
+        """
+            Root search statistics of each disk, None for the direct solver
+        """
+        return [s.solver_stats for s in self.disk_states]
+    
+    @property
+    def bottom_joint_angles(self):
+        """
+            (n_disks-1,) bottom joint angles, entry i-1 belongs to disk i, as CompactManipulatorState.bottom_joint_angles
+        """
+        return np.array([s.bottom_joint_angle for s in self.disk_states], dtype=float)
+        
+    def _generate_TFs(self, backend=SolverBackend.NUMPY):
+        plan = self.solve_plan if self.solve_plan is not None else self.model.compile()
         
         # len(self.model.disks) = len(self.disk_states) + 1
-        for d, s in zip_longest(self.model.disks, self.disk_states, fillvalue=None):
-            if s is None:
-                break
-            tf = np.matmul(tf, np.matmul(m4MatrixTranslation((0.0,0, d.length)),
-                          m4MatrixRotation((0,0,1.0), d.top_orientationBF - d.bottom_orientationBF)))
-            tf = np.matmul(tf, evalTFProximalTopToDistalBottom(s.bottom_joint_angle, d.top_curve_radius))
-            
-            self.TFs_DF.append(tf)
-       
+        self.TFs_DF = list(eval_TFs_DF(plan, self.bottom_joint_angles, backend))
+        
+    @property
+    def TFs(self):
+        """
+            (n_disks, side, frame, 4, 4) transformations of get_TF, with side and frame indexed as TF_SIDES and TF_FRAME_SYSS
+        """
+        if self._TFs is None:
+            plan = self.solve_plan if self.solve_plan is not None else self.model.compile()
+            self._TFs = np.matmul(np.array(self.TFs_DF)[:, np.newaxis, np.newaxis], plan.side_frame_TFsDF)
+        return self._TFs
         
     def get_TF(self, disk_index, side, frame_sys):
         """
-            Get the transformation matrix from the top of the base frame
+            Get the transformation matrix from the top of the base frame, as a view of TFs
             side = "b": bottom, "c": center, "t": top
             frame_sys = "bd": base-disk-orientation, "bc": bottom-curvature-orientation, "tc": top-curvature-orientation
         """
-        length = self.model.disks[disk_index].length
-        tf = self.TFs_DF[disk_index]
-        
-        if side == "b":
-            pass
-        elif side == "c":
-            tf = np.matmul(tf, m4MatrixTranslation((0,0, length/2 ))) 
-        elif side == "t":
-            tf = np.matmul(tf, m4MatrixTranslation((0,0, length ))) 
-        else:
-            raise AttributeError(f"'side' must not be {side}, but either 'b', 'c' or 't'") 
-        
-        if frame_sys == "bc":
-            pass
-        elif frame_sys == "bd":
-            orientation_change = -self.model.disks[disk_index].bottom_orientationBF
-            return np.matmul(tf,m4MatrixRotation((0,0,1.0), orientation_change))
-        elif frame_sys == "tc":
-            orientation_change = (self.model.disks[disk_index].top_orientationBF 
-                                  - self.model.disks[disk_index].bottom_orientationBF)
-            return np.matmul(tf, m4MatrixRotation((0,0,1.0), orientation_change))
-        else:
-            raise AttributeError(f"'frame' must not be {frame_sys}, but either 'bd', 'bc' or 'tc'") 
-        return tf
-           
+        return self.TFs[(disk_index,) + _get_side_frame_indices(side, frame_sys)]
 
 
-def eval_bottom_tendon_components(disk:DiskMathModel, tendonStates, bottom_joint_angle):
-        c = np.zeros(6)
-        for t in tendonStates:
-            c += ForceMomentVec(force=evalBottomGuideForce(t.tension_in_disk, bottom_joint_angle), 
-                                disp=evalBottomGuideEndDisp(disk.length, disk.bottom_curve_radius, t.model.dist_from_axis, t.model.orientationBF - disk.bottom_orientationBF)).flat_total
-        return c
 
-def solve_numerically(disk:DiskMathModel, knob_tendon_states:List[TendonModelState], distal_disk_state:DiskModelState, solver_type:SolverType):
-    top_vec = distal_disk_state.eval_proximal_disk_top_components(disk) if distal_disk_state else np.zeros(6) 
+def eval_bottom_guide_weights(plan:SolvePlan, disk_index, tensions):
+    """
+        Sum of tensions and sums of tension-weighted displacements of the bottom guide ends of a disk, 
+        as Python floats [sum, x, y, z]
+    """
+    start = plan.tendon_starts[disk_index]
+    active_tensions = tensions[start:]
+    return [float(np.sum(active_tensions))] + np.dot(active_tensions, plan.bottom_guide_disps[disk_index, start:]).tolist()
+
+def eval_bottom_tendon_components(plan:SolvePlan, disk_index, tensions, bottom_joint_angle, out=None):
+    """
+        Sum of force and total moment components at the bottom ends of the tendon guides of a disk, in disk frame
+        out: 6-vector to write into
+    """
+    return _eval_bottom_tendon_components(eval_bottom_guide_weights(plan, disk_index, tensions), bottom_joint_angle, out)
+
+def _eval_bottom_tendon_components(weights, bottom_joint_angle, out=None):
+    # All bottom guide forces share the direction (0, -sin, -cos) of half joint angle
+    sum_tensions, sum_x, sum_y, sum_z = weights
+    s = sin(bottom_joint_angle/2)
+    c = cos(bottom_joint_angle/2)
+    out = np.empty(6) if out is None else out
+    out[0] = 0.0
+    out[1] = -sum_tensions*s
+    out[2] = -sum_tensions*c
+    out[3] = -sum_y*c + sum_z*s
+    out[4] = sum_x*c
+    out[5] = -sum_x*s
+    return out
+
+def _eval_bottom_contact_reaction(weights, top_vec, bottom_joint_angle, out=None):
+    """
+        [force, total moment] of bottom contact reaction balancing the top components and the bottom tendon components
+    """
+    out = _eval_bottom_tendon_components(weights, bottom_joint_angle, out)
+    out += top_vec
+    np.negative(out, out=out)
+    return out
+
+def _eval_equilibrium_coefficients(plan:SolvePlan, disk_index, weights, top_vec):
+    """
+        Coefficients of the x component of the bottom contact pure moment, which vanishes at equilibrium:
+        pure_moment_x = -(P*sin(bottom_joint_angle/2) + Q*cos(bottom_joint_angle/2) + R)
+    """
+    length = plan.lengths[disk_index]
+    bottom_curve_radius = plan.bottom_curve_radii[disk_index]
+    sum_tensions, _, sum_y, sum_z = weights
+    P = bottom_curve_radius*top_vec[2] + (length/2-bottom_curve_radius)*sum_tensions + sum_z
+    Q = -bottom_curve_radius*top_vec[1] - sum_y
+    R = top_vec[1]*(bottom_curve_radius - length/2) + top_vec[3]
+    return float(P), float(Q), float(R)
+
+def eval_proximal_disk_top_components(plan:SolvePlan, disk_index, tensions, bottom_joint_angle, bottom_contact_reactionDF, out=None,
+                                      proximal_disk_loadDF=None):
+    """
+        Sum of force and total moment components exerted by a disk on the top of its proximal disk, in proximal disk frame
+        bottom_contact_reactionDF: [force, total moment] of the bottom contact reaction of the disk
+        out: 6-vector to write into, which may be bottom_contact_reactionDF itself
+        proximal_disk_loadDF: [force, total moment] of the external load on the proximal disk in proximal disk frame (see eval_disk_loads), 
+                              added to the components
+    """
+    proximal_index = disk_index - 1
+    top_orientationDF = plan.top_orientationsDF[proximal_index]
+    start = plan.tendon_starts[disk_index]
+    active_tensions = tensions[start:]
+    sum_tensions = float(np.sum(active_tensions))
+    sum_x, sum_y, sum_z = np.dot(active_tensions, plan.top_guide_disps[proximal_index, start:]).tolist()
+    fx, fy, fz, mx, my, mz = bottom_contact_reactionDF.tolist()
+    
+    # contact: -Rz(top orientation)*Rx(joint angle)*v, for force and total moment
+    c = cos(bottom_joint_angle)
+    s = sin(bottom_joint_angle)
+    cz = cos(top_orientationDF)
+    sz = sin(top_orientationDF)
+    fy, fz = c*fy - s*fz, s*fy + c*fz
+    my, mz = c*my - s*mz, s*my + c*mz
     
-    tension_states = [t for t in knob_tendon_states]
-    if distal_disk_state:
-        tension_states += distal_disk_state.marked_unknobbed_tendon_states
+    # tendon: all top guide forces share the direction u = evalTopGuideForce(1, joint angle, top orientation)
+    half_s = sin(bottom_joint_angle/2)
+    ux = half_s*sz
+    uy = -half_s*cz
+    uz = cos(bottom_joint_angle/2)
+    
+    out = np.empty(6) if out is None else out
+    out[0] = -(cz*fx - sz*fy) + sum_tensions*ux
+    out[1] = -(sz*fx + cz*fy) + sum_tensions*uy
+    out[2] = -fz + sum_tensions*uz
+    out[3] = -(cz*mx - sz*my) + sum_y*uz - sum_z*uy
+    out[4] = -(sz*mx + cz*my) + sum_z*ux - sum_x*uz
+    out[5] = -mz + sum_x*uy - sum_y*ux
+    if proximal_disk_loadDF is not None:
+        out += proximal_disk_loadDF
+    return out
+
+def solve_numerically(plan:SolvePlan, disk_index, tensions, top_vec, solver_type:SolverType, 
+                      init=0, bracket_half_width=None, out=None, **search_kwargs):
+    """
+        tensions: tensions indexed by tendon
+        top_vec: sum of force and total moment components exerted by the distal disk, in disk frame
+        init: initial guess of the bottom joint angle
+        bracket_half_width: if given, search within init +- bracket_half_width first, then within the full range if the root lies outside
+        out: 6-vector to write the bottom contact reaction into
+        search_kwargs: threshold, x_threshold and max_iterations of the root search
+        return (bottom joint angle, [force, total moment] of bottom contact reaction, SolverStats), or None if no solution is found
+    """
+    weights = eval_bottom_guide_weights(plan, disk_index, tensions)
+    P, Q, R = _eval_equilibrium_coefficients(plan, disk_index, weights, top_vec)
     
+    # The bottom contact pure moment about x in closed form, see _eval_equilibrium_coefficients
+    # The contact reaction is evaluated once at the root
     def _equilibrium(bottom_joint_angle):
-        sum_comp = top_vec + eval_bottom_tendon_components(disk, tension_states, bottom_joint_angle)
-        bottom_contact_comp = ForceMomentVec.from_force_disp_total_moment(force=-sum_comp[:3], 
-                                                                            disp=evalBottomContactDisp(disk.length, disk.bottom_curve_radius, bottom_joint_angle),
-                                                                            total_moment=- sum_comp[3:])
-        return bottom_contact_comp.pure_moment[0], bottom_contact_comp
-    
-    if solver_type == SolverType.BINARY:
-        bottom_joint_angle, bottom_contact_vec = equation_binary_search(_equilibrium, lower=-pi/2, upper=pi/2, init=distal_disk_state.bottom_joint_angle if distal_disk_state else 0)
-    else:
+        return -(P*sin(bottom_joint_angle/2) + Q*cos(bottom_joint_angle/2) + R), None
+    
+    def _equilibrium_with_derivative(bottom_joint_angle):
+        s = sin(bottom_joint_angle/2)
+        c = cos(bottom_joint_angle/2)
+        return -(P*s + Q*c + R), -(P*c - Q*s)/2, None
+    
+    def _search(lower, upper):
+        if solver_type == SolverType.NEWTON:
+            return equation_newton_search(_equilibrium_with_derivative, lower=lower, upper=upper, init=init, **search_kwargs)
+        elif solver_type in ROOT_SEARCHES:
+            return ROOT_SEARCHES[solver_type](_equilibrium, lower=lower, upper=upper, init=init, **search_kwargs)
         raise NotImplementedError("Other solver has not been implemented")
     
-    if bottom_joint_angle is None:
+    if bracket_half_width is None:
+        res = _search(-pi/2, pi/2)
+    else:
+        res = _search(max(-pi/2, init - bracket_half_width), min(pi/2, init + bracket_half_width))
+        if res is None:
+            res = _search(-pi/2, pi/2)
+            if res is not None:
+                res[2].n_evaluations += 2 # Bracket ends of the failed search
+    if res is None:
         return None
-    return DiskModelState(disk, tension_states, bottom_contact_vec, bottom_joint_angle)
+    bottom_joint_angle, _, stats = res
+    return bottom_joint_angle, _eval_bottom_contact_reaction(weights, top_vec, bottom_joint_angle, out), stats
+
 
-def equation_binary_search(func, lower, upper, init=None, threshold=0.0000000001):
-    if func(lower)[0] * func(upper)[0] > 0:
+class SolverStats:
+    """
+        Cost of the root search of a disk
+    """
+    def __init__(self, n_iterations=0, n_evaluations=0, converged=True):
+        self.n_iterations = n_iterations
+        self.n_evaluations = n_evaluations
+        self.converged = converged
+        
+    def __repr__(self):
+        return f"iterations: {self.n_iterations}, evaluations: {self.n_evaluations}, converged: {self.converged}"
+
+
+def equation_binary_search(func, lower, upper, init=None, threshold=0.0000000001, x_threshold=0.000000000001, max_iterations=100):
+    """
+        Bisection search
+        func(x) returns (y, res)
+        return (x, res, SolverStats), or None if func does not change sign within [lower, upper]
+    """
+    stats = SolverStats(n_evaluations=2)
+    y_lower, res_lower = func(lower)
+    y_upper, res_upper = func(upper)
+    if y_lower * y_upper > 0:
         return None
+    if abs(y_lower) <= threshold:
+        return lower, res_lower, stats
+    if abs(y_upper) <= threshold:
+        return upper, res_upper, stats
+    if y_lower > 0:
+        # Ensure func(lower) < 0 < func(upper)
+        lower, upper = upper, lower
+    
     x = (lower+upper)/2 if init is None else init
     y,res = func(x)
-    while abs(y) > threshold:
+    stats.n_evaluations += 1
+    while abs(y) > threshold and abs(upper - lower) > x_threshold:
+        if stats.n_iterations >= max_iterations:
+            stats.converged = False
+            break
         if y < 0:
             lower = x
         else:
             upper = x
         x = (lower + upper)/2 
         y,res = func(x)
-    return x, res
+        stats.n_iterations += 1
+        stats.n_evaluations += 1
+    return x, res, stats
 
-def solve_direct(disk:DiskMathModel, knob_tendon_states:List[TendonModelState], distal_disk_state:DiskModelState):
-    tendon_states = [t for t in knob_tendon_states]
-    if distal_disk_state:
-        tendon_states += distal_disk_state.marked_unknobbed_tendon_states
+def equation_newton_search(func, lower, upper, init=None, threshold=0.0000000001, x_threshold=0.000000000001, max_iterations=100):
+    """
+        Newton-Raphson search, falling back to bisection whenever a step leaves the bracket
+        func(x) returns (y, dy/dx, res)
+        return (x, res, SolverStats), or None if func does not change sign within [lower, upper]
+    """
+    stats = SolverStats(n_evaluations=2)
+    y_lower, _, res_lower = func(lower)
+    y_upper, _, res_upper = func(upper)
+    if y_lower * y_upper > 0:
+        return None
+    if abs(y_lower) <= threshold:
+        return lower, res_lower, stats
+    if abs(y_upper) <= threshold:
+        return upper, res_upper, stats
+    if y_lower > 0:
+        # Ensure func(lower) < 0 < func(upper)
+        lower, upper = upper, lower
         
-    sum_tensions = 0
-    sum_bottom_guide_x_moment_sin = 0
-    sum_bottom_guide_x_moment_cos = 0
-    bottom_guide_disps = []
-    for ts in tendon_states:
-        bottom_guide_disps.append(evalBottomGuideEndDisp(disk.length, disk.bottom_curve_radius, ts.model.dist_from_axis, ts.model.orientationBF - disk.bottom_orientationBF))
-        sum_tensions += ts.tension_in_disk
-        sum_bottom_guide_x_moment_sin += bottom_guide_disps[-1][2]*ts.tension_in_disk
-        sum_bottom_guide_x_moment_cos += bottom_guide_disps[-1][1]*ts.tension_in_disk
+    x = (lower+upper)/2 if init is None else init
+    y,dy,res = func(x)
+    stats.n_evaluations += 1
+    while abs(y) > threshold and abs(upper - lower) > x_threshold:
+        if stats.n_iterations >= max_iterations:
+            stats.converged = False
+            break
+        if y < 0:
+            lower = x
+        else:
+            upper = x
+        x_next = x - y/dy if dy != 0 else None
+        if x_next is None or not min(lower, upper) < x_next < max(lower, upper):
+            x_next = (lower + upper)/2
+        x = x_next
+        y,dy,res = func(x)
+        stats.n_iterations += 1
+        stats.n_evaluations += 1
+    return x, res, stats
+
+def equation_illinois_search(func, lower, upper, init=None, threshold=0.0000000001, x_threshold=0.000000000001, max_iterations=100):
+    """
+        Regula falsi search with the Illinois modification
+        func(x) returns (y, res)
+        return (x, res, SolverStats), or None if func does not change sign within [lower, upper]
+    """
+    stats = SolverStats(n_evaluations=2)
+    a, b = lower, upper
+    y_a, res_a = func(a)
+    y_b, res_b = func(b)
+    if y_a * y_b > 0:
+        return None
+    
+    if init is not None and min(a, b) < init < max(a, b):
+        y, res = func(init)
+        stats.n_evaluations += 1
+        if y * y_b > 0:
+            b, y_b, res_b = init, y, res
+        else:
+            a, y_a, res_a = init, y, res
+    
+    side = 0
+    x, y, res = (a, y_a, res_a) if abs(y_a) < abs(y_b) else (b, y_b, res_b)
+    while abs(y) > threshold and abs(b - a) > x_threshold:
+        if stats.n_iterations >= max_iterations:
+            stats.converged = False
+            break
+        x = (a*y_b - b*y_a)/(y_b - y_a)
+        y, res = func(x)
+        stats.n_iterations += 1
+        stats.n_evaluations += 1
+        if y * y_b > 0:
+            b, y_b = x, y
+            if side == -1:
+                y_a /= 2
+            side = -1
+        else:
+            a, y_a = x, y
+            if side == 1:
+                y_b /= 2
+            side = 1
+    return x, res, stats
+
+def equation_brent_search(func, lower, upper, init=None, threshold=0.0000000001, x_threshold=0.000000000001, max_iterations=100):
+    """
+        Brent's method, combining inverse quadratic interpolation, secant and bisection steps
+        func(x) returns (y, res)
+        return (x, res, SolverStats), or None if func does not change sign within [lower, upper]
+    """
+    stats = SolverStats(n_evaluations=2)
+    a, b = lower, upper
+    y_a, res_a = func(a)
+    y_b, res_b = func(b)
+    if y_a * y_b > 0:
+        return None
+    
+    if init is not None and min(a, b) < init < max(a, b):
+        y, res = func(init)
+        stats.n_evaluations += 1
+        if y * y_b > 0:
+            b, y_b, res_b = init, y, res
+        else:
+            a, y_a, res_a = init, y, res
+            
+    # b: best estimate, a: previous estimate, c: counterpoint of b such that the root lies between b and c
+    c, y_c, res_c = b, y_b, res_b
+    d = e = b - a
+    while True:
+        if y_b * y_c > 0:
+            c, y_c, res_c = a, y_a, res_a
+            d = e = b - a
+        if abs(y_c) < abs(y_b):
+            a, y_a, res_a = b, y_b, res_b
+            b, y_b, res_b = c, y_c, res_c
+            c, y_c, res_c = a, y_a, res_a
+            
+        tol = 2*np.finfo(float).eps*abs(b) + x_threshold/2
+        m = (c - b)/2
+        if abs(y_b) <= threshold or abs(m) <= tol:
+            break
+        if stats.n_iterations >= max_iterations:
+            stats.converged = False
+            break
         
-    top_vec = distal_disk_state.eval_proximal_disk_top_components(disk) if distal_disk_state else np.zeros(6)
+        if abs(e) >= tol and abs(y_a) > abs(y_b):
+            s = y_b/y_a
+            if a == c:
+                # Secant
+                p = 2*m*s
+                q = 1 - s
+            else:
+                # Inverse quadratic interpolation
+                q = y_a/y_c
+                r = y_b/y_c
+                p = s*(2*m*q*(q - r) - (b - a)*(r - 1))
+                q = (q - 1)*(r - 1)*(s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2*p < min(3*m*q - abs(tol*q), abs(e*q)):
+                e, d = d, p/q
+            else:
+                # Interpolation rejected
+                d = e = m
+        else:
+            # Bisection
+            d = e = m
+        a, y_a, res_a = b, y_b, res_b
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        y_b, res_b = func(b)
+        stats.n_iterations += 1
+        stats.n_evaluations += 1
+    return b, res_b, stats
+
+ROOT_SEARCHES = {
+    SolverType.BINARY: equation_binary_search,
+    SolverType.BRENT: equation_brent_search,
+    SolverType.ILLINOIS: equation_illinois_search,
+}
+
+def solve_direct(plan:SolvePlan, disk_index, tensions, top_vec, out=None):
+    """
+        tensions: tensions indexed by tendon
+        top_vec: sum of force and total moment components exerted by the distal disk, in disk frame
+        out: 6-vector to write the bottom contact reaction into
+        return (bottom joint angle, [force, total moment] of bottom contact reaction), 
+               or None if no joint angle balances the disk, e.g. under an external load the tensions cannot balance
+    """
+    weights = eval_bottom_guide_weights(plan, disk_index, tensions)
     
     # Refers to the note
-    P = disk.bottom_curve_radius*top_vec[2] + (disk.length/2-disk.bottom_curve_radius)*sum_tensions + sum_bottom_guide_x_moment_sin
-    Q = -disk.bottom_curve_radius*top_vec[1] - sum_bottom_guide_x_moment_cos
-    R = top_vec[1]*(disk.bottom_curve_radius - disk.length/2) + top_vec[3]
+    P, Q, R = _eval_equilibrium_coefficients(plan, disk_index, weights, top_vec)
     
     # Avoid singularity (division by 0) right away
     if P == 0.0:
         half_joint_angle = 0
+    elif abs(R) > sqrt(P**2 + Q**2):
+        # P*sin(theta) + Q*cos(theta) is bounded by sqrt(P**2+Q**2), so no root exists
+        return None
     else:
         # P*sin(theta) + Q*cos(theta) = +-sqrt(P**2+Q**2)*sin(theta+atan(Q/P))
         # There are 2 possible formulae, mathematically speaking, but only 1 of them complies with the constraint
@@ -205,38 +532,382 @@ def solve_direct(disk:DiskMathModel, knob_tendon_states:List[TendonModelState],
     bottom_joint_angle = 2*half_joint_angle
     
     # Store the state related data for next proximal disk bottom joint angle evaluation
-    # Force displacement has been evaluated
-    bottom_guide_vecDF = 0
-    for ts,d in zip(tendon_states, bottom_guide_disps):
-        bottom_guide_vecDF += ForceMomentVec(force=evalBottomGuideForce(ts.tension_in_disk, bottom_joint_angle), disp=d).flat_total
-    # bottom_guide_vecDF = eval_bottom_tendon_components(disk, tendon_states, bottom_joint_angle)
+    return bottom_joint_angle, _eval_bottom_contact_reaction(weights, top_vec, bottom_joint_angle, out)
+
+
+def eval_TFs_DF(plan:SolvePlan, joint_angles, backend:SolverBackend=SolverBackend.NUMPY):
+    """
+        joint_angles: bottom joint angles of disks 1 to len(joint_angles)
+        return (len(joint_angles)+1, 4, 4) transformations from the top of the base frame to the bottom of each disk, 
+               in bottom-curvature-orientation
+    """
+    joint_angles = np.asarray(joint_angles, dtype=float)
+    n = len(joint_angles)
+    if backend == SolverBackend.NUMBA and jit.HAS_NUMBA:
+        return jit.eval_TFs_DF(plan.top_TFsDF, plan.top_curve_radii, joint_angles, np.empty((n+1, 4, 4)))
     
-    bottom_contact_reactionDF = -top_vec - bottom_guide_vecDF
-    bottom_contact_reactionDF = ForceMomentVec.from_force_disp_total_moment(bottom_contact_reactionDF[:3], 
-                                                                            evalBottomContactDisp(disk.length, disk.bottom_curve_radius, bottom_joint_angle),
-                                                                            bottom_contact_reactionDF[3:])
+    TFs_DF = np.empty((n+1, 4, 4))
+    TFs_DF[0] = np.identity(4)
+    tfs = np.matmul(plan.top_TFsDF[:n], evalTFProximalTopToDistalBottomArray(joint_angles, plan.top_curve_radii[:n]))
+    for i, t in enumerate(tfs):
+        np.matmul(TFs_DF[i], t, out=TFs_DF[i+1])
+    return TFs_DF
+
+
+def _rotate_columns(rotations, a, b, angles):
+    """
+        Right-multiply rotations (..., 3, 3) in place by the rotation of angles about the axis normal to columns a and b
+    """
+    c = np.cos(angles)[..., np.newaxis]
+    s = np.sin(angles)[..., np.newaxis]
+    col_a = rotations[..., a].copy()
+    rotations[..., a] = c*col_a + s*rotations[..., b]
+    rotations[..., b] = c*rotations[..., b] - s*col_a
+
+
+def _accumulate_tip_TF(lengths, top_orientationsDF, top_curve_radii, tip_orientationDF, joint_angles):
+    """
+        Accumulation of eval_tip_TF over Python floats of one pose, as jit.eval_tip_TF
+        return (3, 3) rotation and (3,) translation as lists
+    """
+    rot = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    trans = [0.0, 0.0, 0.0]
+    n = len(joint_angles)
+    for i in range(n+1):
+        # Along the disk, then about its top orientation (top_TFsDF), or the tip orientation of the end disk
+        for p, row in enumerate(rot):
+            trans[p] += lengths[i]*row[2]
+        angle = top_orientationsDF[i] if i < n else tip_orientationDF
+        c, s = cos(angle), sin(angle)
+        for row in rot:
+            row[0], row[1] = c*row[0] + s*row[1], c*row[1] - s*row[0]
+        if i == n:
+            break
         
-    return DiskModelState(disk, tendon_states, bottom_contact_reactionDF, bottom_joint_angle)
+        # Rolling across the joint (evalTFProximalTopToDistalBottom)
+        angle = joint_angles[i]
+        disp = 2*top_curve_radii[i]*(1 - cos(angle/2))
+        disp_c, disp_s = disp*cos(angle/2), disp*sin(angle/2)
+        c, s = cos(angle), sin(angle)
+        for p, row in enumerate(rot):
+            trans[p] += disp_c*row[2] - disp_s*row[1]
+            row[1], row[2] = c*row[1] + s*row[2], c*row[2] - s*row[1]
+    return rot, trans
 
 
-def eval_manipulator_state(manipulator_model:ManipulatorMathModel, tension_inputs:List, solver_type:SolverType):            
-    states = []
-    distal_disk_state = None
+def eval_tip_TF(plan:SolvePlan, joint_angles, backend:SolverBackend=SolverBackend.NUMPY):
+    """
+        Transformation of the top of end disk in base-disk-orientation (ManipulatorState.get_TF(-1, "t", "bd")), following eval_TFs_DF
+        as a rotation and translation accumulated in place, without keeping the transformations of other disks
+        joint_angles: (..., n_disks-1) bottom joint angles
+        return (..., 4, 4) transformations
+    """
+    joint_angles = np.asarray(joint_angles, dtype=float)
+    n = plan.n_disks-1
+    if joint_angles.ndim == 1:
+        if backend == SolverBackend.NUMBA and jit.HAS_NUMBA:
+            return jit.eval_tip_TF(plan.lengths, plan.top_orientationsDF, plan.top_curve_radii, -plan.bottom_orientationsBF[-1], 
+                                   joint_angles, np.empty((4, 4)))
+        rot, trans = _accumulate_tip_TF(plan.lengths.tolist(), plan.top_orientationsDF.tolist(), plan.top_curve_radii.tolist(), 
+                                        -float(plan.bottom_orientationsBF[-1]), joint_angles.tolist())
+        tip_TF = np.identity(4)
+        tip_TF[:3, :3] = rot
+        tip_TF[:3, 3] = trans
+        return tip_TF
     
-    for disk, knob_tension_models in manipulator_model.disk_knobbed_tendons_reversed_iterator:
-        knob_tendon_states = [] 
-        if knob_tension_models:
-            knob_tendon_states = [TendonModelState(t, tension_inputs[-1][i], True) for i, t in enumerate(knob_tension_models)] 
-            tension_inputs = tension_inputs[:-1]
-            
+    batch_shape = joint_angles.shape[:-1]
+    rotations = np.tile(np.identity(3), batch_shape + (1, 1))
+    translations = np.zeros(batch_shape + (3,))
+    for i in range(n):
+        translations += plan.lengths[i]*rotations[..., 2]
+        _rotate_columns(rotations, 0, 1, plan.top_orientationsDF[i])
+        half_joint_angles = joint_angles[..., i, np.newaxis]/2
+        disps = 2*plan.top_curve_radii[i]*(1 - np.cos(half_joint_angles))
+        translations += disps*(np.cos(half_joint_angles)*rotations[..., 2] - np.sin(half_joint_angles)*rotations[..., 1])
+        _rotate_columns(rotations, 1, 2, joint_angles[..., i])
+    translations += plan.lengths[n]*rotations[..., 2]
+    _rotate_columns(rotations, 0, 1, -plan.bottom_orientationsBF[n])
+    
+    tip_TFs = np.zeros(batch_shape + (4, 4))
+    tip_TFs[..., :3, :3] = rotations
+    tip_TFs[..., :3, 3] = translations
+    tip_TFs[..., 3, 3] = 1.0
+    return tip_TFs
+
+
+_SOLVER_CODES = {
+    SolverType.DIRECT: jit.SOLVER_CODE_DIRECT,
+    SolverType.BINARY: jit.SOLVER_CODE_BINARY,
+    SolverType.NEWTON: jit.SOLVER_CODE_NEWTON,
+    SolverType.BRENT: jit.SOLVER_CODE_BRENT,
+    SolverType.ILLINOIS: jit.SOLVER_CODE_ILLINOIS,
+}
+
+
+def _eval_search_params(threshold=0.0000000001, x_threshold=0.000000000001, max_iterations=100):
+    return threshold, x_threshold, max_iterations
+
+
+def _solve_statics(plan:SolvePlan, tensions, solver_type:SolverType, joint_angles, contact_reactions, solver_stats, 
+                   start_disk_index, top_vec, init_joint_angles=None, bracket_half_width=None, 
+                   backend:SolverBackend=SolverBackend.NUMPY, disk_loads=None, **search_kwargs):
+    """
+        Recursion from start_disk_index to disk 1, given the top components top_vec of start_disk_index
+        tensions: (n_tendons,) tensions indexed by tendon, or (n_disks, n_tendons) tensions of the spans below each disk (see eval_span_tensions)
+        disk_loads: (n_disks-1, 6) external loads on disks 1 to n_disks-1 in disk frame (see eval_disk_loads), added to the top components
+        Results are written into joint_angles, contact_reactions and solver_stats (list, or None to discard) in place
+        return False if no solution is found
+    """
+    if solver_type not in _SOLVER_CODES:
+        raise NotImplementedError("Other solver has not been implemented")
+        
+    tensions = np.asarray(tensions, dtype=float)
+    if backend == SolverBackend.NUMBA and jit.HAS_NUMBA:
+        if tensions.ndim == 1:
+            tensions = np.broadcast_to(tensions, (plan.n_disks, len(tensions)))
+        stats = np.zeros((plan.n_disks-1, 3), dtype=np.int64)
+        has_init_joint_angles = init_joint_angles is not None
+        if not jit.solve_statics(plan.lengths, plan.bottom_curve_radii, plan.top_orientationsDF, plan.tendon_starts,
+                                 plan.bottom_guide_disps, plan.top_guide_disps, tensions, _SOLVER_CODES[solver_type],
+                                 start_disk_index, np.asarray(top_vec, dtype=float), 
+                                 np.zeros((plan.n_disks-1, 6)) if disk_loads is None else np.asarray(disk_loads, dtype=float), has_init_joint_angles, 
+                                 np.asarray(init_joint_angles if has_init_joint_angles else joint_angles, dtype=float),
+                                 np.nan if bracket_half_width is None else bracket_half_width, 
+                                 *_eval_search_params(**search_kwargs), joint_angles, contact_reactions, stats):
+            return False
+        if solver_stats is not None and solver_type != SolverType.DIRECT:
+            for i in range(start_disk_index):
+                solver_stats[i] = SolverStats(int(stats[i, 0]), int(stats[i, 1]), bool(stats[i, 2]))
+        return True
+    
+    if disk_loads is not None and start_disk_index > 0:
+        top_vec += disk_loads[start_disk_index-1]
+    for i in range(start_disk_index, 0, -1):
+        disk_tensions = tensions if tensions.ndim == 1 else tensions[i]
+        # Results are written into contact_reactions and top_vec in place
         if solver_type == SolverType.DIRECT:
-            distal_disk_state = solve_direct(disk, knob_tendon_states, distal_disk_state)
-        elif solver_type == SolverType.BINARY or solver_type == SolverType.NEWTON:
-            distal_disk_state = solve_numerically(disk, knob_tendon_states, distal_disk_state, solver_type)
+            res = solve_direct(plan, i, disk_tensions, top_vec, out=contact_reactions[i-1])
+            if res is None:
+                return False
+            bottom_joint_angle, bottom_contact_reactionDF = res
+        else:
+            if init_joint_angles is not None:
+                init = init_joint_angles[i-1]
+            else:
+                init = joint_angles[i] if i < plan.n_disks-1 else 0
+            res = solve_numerically(plan, i, disk_tensions, top_vec, solver_type, init=init, 
+                                    bracket_half_width=None if init_joint_angles is None else bracket_half_width,
+                                    out=contact_reactions[i-1], **search_kwargs)
+            if res is None:
+                return False
+            bottom_joint_angle, bottom_contact_reactionDF, stats = res
+            if solver_stats is not None:
+                solver_stats[i-1] = stats
             
-        if not distal_disk_state:
+        joint_angles[i-1] = bottom_joint_angle
+        if i > 1:
+            eval_proximal_disk_top_components(plan, i, disk_tensions, bottom_joint_angle, bottom_contact_reactionDF, out=top_vec,
+                                              proximal_disk_loadDF=None if disk_loads is None else disk_loads[i-2])
+    return True
+
+
+def eval_span_tensions(plan:SolvePlan, tensions, joint_angles, slide_scale=0.01):
+    """
+        Tensions of the tendon spans across the joints under capstan friction of the guides, with tensions pulled at the base
+        The guides of a disk wrap a tendon by half of the joint angle at each end, and friction opposes the sliding of the tendon 
+        as the manipulator bends from straight, i.e. towards the base if its spans distal to the disk shorten in total
+        The direction is smoothed over slides within slide_scale (relative to the largest tendon distance from axis), 
+        where static friction balances the tendon partly
+        return (n_disks, n_tendons) tensions indexed by tendon, row i being the span below disk i (row 0: tensions)
+    """
+    # Span length changes of the tendons across joints 1 to n_disks-1 from straight
+    length_changes = eval_span_lengths(plan, joint_angles) - eval_span_lengths(plan, np.zeros(plan.n_disks-1))
+    
+    # Sliding of each tendon through disks 0 to n_disks-2, positive if paid out (towards the distal end)
+    slides = np.cumsum(length_changes[::-1], axis=0)[::-1]
+    angles = np.abs(joint_angles)
+    wrap_angles = (np.concatenate(([0.0], angles[:-1])) + angles)/2
+    span_tensions = np.empty((plan.n_disks, len(tensions)))
+    span_tensions[0] = tensions
+    span_tensions[1:] = evalCapstanArray(np.asarray(tensions)[np.newaxis, :], 1.0,
+                                         np.cumsum(-np.tanh(slides/(slide_scale*np.max(plan.tendon_dists_from_axis)))*(plan.friction_coefficients[:-1]*wrap_angles)[:, np.newaxis], axis=0))
+    return span_tensions
+
+
+def _solve_statics_fixed_point(plan:SolvePlan, tensions, solver_type:SolverType, joint_angles, contact_reactions, solver_stats,
+                               init_joint_angles=None, bracket_half_width=None, backend:SolverBackend=SolverBackend.NUMPY,
+                               fixed_point_threshold=0.0000000001, max_fixed_point_iterations=100, external_load:ExternalLoad=None, 
+                               anderson_depth=5, mixing=0.7, restart_ratio=4.0, **search_kwargs):
+    """
+        Solve the joint angles together with the span tensions (see eval_span_tensions) and the external loads in disk frame 
+        (see eval_disk_loads) depending on them, as a fixed point iteration from init_joint_angles (straight by default), 
+        accelerated by Anderson mixing of the last anderson_depth iterates since the residual last grew more than restart_ratio times, 
+        and bounded by max_fixed_point_iterations
+        Results are written into joint_angles, contact_reactions and solver_stats in place, as _solve_statics
+        return ((n_disks, n_tendons) span tensions or (n_tendons,) tensions without friction, SolverStats of the fixed point iteration), 
+               or (tensions, None) without friction and external load, or None if no solution is found
+    """
+    if not plan.has_friction and external_load is None:
+        if not _solve_statics(plan, tensions, solver_type, joint_angles, contact_reactions, solver_stats, plan.n_disks-1, np.zeros(6),
+                              init_joint_angles, bracket_half_width, backend, **search_kwargs):
             return None
-        states.insert(0, distal_disk_state)
+        return tensions, None
+    if external_load is not None and external_load.batch_shape:
+        raise ValueError("Batched external loads are solved with eval_manipulator_state_batch")
+    
+    stats = SolverStats(converged=False)
+    x = np.zeros(plan.n_disks-1) if init_joint_angles is None else np.array(init_joint_angles, dtype=float)
+    init = init_joint_angles
+    dxs = []
+    dfs = []
+    x_prev = f_prev = None
+    while True:
+        span_tensions = eval_span_tensions(plan, tensions, x) if plan.has_friction else tensions
+        disk_loads = None if external_load is None else eval_disk_loads(plan, external_load, eval_TFs_DF(plan, x, backend))
+        stats.n_evaluations += 1
+        if not _solve_statics(plan, span_tensions, solver_type, joint_angles, contact_reactions, solver_stats, plan.n_disks-1, np.zeros(6),
+                              init, bracket_half_width if init is not None else None, backend, disk_loads, **search_kwargs):
+            return None
+        f = joint_angles - x
+        if np.max(np.abs(f), initial=0.0) <= fixed_point_threshold:
+            stats.converged = True
+            break
+        if stats.n_iterations >= max_fixed_point_iterations:
+            break
         
-    return ManipulatorState(manipulator_model, tension_inputs, states)
+        if f_prev is not None and np.linalg.norm(f) > restart_ratio*np.linalg.norm(f_prev):
+            # Restart the mixing once the residual jumps, e.g. around configurations unstable under the external load
+            dxs.clear()
+            dfs.clear()
+        elif f_prev is not None:
+            dxs.append(x - x_prev)
+            dfs.append(f - f_prev)
+            if len(dfs) > anderson_depth:
+                dxs.pop(0)
+                dfs.pop(0)
+        x_prev, f_prev = x, f
+        step = mixing*f
+        if dfs:
+            dX = np.stack(dxs, axis=1)
+            dF = np.stack(dfs, axis=1)
+            step -= (dX + mixing*dF) @ np.linalg.lstsq(dF, f, rcond=None)[0]
+        x = np.clip(x + step, -pi/2, pi/2)
+        init = x
+        stats.n_iterations += 1
+    return span_tensions, stats
+
+
+def eval_joint_angles(manipulator_model:ManipulatorMathModel, tensions, solver_type:SolverType=SolverType.DIRECT,
+                      init_joint_angles=None, bracket_half_width=None, backend:SolverBackend=SolverBackend.NUMPY, 
+                      external_load:ExternalLoad=None, **search_kwargs):
+    """
+        Lean counterpart of eval_manipulator_state for real-time loops, without constructing the states
+        tensions: (n_tendons,) tensions indexed by tendon
+        search_kwargs: threshold, x_threshold and max_iterations of the root search of numerical solvers, 
+                       and fixed_point_threshold and max_fixed_point_iterations of models with friction or external load (see eval_manipulator_state)
+        return ((n_disks-1,) bottom joint angles, (n_disks-1, 6) [force, total moment] of bottom contact reactions in disk frame), 
+               or None if no solution is found
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    joint_angles = np.zeros(plan.n_disks-1)
+    contact_reactions = np.zeros((plan.n_disks-1, 6))
+    if _solve_statics_fixed_point(plan, np.asarray(tensions, dtype=float), solver_type, joint_angles, contact_reactions, None, 
+                                  init_joint_angles, bracket_half_width, backend, external_load=external_load, **search_kwargs) is None:
+        return None
+    return joint_angles, contact_reactions
+
+
+def _generate_disk_states(manipulator_model:ManipulatorMathModel, plan:SolvePlan, tensions, joint_angles, contact_reactions, solver_stats, end_disk_index):
+    """
+        Generate the states of disks 1 to end_disk_index
+        tensions: (n_tendons,) tensions indexed by tendon, or (n_disks, n_tendons) tensions of the spans below each disk
+    """
+    disks = manipulator_model.disks
+    tendons = manipulator_model.tendons
+    
+    # ForceMomentVec.from_force_disp_total_moment of all disks at once
+    contact_disps = evalBottomContactDispArray(plan.lengths[1:end_disk_index+1], plan.bottom_curve_radii[1:end_disk_index+1], 
+                                               joint_angles[:end_disk_index])
+    contact_forces = contact_reactions[:end_disk_index, :3]
+    contact_pure_moments = contact_reactions[:end_disk_index, 3:] - np.cross(contact_disps, contact_forces)
+    
+    states = []
+    for i in range(1, end_disk_index+1):
+        bottom_contact_reactionDF = ForceMomentVec(contact_forces[i-1], contact_disps[i-1], contact_pure_moments[i-1])
+        states.append(DiskModelState(disks[i], tendons, tensions if tensions.ndim == 1 else tensions[i], int(plan.tendon_starts[i]), int(plan.knob_ends[i]), 
+                                     bottom_contact_reactionDF, joint_angles[i-1], solver_stats[i-1]))
+    return states
+
+
+def eval_manipulator_state(manipulator_model:ManipulatorMathModel, tension_inputs:List, solver_type:SolverType, 
+                           init_joint_angles=None, bracket_half_width=None, previous_state:ManipulatorState=None, 
+                           backend:SolverBackend=SolverBackend.NUMPY, fixed_point_threshold=0.0000000001, max_fixed_point_iterations=100, 
+                           tip_pose_only=False, external_load:ExternalLoad=None, **search_kwargs):
+    """
+        init_joint_angles: initial guesses of the bottom joint angles of all disks for numerical solvers, e.g. from the previous state.
+                           Defaults to the bottom joint angle of the distal disk
+        bracket_half_width: half width of the search bracket around init_joint_angles for numerical solvers
+        previous_state: state of the same model generation. Disks distal to the knobbed disk of the most distal tendon 
+                        whose tension changed are unaffected, so their states are reused and the recursion restarts from that disk.
+                        Ignored if solved with friction or an external load
+        backend: SolverBackend of the recursion and the transformations
+        fixed_point_threshold, max_fixed_point_iterations: convergence of the joint angles with the span tensions of models with friction
+                                                           and the external load in disk frame. The solution is kept if 
+                                                           max_fixed_point_iterations is reached, see ManipulatorState.fixed_point_stats
+        tip_pose_only: return the (4, 4) transformation of the top of end disk in base-disk-orientation only (see eval_tip_TF), 
+                       without the disk states and the transformations of other disks
+        external_load: ExternalLoad of a single load case, solved with the disk orientations it depends on
+        search_kwargs: threshold, x_threshold and max_iterations of the root search of numerical solvers
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    tensions = plan.flatten_tension_inputs(tension_inputs)
+    
+    # Entry i-1 belongs to disk i
+    joint_angles = np.zeros(plan.n_disks-1)
+    contact_reactions = np.zeros((plan.n_disks-1, 6))
+    solver_stats = [None]*(plan.n_disks-1)
+    
+    if plan.has_friction or external_load is not None:
+        # Span tensions and external loads in disk frame of all disks depend on the proximal joint angles, so no disk state can be reused
+        res = _solve_statics_fixed_point(plan, tensions, solver_type, joint_angles, contact_reactions, solver_stats, init_joint_angles, 
+                                         bracket_half_width, backend, fixed_point_threshold, max_fixed_point_iterations, external_load, 
+                                         **search_kwargs)
+        if res is None:
+            return None
+        span_tensions, fixed_point_stats = res
+        if tip_pose_only:
+            return eval_tip_TF(plan, joint_angles, backend)
+        disk_states = _generate_disk_states(manipulator_model, plan, span_tensions, joint_angles, contact_reactions, solver_stats, plan.n_disks-1)
+        return ManipulatorState(manipulator_model, tension_inputs, disk_states, tensions=tensions, solve_plan=plan, backend=backend,
+                                fixed_point_stats=fixed_point_stats, external_load=external_load)
+    
+    start_disk_index = plan.n_disks-1
+    top_vec = np.zeros(6)
+    # A state solved with friction or an external load has distal disk states depending on all joint angles
+    if previous_state is not None and previous_state.solve_plan is plan and \
+       previous_state.external_load is None and previous_state.fixed_point_stats is None:
+        changed_tendon_indices = np.flatnonzero(tensions != previous_state.tensions)
+        start_disk_index = plan.tendon_n_joints[changed_tendon_indices[-1]] if len(changed_tendon_indices) else 0
+        for i in range(start_disk_index+1, plan.n_disks):
+            s = previous_state.disk_states[i-1]
+            joint_angles[i-1] = s.bottom_joint_angle
+            contact_reactions[i-1] = s.bottom_contact_reactionDF.flat_total
+            solver_stats[i-1] = s.solver_stats
+        if start_disk_index < plan.n_disks-1:
+            top_vec = eval_proximal_disk_top_components(plan, start_disk_index+1, tensions, 
+                                                        joint_angles[start_disk_index], contact_reactions[start_disk_index])
+    
+    if not _solve_statics(plan, tensions, solver_type, joint_angles, contact_reactions, solver_stats, start_disk_index, top_vec,
+                          init_joint_angles, bracket_half_width, backend, **search_kwargs):
+        return None
+    if tip_pose_only:
+        return eval_tip_TF(plan, joint_angles, backend)
     
+    disk_states = _generate_disk_states(manipulator_model, plan, tensions, joint_angles, contact_reactions, solver_stats, start_disk_index)
+    if start_disk_index < plan.n_disks-1:
+        disk_states += previous_state.disk_states[start_disk_index:]
+    return ManipulatorState(manipulator_model, tension_inputs, disk_states, tensions=tensions, solve_plan=plan, backend=backend)
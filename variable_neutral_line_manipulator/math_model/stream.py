@@ -0,0 +1,97 @@
+from itertools import islice
+
+import numpy as np
+
+from .models import *
+from .plan import *
+from .solver import SolverType, SolverBackend, _solve_statics_fixed_point, eval_tip_TF
+from .batch import _eval_joint_angles_batch
+from .compact import CompactManipulatorState
+
+
+class StateOutput:
+    TENSIONS="tensions"
+    JOINT_ANGLES="joint_angles"
+    CONTACT_REACTIONS="contact_reactions"
+    TIP_TF="tip_TF"
+    COMPACT_STATE="compact_state"
+
+
+def read_tensions(file, delimiter=","):
+    """
+        Lazily read tensions indexed by tendon, one input per line, e.g. of a recorded tension log
+        file: path or text file object. Empty lines and lines starting with # are skipped
+    """
+    if isinstance(file, str):
+        with open(file) as f:
+            yield from read_tensions(f, delimiter)
+        return
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield np.array(line.split(delimiter), dtype=float)
+
+
+def iter_states(manipulator_model: ManipulatorMathModel, tension_iterable, outputs=(StateOutput.JOINT_ANGLES, StateOutput.TIP_TF),
+                solver_type: SolverType = SolverType.DIRECT, chunk_size=256, bracket_half_width=0.05,
+                backend: SolverBackend = SolverBackend.NUMPY, **search_kwargs):
+    """
+        Lazily solve a stream of tension inputs, reading at most chunk_size inputs ahead
+        tension_iterable: tensions indexed by tendon, or nested tension inputs as in eval_manipulator_state, e.g. from read_tensions
+        outputs: StateOutputs to yield
+        solver_type: the direct solver solves chunks at once, unless the model has friction. Root searches of numerical solvers are seeded with the previous solution
+                     within +- bracket_half_width (see SolverSession)
+        yield {output: value} for each input, or None if no solution is found
+    """
+    unknown_outputs = set(outputs) - {v for k, v in vars(StateOutput).items() if not k.startswith("_")}
+    if unknown_outputs:
+        raise ValueError(f"Unknown outputs {unknown_outputs}")
+    plan = manipulator_model.compile()
+    if plan is None:
+        return
+
+    with_contact_reactions = StateOutput.CONTACT_REACTIONS in outputs or StateOutput.COMPACT_STATE in outputs
+    with_tip_TFs = StateOutput.TIP_TF in outputs
+    iterator = iter(tension_iterable)
+    init_joint_angles = None
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        tensions = np.array([plan.flatten_tension_inputs(t) if len(t) and np.ndim(t[0]) else t for t in chunk], dtype=float)
+        if tensions.shape[1] != plan.n_tendons:
+            raise ValueError(f"Expect {plan.n_tendons} tensions per input, but got {tensions.shape[1]}")
+
+        solver_stats = None
+        is_solved = np.ones(len(tensions), dtype=bool)
+        if solver_type == SolverType.DIRECT and not plan.has_friction:
+            res = _eval_joint_angles_batch(plan, tensions, with_contact_reactions)
+            joint_angles, contact_reactions = res if with_contact_reactions else (res, None)
+        else:
+            joint_angles = np.zeros((len(tensions), plan.n_disks-1))
+            contact_reactions = np.zeros((len(tensions), plan.n_disks-1, 6))
+            solver_stats = [[None]*(plan.n_disks-1) if solver_type != SolverType.DIRECT else None for _ in tensions]
+            for k, t in enumerate(tensions):
+                is_solved[k] = _solve_statics_fixed_point(plan, t, solver_type, joint_angles[k], contact_reactions[k], solver_stats[k],
+                                                            init_joint_angles, bracket_half_width, backend, **search_kwargs) is not None
+                init_joint_angles = joint_angles[k] if is_solved[k] else None
+        tip_TFs = eval_tip_TF(plan, joint_angles) if with_tip_TFs else None
+
+        for k in range(len(tensions)):
+            if not is_solved[k]:
+                yield None
+                continue
+            result = {}
+            for output in outputs:
+                if output == StateOutput.TENSIONS:
+                    result[output] = tensions[k]
+                elif output == StateOutput.JOINT_ANGLES:
+                    result[output] = joint_angles[k]
+                elif output == StateOutput.CONTACT_REACTIONS:
+                    result[output] = contact_reactions[k]
+                elif output == StateOutput.TIP_TF:
+                    result[output] = tip_TFs[k]
+                else:
+                    result[output] = CompactManipulatorState(manipulator_model, plan, tensions[k], joint_angles[k], contact_reactions[k],
+                                                             None if solver_stats is None else solver_stats[k])
+            yield result
@@ -0,0 +1,137 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .models import *
+from .plan import *
+from .solver import SolverType, SolverBackend, _solve_statics_fixed_point, eval_tip_TF
+from .batch import _eval_joint_angles_batch
+from . import jit
+
+
+class SweepResult:
+    """
+        Solutions of a tension sweep, indexed by sample
+    """
+    def __init__(self, tensions, joint_angles, tip_TFs):
+        self.tensions = tensions            # (N, n_tendons) tensions indexed by tendon
+        self.joint_angles = joint_angles    # (N, n_disks-1) bottom joint angles, entry i-1 belongs to disk i. NaN if not solved
+        self.tip_TFs = tip_TFs              # (N, 4, 4) transformations of the top of end disk, in base-disk-orientation
+
+    @property
+    def n_samples(self):
+        return len(self.tensions)
+
+    @property
+    def is_solved(self):
+        return ~np.any(np.isnan(self.joint_angles), axis=1)
+
+    def __repr__(self):
+        return f"<SweepResult> [samples={self.n_samples}, solved={np.count_nonzero(self.is_solved)}]"
+
+
+def _solve_sweep_chunk(plan: SolvePlan, tensions, joint_angles, tip_TFs, solver_type, backend, search_kwargs):
+    """
+        Solve tensions (n, n_tendons), writing into joint_angles (n, n_disks-1) and tip_TFs (n, 4, 4) in place
+    """
+    if solver_type == SolverType.DIRECT and not (backend == SolverBackend.NUMBA and jit.HAS_NUMBA) and not plan.has_friction:
+        joint_angles[:] = _eval_joint_angles_batch(plan, tensions)
+    else:
+        contact_reactions = np.zeros((plan.n_disks-1, 6))
+        for t, angles in zip(tensions, joint_angles):
+            if _solve_statics_fixed_point(plan, t, solver_type, angles, contact_reactions, None, backend=backend, **search_kwargs) is None:
+                angles[:] = np.nan
+    tip_TFs[:] = eval_tip_TF(plan, joint_angles)
+
+
+# Context of a sweep worker process, set once by _init_sweep_worker
+_worker_context = {}
+
+
+def _attach_shared_arrays(array_specs):
+    """
+        array_specs: {key: (shared memory name, shape)} of float64 arrays
+        return {key: (SharedMemory, array)}
+    """
+    arrays = {}
+    for key, (name, shape) in array_specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        arrays[key] = (shm, np.ndarray(shape, dtype=float, buffer=shm.buf))
+    return arrays
+
+
+def _init_sweep_worker(plan: SolvePlan, array_specs, solver_type, backend, search_kwargs):
+    _worker_context.update(plan=plan, arrays=_attach_shared_arrays(array_specs),
+                           solver_type=solver_type, backend=backend, search_kwargs=search_kwargs)
+
+
+def _sweep_worker_chunk(start, stop):
+    arrays = {key: array for key, (_, array) in _worker_context["arrays"].items()}
+    _solve_sweep_chunk(_worker_context["plan"], arrays["tensions"][start:stop], arrays["joint_angles"][start:stop],
+                       arrays["tip_TFs"][start:stop], _worker_context["solver_type"], _worker_context["backend"],
+                       _worker_context["search_kwargs"])
+    return stop - start
+
+
+def sweep(manipulator_model: ManipulatorMathModel, tension_source, workers=None, chunksize=256,
+          solver_type: SolverType = SolverType.DIRECT, backend: SolverBackend = SolverBackend.NUMPY,
+          progress=None, **search_kwargs) -> SweepResult:
+    """
+        Solve many tension inputs across a process pool
+        tension_source: (N, n_tendons) tensions indexed by tendon, or an iterable of such chunks, e.g. from sample_tensions
+        workers: number of processes, defaults to the number of CPUs. Solve in the calling process if workers <= 1
+        chunksize: number of samples per task
+        progress: called with (number of samples solved, N) after each chunk
+        search_kwargs: threshold, x_threshold and max_iterations of the root search of numerical solvers,
+                       and fixed_point_threshold and max_fixed_point_iterations of models with friction (see eval_manipulator_state)
+        The model is sent to each worker once, and workers write the results into shared memory,
+        so only chunk bounds are passed between processes
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+
+    if not isinstance(tension_source, (np.ndarray, list, tuple)):
+        tension_source = np.concatenate([np.atleast_2d(chunk) for chunk in tension_source])
+    tensions = np.atleast_2d(np.asarray(tension_source, dtype=float))
+    if tensions.shape[1] != plan.n_tendons:
+        raise ValueError(f"Expect {plan.n_tendons} tensions per input, but got {tensions.shape[1]}")
+    n_samples = len(tensions)
+    workers = os.cpu_count() if workers is None else workers
+    starts = range(0, n_samples, chunksize)
+
+    if workers <= 1:
+        joint_angles = np.zeros((n_samples, plan.n_disks-1))
+        tip_TFs = np.zeros((n_samples, 4, 4))
+        for start in starts:
+            stop = min(start + chunksize, n_samples)
+            _solve_sweep_chunk(plan, tensions[start:stop], joint_angles[start:stop], tip_TFs[start:stop],
+                               solver_type, backend, search_kwargs)
+            if progress is not None:
+                progress(stop, n_samples)
+        return SweepResult(tensions, joint_angles, tip_TFs)
+
+    shapes = {"tensions": tensions.shape, "joint_angles": (n_samples, plan.n_disks-1), "tip_TFs": (n_samples, 4, 4)}
+    shms = {key: shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape))*8, 1)) for key, shape in shapes.items()}
+    arrays = {key: np.ndarray(shape, dtype=float, buffer=shms[key].buf) for key, shape in shapes.items()}
+    try:
+        arrays["tensions"][:] = tensions
+        array_specs = {key: (shms[key].name, shape) for key, shape in shapes.items()}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                 initargs=(plan, array_specs, solver_type, backend, search_kwargs)) as executor:
+            futures = [executor.submit(_sweep_worker_chunk, start, min(start + chunksize, n_samples)) for start in starts]
+            n_solved = 0
+            for future in as_completed(futures):
+                n_solved += future.result()
+                if progress is not None:
+                    progress(n_solved, n_samples)
+        result = SweepResult(tensions, arrays["joint_angles"].copy(), arrays["tip_TFs"].copy())
+    finally:
+        # Release the views before closing the buffers
+        arrays.clear()
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+    return result
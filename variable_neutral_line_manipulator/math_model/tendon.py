@@ -0,0 +1,52 @@
+from typing import List
+
+import numpy as np
+
+from .models import *
+from .plan import *
+
+
+def eval_span_lengths(plan: SolvePlan, joint_angles):
+    """
+        Lengths of the tendon spans across the joints, from the top guide end of the proximal disk to the bottom guide end of the distal disk
+        The guide ends of a span are mirror images across the tangent plane of the rolling contact, 
+        which is tilted by half of the joint angle from either disk
+        joint_angles: (..., n_disks-1) bottom joint angles
+        return (..., n_disks-1, n_tendons) span lengths indexed by tendon, 0 for the tendons not across a joint
+    """
+    half_joint_angles = np.asarray(joint_angles, dtype=float)[..., np.newaxis]/2
+    return 2*(plan.span_curve_radii + (plan.span_guide_heights - plan.span_curve_radii)*np.cos(half_joint_angles) 
+              + plan.bottom_guide_disps[1:, :, 1]*np.sin(half_joint_angles))
+
+
+def stack_joint_angles(states: List) -> np.ndarray:
+    """
+        states: ManipulatorStates or CompactManipulatorStates of a model
+        return (N, n_disks-1) bottom joint angles
+    """
+    return np.array([s.bottom_joint_angles for s in states], dtype=float).reshape(len(states), -1)
+
+
+def eval_tendon_lengths(manipulator_model: ManipulatorMathModel, joint_angles) -> np.ndarray:
+    """
+        Path lengths of the tendons from the bottom of the base disk to their knobs, through the guides and across the joints
+        joint_angles: (N, n_disks-1) bottom joint angles, e.g. from eval_manipulator_state_batch or stack_joint_angles, 
+                      or (n_disks-1,) of one state
+        return (N, n_tendons) lengths indexed by tendon, or (n_tendons,) of one state
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    return np.sum(plan.guide_lengths, axis=0) + np.sum(eval_span_lengths(plan, joint_angles), axis=-2)
+
+
+def eval_tendon_displacements(manipulator_model: ManipulatorMathModel, joint_angles) -> np.ndarray:
+    """
+        Lengths of the tendons hauled in by the actuators at the base from the straight manipulator, negative if paid out
+        joint_angles: as eval_tendon_lengths
+        return (N, n_tendons) displacements indexed by tendon, or (n_tendons,) of one state
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+    return np.sum(eval_span_lengths(plan, np.zeros(plan.n_disks-1)) - eval_span_lengths(plan, joint_angles), axis=-2)
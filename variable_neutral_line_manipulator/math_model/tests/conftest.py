@@ -0,0 +1,33 @@
+from math import pi
+
+import numpy as np
+import pytest
+
+from ..models import *
+
+
+@pytest.fixture
+def manipulator_model():
+    return ManipulatorMathModel([
+        SegmentMathConfig(is_2_DoF=True, n_joints=4, disk_length=5, orientationBF=0, curve_radius=3, tendon_dist_from_axis=1, end_disk_length=5),
+        SegmentMathConfig(is_2_DoF=False, n_joints=3, disk_length=5, orientationBF=pi/4, curve_radius=3, tendon_dist_from_axis=1, end_disk_length=5),
+        SegmentMathConfig(is_2_DoF=True, n_joints=5, disk_length=4, orientationBF=pi/3, curve_radius=3.5, tendon_dist_from_axis=1.2, end_disk_length=5),
+    ], base_disk_length=5, outer_diameter=5)
+
+
+@pytest.fixture
+def tensions(manipulator_model):
+    return np.random.RandomState(0).uniform(0, 10, (20, len(manipulator_model.tendons)))
+
+
+def to_tension_inputs(manipulator_model, tensions):
+    """
+        Split flattened tensions into the nested per-segment tension inputs of eval_manipulator_state
+    """
+    tension_inputs = []
+    i = 0
+    for _, knobbed_tendons in manipulator_model.disk_knobbed_tendons_iterator:
+        if knobbed_tendons:
+            tension_inputs.append(list(tensions[i:i+len(knobbed_tendons)]))
+            i += len(knobbed_tendons)
+    return tension_inputs
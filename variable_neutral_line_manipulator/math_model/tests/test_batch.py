@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..batch import *
+from ..benchmark import create_model, _eval_central_difference_jacobian
+from .conftest import to_tension_inputs
+
+
+def test_eval_manipulator_state_batch_matches_direct_solver(manipulator_model, tensions):
+    joint_angles, contact_reactions = eval_manipulator_state_batch(manipulator_model, tensions, with_contact_reactions=True)
+    assert(joint_angles.shape == (len(tensions), len(manipulator_model.disks)-1))
+    assert(contact_reactions.shape == joint_angles.shape + (6,))
+
+    for t, angles, reactions in zip(tensions, joint_angles, contact_reactions):
+        state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), SolverType.DIRECT)
+        assert(np.allclose(angles, [s.bottom_joint_angle for s in state.disk_states], atol=1e-9))
+        assert(np.allclose(reactions, [s.bottom_contact_reactionDF.flat_total for s in state.disk_states], atol=1e-9))
+
+
+def test_eval_manipulator_state_batch_single_input(manipulator_model, tensions):
+    assert(np.allclose(eval_manipulator_state_batch(manipulator_model, tensions[0]),
+                       eval_manipulator_state_batch(manipulator_model, tensions[:1])))
+
+
+def test_eval_manipulator_state_batch_zero_tensions(manipulator_model):
+    joint_angles = eval_manipulator_state_batch(manipulator_model, np.zeros((3, len(manipulator_model.tendons))))
+    assert(np.all(joint_angles == 0.0))
+
+
+def test_eval_manipulator_state_batch_wrong_shape(manipulator_model):
+    with pytest.raises(ValueError):
+        eval_manipulator_state_batch(manipulator_model, np.zeros((3, len(manipulator_model.tendons)+1)))
+
+
+def test_eval_manipulator_jacobian_batch(manipulator_model, tensions):
+    jacobian = eval_manipulator_jacobian_batch(manipulator_model, tensions[:5])
+    assert(np.allclose(jacobian.joint_angles, eval_manipulator_state_batch(manipulator_model, tensions[:5])))
+    
+    eps = 1e-6
+    for k in range(tensions.shape[1]):
+        upper = tensions[:5].copy()
+        upper[:, k] += eps
+        lower = tensions[:5].copy()
+        lower[:, k] -= eps
+        numerical = (eval_manipulator_state_batch(manipulator_model, upper) - eval_manipulator_state_batch(manipulator_model, lower))/(2*eps)
+        assert(np.allclose(jacobian.joint_angle_jacobian[..., k], numerical, atol=1e-7))
+        
+        numerical = (eval_manipulator_jacobian_batch(manipulator_model, upper).tip_TF 
+                     - eval_manipulator_jacobian_batch(manipulator_model, lower).tip_TF)/(2*eps)
+        assert(np.allclose(jacobian.tip_TF_jacobian[..., k], numerical, atol=1e-6))
+
+
+def test_eval_manipulator_jacobian_batch_near_continuum():
+    model = create_model(40)
+    tensions = np.random.RandomState(0).uniform(0, 1, (3, len(model.tendons)))
+    jacobian = eval_manipulator_jacobian_batch(model, tensions)
+    for k in range(len(tensions)):
+        assert(np.allclose(jacobian.tip_TF_jacobian[k], _eval_central_difference_jacobian(model, tensions[k]), rtol=1e-5, atol=1e-6))
+
+
+def test_eval_manipulator_state_with_jacobian(manipulator_model, tensions):
+    tension_inputs = to_tension_inputs(manipulator_model, tensions[0])
+    state, jacobian = eval_manipulator_state_with_jacobian(manipulator_model, tension_inputs)
+    direct_state = eval_manipulator_state(manipulator_model, tension_inputs, SolverType.DIRECT)
+    assert(np.allclose([s.bottom_joint_angle for s in state.disk_states], [s.bottom_joint_angle for s in direct_state.disk_states]))
+    assert(np.allclose(jacobian.tip_TF, direct_state.get_TF(-1, "t", "bd")))
+    assert(np.allclose(jacobian.tip_position_jacobian, 
+                       eval_manipulator_jacobian_batch(manipulator_model, tensions[:1]).tip_position_jacobian[0]))
@@ -0,0 +1,57 @@
+import numpy as np
+
+from ..calculation import *
+
+
+def _eval_scalar_kernel(kernel, *args):
+    """
+        Apply a scalar kernel elementwise over broadcast array arguments
+    """
+    args = np.broadcast_arrays(*args)
+    return np.array([kernel(*(float(a[index]) for a in args)) for index in np.ndindex(args[0].shape)]).reshape(args[0].shape + (-1,))
+
+
+def test_array_kernels():
+    rng = np.random.RandomState(0)
+    length = rng.uniform(2, 5, (4, 1))
+    radius = rng.uniform(5, 8, (4, 1))
+    dist = rng.uniform(0.5, 1.5, (1, 3))
+    tension = rng.uniform(0, 10, (4, 3))
+    angle = rng.uniform(-1.5, 1.5, (4, 3))
+    orientation = rng.uniform(-3, 3, (4, 3))
+    vec = rng.uniform(-1, 1, (4, 3, 3))
+    
+    for kernel, array_kernel, args in (
+        (evalTopGuideForce, evalTopGuideForceArray, (tension, angle, orientation)),
+        (evalBottomGuideForce, evalBottomGuideForceArray, (tension, angle)),
+        (evalTopGuideEndDisp, evalTopGuideEndDispArray, (length, radius, dist, orientation, angle)),
+        (evalBottomGuideEndDisp, evalBottomGuideEndDispArray, (length, radius, dist, orientation)),
+        (evalTopContactDisp, evalTopContactDispArray, (length, radius, angle, orientation)),
+        (evalBottomContactDisp, evalBottomContactDispArray, (length, radius, angle)),
+    ):
+        result = array_kernel(*args)
+        assert(result.shape == (4, 3, 3))
+        assert(np.allclose(result, _eval_scalar_kernel(kernel, *args)))
+    
+    expected = np.array([distalToProximalFrame(vec[index], angle[index], orientation[index]) for index in np.ndindex(angle.shape)])
+    assert(np.allclose(distalToProximalFrameArray(vec, angle, orientation).reshape(-1, 3), expected))
+    
+    expected = np.array([evalTFProximalTopToDistalBottom(angle[index], radius[index[0], 0]) for index in np.ndindex(angle.shape)])
+    assert(np.allclose(evalTFProximalTopToDistalBottomArray(angle, radius).reshape(-1, 4, 4), expected))
+
+
+def test_rotation_builders():
+    radians = np.linspace(-3, 3, 7)
+    for axis, m3_builder, m4_builder in (((1.0, 0, 0), m3MatrixRotationXArray, m4MatrixRotationXArray),
+                                         ((0, 0, 1.0), m3MatrixRotationZArray, m4MatrixRotationZArray)):
+        assert(np.allclose(m3_builder(radians), [m3MatrixRotation(axis, r) for r in radians]))
+        assert(np.allclose(m4_builder(radians), [m4MatrixRotation(axis, r) for r in radians]))
+        assert(m3_builder(0.5).shape == (3, 3))
+    vecs = np.arange(12.0).reshape(4, 3)
+    assert(np.allclose(m4MatrixTranslationArray(vecs), [m4MatrixTranslation(v) for v in vecs]))
+
+
+def test_evalCapstanArray():
+    angles = np.linspace(-1, 1, 5)
+    assert(np.allclose(evalCapstanArray(10, 0.3, angles), 10*np.exp(-0.3*angles)))
+    assert(np.all(evalCapstanArray(10, 0, angles) == 10))
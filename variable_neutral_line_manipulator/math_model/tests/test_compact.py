@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..compact import *
+from .conftest import to_tension_inputs
+
+
+def test_compact_manipulator_states(manipulator_model, tensions):
+    compact_states = eval_compact_manipulator_states(manipulator_model, tensions)
+    assert(len(compact_states) == len(tensions))
+    for flat_tensions, compact_state in zip(tensions, compact_states):
+        tension_inputs = to_tension_inputs(manipulator_model, flat_tensions)
+        state = eval_manipulator_state(manipulator_model, tension_inputs, SolverType.DIRECT)
+        assert(not hasattr(compact_state, "__dict__"))
+        assert(compact_state.tension_inputs == tension_inputs)
+        
+        assert(compact_state._TFs_DF is None)
+        assert(np.allclose(compact_state.TFs_DF, state.TFs_DF))
+        for i in range(-1, len(manipulator_model.disks)):
+            for side in ("b", "c", "t"):
+                for frame_sys in ("bd", "bc", "tc"):
+                    assert(np.allclose(compact_state.get_TF(i, side, frame_sys), state.get_TF(i, side, frame_sys)))
+        with pytest.raises(AttributeError):
+            compact_state.get_TF(0, "x", "bd")
+        
+        for s, compact_s in zip(state.disk_states, compact_state.disk_states):
+            assert(np.isclose(s.bottom_joint_angle, compact_s.bottom_joint_angle))
+            assert(np.allclose(s.bottom_contact_reactionDF.flat_total, compact_s.bottom_contact_reactionDF.flat_total))
+            assert([t.tension_in_disk for t in s.tendon_states] == [t.tension_in_disk for t in compact_s.tendon_states])
+
+
+def test_compact_manipulator_state_from_state(manipulator_model, tensions):
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[0]), SolverType.BRENT)
+    compact_state = CompactManipulatorState.from_state(state)
+    assert(compact_state.solver_stats == state.solver_stats)
+    assert(np.allclose(compact_state.get_TF(-1, "t", "bd"), state.get_TF(-1, "t", "bd")))
+    assert(np.array_equal(compact_state.get_tensions_at_disk(5), [t.tension_in_disk for t in state.disk_states[4].tendon_states]))
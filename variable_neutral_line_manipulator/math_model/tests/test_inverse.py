@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from ..solver import SolverBackend
+from ..batch import *
+from ..inverse import *
+
+
+@pytest.mark.parametrize("backend", [SolverBackend.NUMPY, SolverBackend.NUMBA])
+def test_solve_inverse_position(manipulator_model, tensions, backend):
+    target_TF = eval_manipulator_jacobian_batch(manipulator_model, tensions[0]*5).tip_TF[0]
+    solution = solve_inverse(manipulator_model, target_TF, bounds=(0.0, 100.0), orientation_weight=0.0, backend=backend)
+    assert(solution.converged)
+    assert(np.allclose(solution.tip_TF[:3, 3], target_TF[:3, 3], atol=1e-5))
+    assert(np.allclose(eval_manipulator_jacobian_batch(manipulator_model, solution.tensions).tip_TF[0], solution.tip_TF))
+
+
+@pytest.mark.parametrize("backend", [SolverBackend.NUMPY, SolverBackend.NUMBA])
+def test_solve_inverse_pose(manipulator_model, tensions, backend):
+    target_TF = eval_manipulator_jacobian_batch(manipulator_model, tensions[1]*5).tip_TF[0]
+    solution = solve_inverse(manipulator_model, target_TF, backend=backend)
+    assert(solution.position_error < 1e-5)
+    assert(solution.orientation_error < 1e-4)
+
+
+def test_solve_inverse_warm_start(manipulator_model, tensions):
+    first = solve_inverse(manipulator_model, eval_manipulator_jacobian_batch(manipulator_model, tensions[0]*5).tip_TF[0],
+                          orientation_weight=0.0)
+    target_TF = eval_manipulator_jacobian_batch(manipulator_model, tensions[0]*5 + 0.5).tip_TF[0]
+    cold = solve_inverse(manipulator_model, target_TF, orientation_weight=0.0)
+    warm = solve_inverse(manipulator_model, target_TF, init=first.tensions, orientation_weight=0.0)
+    assert(warm.converged)
+    assert(warm.n_evaluations < cold.n_evaluations)
+
+
+def test_solve_inverse_bounds(manipulator_model, tensions):
+    target_TF = eval_manipulator_jacobian_batch(manipulator_model, tensions[2]*5).tip_TF[0]
+    solution = solve_inverse(manipulator_model, target_TF, bounds=(1.0, 20.0))
+    assert(np.all(solution.tensions >= 1.0) and np.all(solution.tensions <= 20.0))
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..batch import _eval_jacobian_batch
+from .. import jit
+from .conftest import to_tension_inputs
+
+
+SOLVER_TYPES = [SolverType.DIRECT, SolverType.BINARY, SolverType.NEWTON, SolverType.BRENT, SolverType.ILLINOIS]
+
+
+@pytest.mark.skipif(not jit.HAS_NUMBA, reason="Numba is not installed")
+@pytest.mark.parametrize("solver_type", SOLVER_TYPES)
+def test_numba_backend_matches_numpy_backend(manipulator_model, tensions, solver_type):
+    init_joint_angles = None
+    for t in tensions[:5]:
+        tension_inputs = to_tension_inputs(manipulator_model, t)
+        for kwargs in ({}, {"init_joint_angles": init_joint_angles, "bracket_half_width": 0.05}):
+            state = eval_manipulator_state(manipulator_model, tension_inputs, solver_type, **kwargs)
+            jit_state = eval_manipulator_state(manipulator_model, tension_inputs, solver_type, backend=SolverBackend.NUMBA, **kwargs)
+            assert(np.allclose([s.bottom_joint_angle for s in jit_state.disk_states],
+                               [s.bottom_joint_angle for s in state.disk_states], rtol=0, atol=1e-12))
+            assert(np.allclose([s.bottom_contact_reactionDF.flat_total for s in jit_state.disk_states],
+                               [s.bottom_contact_reactionDF.flat_total for s in state.disk_states], rtol=0, atol=1e-9))
+            assert(np.allclose(jit_state.TFs, state.TFs, rtol=0, atol=1e-12))
+            assert([repr(s) for s in jit_state.solver_stats] == [repr(s) for s in state.solver_stats])
+        init_joint_angles = [s.bottom_joint_angle for s in state.disk_states]
+
+
+def test_eval_tip_jacobian(manipulator_model, tensions):
+    plan = manipulator_model.compile()
+    joint_angles = np.empty(plan.n_disks-1)
+    d_joint_angles = np.empty((plan.n_disks-1, plan.n_tendons))
+    tip_TF = np.empty((4, 4))
+    tip_TF_jacobian = np.empty((4, 4, plan.n_tendons))
+    expected = _eval_jacobian_batch(plan, tensions[:5])
+    for k, t in enumerate(tensions[:5]):
+        jit.eval_tip_jacobian(plan.lengths, plan.bottom_curve_radii, plan.top_orientationsDF, plan.tendon_starts, plan.bottom_guide_disps, 
+                              plan.top_guide_disps, plan.top_curve_radii, -plan.bottom_orientationsBF[-1], t, 
+                              joint_angles, d_joint_angles, tip_TF, tip_TF_jacobian)
+        assert(np.allclose(joint_angles, expected[0][k], rtol=0, atol=1e-12))
+        assert(np.allclose(d_joint_angles, expected[1][k], rtol=0, atol=1e-12))
+        assert(np.allclose(tip_TF, expected[3][k], rtol=0, atol=1e-12))
+        assert(np.allclose(tip_TF_jacobian, expected[4][k], rtol=0, atol=1e-12))
+
+
+@pytest.mark.parametrize("backend", [SolverBackend.NUMPY, SolverBackend.NUMBA])
+@pytest.mark.parametrize("solver_type", SOLVER_TYPES)
+def test_eval_joint_angles(manipulator_model, tensions, solver_type, backend):
+    plan = manipulator_model.compile()
+    for t in tensions[:3]:
+        state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), solver_type)
+        joint_angles, contact_reactions = eval_joint_angles(manipulator_model, t, solver_type, backend=backend)
+        assert(np.allclose(joint_angles, [s.bottom_joint_angle for s in state.disk_states], rtol=0, atol=1e-12))
+        assert(np.allclose(contact_reactions, [s.bottom_contact_reactionDF.flat_total for s in state.disk_states], rtol=0, atol=1e-9))
+        assert(np.allclose(eval_TFs_DF(plan, joint_angles, backend), state.TFs_DF, rtol=0, atol=1e-12))
+
+
+def test_eval_joint_angles_search_kwargs(manipulator_model, tensions):
+    for backend in (SolverBackend.NUMPY, SolverBackend.NUMBA):
+        joint_angles, _ = eval_joint_angles(manipulator_model, tensions[0], SolverType.BINARY, backend=backend, threshold=1e-3)
+        assert(not np.allclose(joint_angles, eval_joint_angles(manipulator_model, tensions[0])[0], rtol=0, atol=1e-9))
+        with pytest.raises(TypeError):
+            eval_joint_angles(manipulator_model, tensions[0], SolverType.BRENT, backend=backend, tolerance=1)
+
+
+def test_numba_backend_fallback(manipulator_model, tensions, monkeypatch):
+    monkeypatch.setattr(jit, "HAS_NUMBA", False)
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[0]), SolverType.BRENT,
+                                   backend=SolverBackend.NUMBA)
+    joint_angles, _ = eval_joint_angles(manipulator_model, tensions[0], SolverType.BRENT, backend=SolverBackend.NUMBA)
+    assert(np.array_equal(joint_angles, [s.bottom_joint_angle for s in state.disk_states]))
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..batch import *
+from ..kinematics import *
+from ..plan import TF_SIDES, TF_FRAME_SYSS
+from .conftest import to_tension_inputs
+
+
+def test_forward_kinematics_match_states(manipulator_model, tensions):
+    joint_angles = eval_manipulator_state_batch(manipulator_model, tensions)
+    tip_TFs = eval_tip_TFs(manipulator_model, joint_angles)
+    disk_TFs = eval_disk_TFs(manipulator_model, joint_angles)
+    assert(tip_TFs.shape == (len(tensions), 4, 4))
+    assert(disk_TFs.shape == (len(tensions), len(manipulator_model.disks), 4, 4))
+    for k, t in enumerate(tensions[:3]):
+        state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), SolverType.DIRECT)
+        assert(np.allclose(tip_TFs[k], state.get_TF(-1, "t", "bd")))
+        assert(np.allclose(disk_TFs[k], state.TFs_DF))
+        for side in TF_SIDES:
+            for frame_sys in TF_FRAME_SYSS:
+                assert(np.allclose(eval_disk_TFs(manipulator_model, joint_angles[k], side, frame_sys), 
+                                   [state.get_TF(i, side, frame_sys) for i in range(len(manipulator_model.disks))]))
+    assert(np.allclose(eval_tip_TFs(manipulator_model, joint_angles[0]), tip_TFs[0]))
+    
+    with pytest.raises(ValueError):
+        eval_tip_TFs(manipulator_model, joint_angles[:, 1:])
+    with pytest.raises(AttributeError):
+        eval_disk_TFs(manipulator_model, joint_angles, "x")
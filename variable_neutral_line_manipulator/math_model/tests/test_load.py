@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from ..models import *
+from ..solver import *
+from ..batch import *
+from ..load import *
+from .conftest import to_tension_inputs
+
+
+def _with_masses(manipulator_model, mass):
+    return ManipulatorMathModel([SegmentMathConfig(**dict(vars(c), disk_mass=mass, end_disk_mass=2*mass)) for c in manipulator_model.segment_configs],
+                                base_disk_length=manipulator_model.base_disk_length, outer_diameter=manipulator_model.outer_diameter)
+
+
+LOADS = [
+    ExternalLoad(gravity=(0, -9.81, 0)),
+    ExternalLoad(tip_force=(0.5, 0.3, -0.2), tip_moment=(0, 0.5, 0)),
+]
+
+
+def test_zero_load(manipulator_model, tensions):
+    model = _with_masses(manipulator_model, 0.01)
+    for t in tensions[:3]:
+        tension_inputs = to_tension_inputs(model, t)
+        state = eval_manipulator_state(model, tension_inputs, SolverType.DIRECT)
+        assert(state.fixed_point_stats is None)
+        loaded_state = eval_manipulator_state(model, tension_inputs, SolverType.DIRECT, external_load=ExternalLoad())
+        assert(loaded_state.fixed_point_stats.converged)
+        assert(np.allclose(loaded_state.TFs, state.TFs, rtol=0, atol=1e-12))
+
+
+@pytest.mark.parametrize("load", LOADS)
+def test_external_load(manipulator_model, tensions, load):
+    model = _with_masses(manipulator_model, 0.01)
+    plan = model.compile()
+    for t in tensions[:3]:
+        tension_inputs = to_tension_inputs(model, t)
+        state = eval_manipulator_state(model, tension_inputs, SolverType.DIRECT, external_load=load)
+        assert(state.fixed_point_stats.converged)
+        joint_angles = np.array([s.bottom_joint_angle for s in state.disk_states])
+        assert(not np.allclose(joint_angles, [s.bottom_joint_angle for s in eval_manipulator_state(model, tension_inputs, SolverType.DIRECT).disk_states]))
+
+        # The contact reaction and tendon tensions on the bottom of disk 1 balance the external forces
+        bottom_components = state.disk_states[0].bottom_contact_reactionDF.flat_total + eval_bottom_tendon_components(plan, 1, t, joint_angles[0])
+        base_reaction = np.array(state.TFs_DF)[1, :3, :3] @ bottom_components[:3]
+        assert(np.allclose(base_reaction + np.sum(plan.masses[1:])*load.gravity + load.tip_force, 0, rtol=0, atol=1e-9))
+
+        for solver_type, backend in ((SolverType.DIRECT, SolverBackend.NUMBA), (SolverType.BRENT, SolverBackend.NUMPY), (SolverType.BRENT, SolverBackend.NUMBA)):
+            other_angles, _ = eval_joint_angles(model, t, solver_type, backend=backend, external_load=load)
+            assert(np.allclose(other_angles, joint_angles, rtol=0, atol=1e-8))
+
+
+def test_lateral_tip_force(manipulator_model):
+    t = np.full(len(manipulator_model.tendons), 5.0)
+    tension_inputs = to_tension_inputs(manipulator_model, t)
+    tip_position = eval_manipulator_state(manipulator_model, tension_inputs, SolverType.DIRECT).get_TF(-1, "t", "bd")[:3, 3]
+    for force in ((0.3, 0, 0), (0, 0.3, 0)):
+        positions = [eval_manipulator_state(manipulator_model, tension_inputs, SolverType.DIRECT, external_load=ExternalLoad(tip_force=f)).get_TF(-1, "t", "bd")[:3, 3]
+                     for f in (force, np.negative(force))]
+        assert(np.dot(positions[0] - tip_position, force) > 0)
+        assert(np.allclose(positions[0][:2] - tip_position[:2], tip_position[:2] - positions[1][:2], rtol=0, atol=1e-9))
+
+
+def test_previous_loaded_state(manipulator_model, tensions):
+    for t in (tensions[0], tensions[0] + np.eye(len(tensions[0]))[-1]):
+        tension_inputs = to_tension_inputs(manipulator_model, t)
+        loaded_state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[0]), SolverType.DIRECT, 
+                                              external_load=ExternalLoad(tip_force=(0.3, 0, 0)))
+        state = eval_manipulator_state(manipulator_model, tension_inputs, SolverType.DIRECT, previous_state=loaded_state)
+        assert(np.allclose([s.bottom_joint_angle for s in state.disk_states], eval_joint_angles(manipulator_model, t)[0], rtol=0, atol=1e-12))
+
+
+def test_unbalanced_load(manipulator_model):
+    # Tip force the tensions cannot balance, no joint angle exists on every path
+    t = np.linspace(1, 10, len(manipulator_model.tendons))
+    tension_inputs = to_tension_inputs(manipulator_model, t)
+    load = ExternalLoad(tip_force=(5, 0, 0))
+    for solver_type in (SolverType.DIRECT, SolverType.BRENT):
+        assert(eval_manipulator_state(manipulator_model, tension_inputs, solver_type, external_load=load) is None)
+        for backend in (SolverBackend.NUMPY, SolverBackend.NUMBA):
+            assert(eval_joint_angles(manipulator_model, t, solver_type, backend=backend, external_load=load) is None)
+    joint_angles, contact_reactions = eval_manipulator_state_batch(manipulator_model, np.stack((t, t)), True, 
+                                                                   external_load=ExternalLoad(tip_force=[(5, 0, 0), (0.1, 0, 0)]))
+    assert(np.all(np.isnan(joint_angles[0])) and np.all(np.isnan(contact_reactions[0])))
+    assert(np.allclose(joint_angles[1], eval_joint_angles(manipulator_model, t, external_load=ExternalLoad(tip_force=(0.1, 0, 0)))[0], 
+                       rtol=0, atol=1e-8))
+
+
+def test_load_batch(manipulator_model, tensions):
+    model = _with_masses(manipulator_model, 0.01)
+    directions = np.array([[1, 0, 0], [0, 1, 0], [-1, 0, 0], [0, -1, 0]], dtype=float)
+    loads = ExternalLoad(tip_force=0.3*directions, gravity=(0, 0, -9.81))
+    assert(loads.batch_shape == (len(directions),))
+
+    joint_angles, contact_reactions = eval_manipulator_state_batch(model, tensions[0], True, external_load=loads)
+    assert(joint_angles.shape == (len(directions), len(model.disks)-1))
+    for k, direction in enumerate(directions):
+        state = eval_manipulator_state(model, to_tension_inputs(model, tensions[0]), SolverType.DIRECT,
+                                       external_load=ExternalLoad(tip_force=0.3*direction, gravity=(0, 0, -9.81)))
+        assert(np.allclose(joint_angles[k], [s.bottom_joint_angle for s in state.disk_states], rtol=0, atol=1e-8))
+        assert(np.allclose(contact_reactions[k], [s.bottom_contact_reactionDF.flat_total for s in state.disk_states], rtol=0, atol=1e-6))
+
+    joint_angles = eval_manipulator_state_batch(model, tensions[:len(directions)], external_load=loads)
+    for k, direction in enumerate(directions):
+        other_angles, _ = eval_joint_angles(model, tensions[k], external_load=ExternalLoad(tip_force=0.3*direction, gravity=(0, 0, -9.81)))
+        assert(np.allclose(joint_angles[k], other_angles, rtol=0, atol=1e-8))
+
+    assert(np.all(np.isnan(eval_manipulator_state_batch(model, tensions[0], external_load=loads, max_fixed_point_iterations=1))))
+    with pytest.raises(ValueError):
+        eval_manipulator_state(model, to_tension_inputs(model, tensions[0]), SolverType.DIRECT, external_load=loads)
+    with pytest.raises(ValueError):
+        eval_manipulator_state_batch(model, tensions[:2], external_load=loads)
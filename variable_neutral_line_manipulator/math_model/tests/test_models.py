@@ -0,0 +1,39 @@
+import numpy as np
+
+from ..models import *
+
+
+def test_tendons_at_disk(manipulator_model):
+    tendons = manipulator_model.tendons
+    for i in range(-1, len(manipulator_model.disks) + 1):
+        assert(manipulator_model.get_tendons_at_disk(i) == [t for t in tendons if t.n_joints >= i])
+        assert(manipulator_model.get_knobbed_tendons_at_disk(i) == [t for t in tendons if t.n_joints == i])
+        assert(manipulator_model.get_unkobbed_tendons_at_disk(i) == [t for t in tendons if t.n_joints > i])
+    assert(ManipulatorMathModel().get_knobbed_tendons_at_disk(1) == [])
+
+
+def test_friction_coefficient(manipulator_model):
+    configs = manipulator_model.segment_configs
+    configs[1] = SegmentMathConfig(**dict(vars(configs[1]), friction_coefficient=0.2))
+    model = ManipulatorMathModel(configs, manipulator_model.base_disk_length, manipulator_model.outer_diameter)
+    plan = model.compile()
+    assert(plan.has_friction)
+    assert(np.array_equal(plan.friction_coefficients, [d.friction_coefficient for d in model.disks]))
+    assert(not manipulator_model.compile().has_friction)
+    
+    configs[1] = SegmentMathConfig(**dict(vars(configs[1]), friction_coefficient=-0.1))
+    model = ManipulatorMathModel(configs, manipulator_model.base_disk_length, manipulator_model.outer_diameter)
+    assert(model.compile() is None and not model.is_config_valid())
+
+
+def test_disk_masses(manipulator_model):
+    configs = manipulator_model.segment_configs
+    configs[1] = SegmentMathConfig(**dict(vars(configs[1]), disk_mass=0.01, end_disk_mass=0.05))
+    model = ManipulatorMathModel(configs, manipulator_model.base_disk_length, manipulator_model.outer_diameter)
+    assert(np.array_equal(model.compile().masses, [d.mass for d in model.disks]))
+    assert(np.count_nonzero(model.compile().masses == 0.05) == 1)
+    assert(not np.any(manipulator_model.compile().masses))
+    
+    configs[1] = SegmentMathConfig(**dict(vars(configs[1]), disk_mass=-0.01))
+    model = ManipulatorMathModel(configs, manipulator_model.base_disk_length, manipulator_model.outer_diameter)
+    assert(model.compile() is None and not model.is_config_valid())
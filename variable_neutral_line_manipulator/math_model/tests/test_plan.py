@@ -0,0 +1,42 @@
+import numpy as np
+
+from ..models import *
+from ..plan import *
+
+
+def test_solve_plan_tendon_ranges(manipulator_model):
+    plan = manipulator_model.compile()
+    tendons = manipulator_model.tendons
+    assert(plan.n_disks == len(manipulator_model.disks))
+    assert(plan.n_tendons == len(tendons))
+    for i in range(plan.n_disks):
+        assert([tendons[k] for k in range(plan.tendon_starts[i], plan.n_tendons)] == manipulator_model.get_tendons_at_disk(i))
+        assert([tendons[k] for k in range(plan.knob_starts[i], plan.knob_ends[i])] == manipulator_model.get_knobbed_tendons_at_disk(i))
+
+
+def test_solve_plan_guide_disps(manipulator_model):
+    plan = manipulator_model.compile()
+    disks = manipulator_model.disks
+    for i in range(1, plan.n_disks):
+        for k, t in enumerate(manipulator_model.tendons):
+            if k < plan.tendon_starts[i]:
+                assert(np.all(plan.bottom_guide_disps[i, k] == 0))
+                continue
+            assert(np.allclose(plan.bottom_guide_disps[i, k], 
+                               evalBottomGuideEndDisp(disks[i].length, disks[i].bottom_curve_radius, t.dist_from_axis, t.orientationBF - disks[i].bottom_orientationBF)))
+            top_orientationDF = disks[i].bottom_orientationBF - disks[i-1].bottom_orientationBF
+            assert(np.isclose(plan.top_orientationsDF[i-1], top_orientationDF))
+            assert(np.allclose(plan.top_guide_disps[i-1, k], 
+                               evalTopGuideEndDisp(disks[i-1].length, disks[i].bottom_curve_radius, t.dist_from_axis, 
+                                                   t.orientationBF - disks[i-1].bottom_orientationBF, top_orientationDF)))
+
+
+def test_solve_plan_cache(manipulator_model):
+    plan = manipulator_model.compile()
+    assert(manipulator_model.compile() is plan)
+    
+    manipulator_model.update(outer_diameter=4)
+    new_plan = manipulator_model.compile()
+    assert(new_plan is not plan)
+    
+    assert(ManipulatorMathModel().compile() is None)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from ..models import *
+from ..batch import *
+from ..kinematics import *
+from ..sensitivity import *
+from ..sensitivity import _perturb_geometry_parameter, _eval_last_changed_disk, _resolve_joint_angles_batch
+
+
+def test_geometry_sensitivity(manipulator_model, tensions):
+    sensitivity = eval_geometry_sensitivity_batch(manipulator_model, tensions)
+    assert(all(segment_index is not None for segment_index, _ in sensitivity.parameters))
+    sensitivity = eval_geometry_sensitivity_batch(manipulator_model, tensions, sensitivity.parameters + [(None, "outer_diameter")])
+    n_parameters = len(manipulator_model.segment_configs)*len(SEGMENT_GEOMETRY_PARAMETERS) + 1
+    assert(len(sensitivity.parameters) == n_parameters)
+    assert(sensitivity.tip_TF_sensitivity.shape == (len(tensions), 4, 4, n_parameters))
+    assert(sensitivity.tip_position_sensitivity.shape == (len(tensions), 3, n_parameters))
+    assert(np.allclose(sensitivity.joint_angles, eval_manipulator_state_batch(manipulator_model, tensions)))
+    assert(np.allclose(sensitivity.tip_TF, eval_tip_TFs(manipulator_model, sensitivity.joint_angles)))
+
+    # Against full solves of the perturbed models
+    step = 0.0001
+    for k, (segment_index, name) in enumerate(sensitivity.parameters):
+        value = getattr(manipulator_model if segment_index is None else manipulator_model.segment_configs[segment_index], name)
+        tip_TFs = []
+        for perturbed_value in (value + step, value - step):
+            model = _perturb_geometry_parameter(manipulator_model, segment_index, name, perturbed_value)
+            tip_TFs.append(eval_tip_TFs(model, eval_manipulator_state_batch(model, tensions)))
+        assert(np.allclose(sensitivity.tip_TF_sensitivity[..., k], (tip_TFs[0] - tip_TFs[1])/(2*step), rtol=1e-4, atol=1e-5))
+        if segment_index is None:
+            assert(not np.any(sensitivity.tip_TF_sensitivity[..., k]))
+        else:
+            assert(np.any(np.abs(sensitivity.tip_position_sensitivity[..., k]) > 1e-3))
+
+    subset = eval_geometry_sensitivity_batch(manipulator_model, tensions[0], [(1, "curve_radius"), (0, "disk_length")])
+    assert(np.allclose(subset.tip_TF_sensitivity[0], sensitivity.tip_TF_sensitivity[0][..., [3, 2]], rtol=0, atol=1e-7))
+    with pytest.raises(ValueError):
+        eval_geometry_sensitivity_batch(manipulator_model, tensions, [(0, "orientationBF")])
+    with pytest.raises(ValueError):
+        eval_geometry_sensitivity_batch(manipulator_model, tensions, [(None, "curve_radius")])
+
+
+def test_resolve_from_last_changed_disk(manipulator_model, tensions):
+    plan = manipulator_model.compile()
+    joint_angles, contact_reactions = eval_manipulator_state_batch(manipulator_model, tensions, True)
+    n_joints = [c.n_joints for c in manipulator_model.segment_configs]
+    for segment_index, name in [(0, "curve_radius"), (1, "disk_length"), (2, "tendon_dist_from_axis"), (None, "outer_diameter")]:
+        value = getattr(manipulator_model if segment_index is None else manipulator_model.segment_configs[segment_index], name)
+        model = _perturb_geometry_parameter(manipulator_model, segment_index, name, value*1.1)
+        last_changed = _eval_last_changed_disk(plan, model.compile())
+        if segment_index is None:
+            assert(last_changed == -1)
+            continue
+        # The end disk of the segment, or the one before it for disk_length, as the end disk has end_disk_length
+        assert(last_changed == sum(n_joints[:segment_index+1]) - (1 if name == "disk_length" else 0))
+        assert(np.allclose(_resolve_joint_angles_batch(model.compile(), tensions, joint_angles, contact_reactions, last_changed),
+                           eval_manipulator_state_batch(model, tensions), rtol=0, atol=1e-12))
+
+
+def test_geometry_sensitivity_invalid_perturbation(manipulator_model, tensions):
+    configs = manipulator_model.segment_configs
+    # Curvature radius at the outer radius
+    configs[0] = SegmentMathConfig(**dict(vars(configs[0]), curve_radius=manipulator_model.outer_diameter/2))
+    model = ManipulatorMathModel(configs, manipulator_model.base_disk_length, manipulator_model.outer_diameter)
+    with pytest.raises(ValueError):
+        eval_geometry_sensitivity_batch(model, tensions, [(0, "curve_radius")])
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import threading
+
+import numpy as np
+
+from ..batch import *
+from ..server import *
+
+
+def test_solve_server_batches_concurrent_requests(manipulator_model, tensions, tmp_path):
+    async def _run():
+        server = SolveServer({"test": manipulator_model}, batch_window=0.05)
+        address = await server.start(str(tmp_path / "solve.sock"))
+
+        async def _request(connection, requests):
+            reader, writer = connection
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            return responses
+
+        # 2 connections of 10 solve requests each, within one batch window
+        connections = [await asyncio.open_unix_connection(address) for _ in range(2)]
+        requests = [{"id": k, "model": "test", "tensions": list(t)} for k, t in enumerate(tensions)]
+        responses = await asyncio.gather(_request(connections[0], requests[:10]), _request(connections[1], requests[10:]))
+        bad_responses = await _request(await asyncio.open_unix_connection(address),
+                                       [{"id": "a", "model": "other", "tensions": [0]},
+                                        {"id": "b", "model": "test", "tensions": [0]},
+                                        {"id": "c", "method": "metrics"}])
+        # Lines that are not JSON objects are answered too
+        reader, writer = await asyncio.open_unix_connection(address)
+        for line in (b"[1, 2]\n", b"3\n", b"{\n"):
+            writer.write(line)
+        await writer.drain()
+        invalid_responses = [json.loads(await reader.readline()) for _ in range(3)]
+        writer.close()
+        await server.close()
+        return responses, bad_responses, invalid_responses
+
+    responses, bad_responses, invalid_responses = asyncio.run(_run())
+    responses = sorted(responses[0] + responses[1], key=lambda r: r["id"])
+    jacobian = eval_manipulator_jacobian_batch(manipulator_model, tensions)
+    assert(np.allclose([r["joint_angles"] for r in responses], jacobian.joint_angles))
+    assert(np.allclose([r["tip_TF"] for r in responses], jacobian.tip_TF))
+    assert(all(r["batch_size"] == len(tensions) and r["latency"] > 0 for r in responses))
+
+    bad_responses = {r["id"]: r for r in bad_responses}
+    assert(bad_responses["a"]["error"].startswith("KeyError") and bad_responses["b"]["error"].startswith("ValueError"))
+    assert(all(r["id"] is None for r in invalid_responses))
+    assert(sorted(r["error"].split(":")[0] for r in invalid_responses) == ["JSONDecodeError", "ValueError", "ValueError"])
+    metrics = bad_responses["c"]["metrics"]
+    assert(metrics["n_requests"] == len(tensions) and metrics["n_batches"] == 1 and metrics["batch_size_max"] == len(tensions))
+
+
+def test_solve_client(manipulator_model, tensions):
+    server = SolveServer(max_batch_size=1)
+    loop = asyncio.new_event_loop()
+    address = loop.run_until_complete(server.start(("127.0.0.1", 0)))
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        with SolveClient(address, timeout=10) as client:
+            segment_configs = [{k: getattr(c, k) for k in ("is_2_DoF", "n_joints", "disk_length", "orientationBF", "curve_radius",
+                                                             "tendon_dist_from_axis", "end_disk_length")}
+                               for c in manipulator_model.segment_configs]
+            assert(client.register("test", segment_configs, base_disk_length=5, outer_diameter=5) == tensions.shape[1])
+            joint_angles, tip_TF = client.solve("test", tensions[0])
+            assert(client.metrics()["batch_size_max"] == 1)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    jacobian = eval_manipulator_jacobian_batch(manipulator_model, tensions[:1])
+    assert(np.allclose(joint_angles, jacobian.joint_angles[0]) and np.allclose(tip_TF, jacobian.tip_TF[0]))
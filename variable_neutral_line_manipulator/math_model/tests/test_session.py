@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..session import *
+from .conftest import to_tension_inputs
+
+
+@pytest.mark.parametrize("solver_type", [SolverType.BINARY, SolverType.NEWTON, SolverType.BRENT, SolverType.ILLINOIS])
+def test_solver_session_trajectory(manipulator_model, tensions, solver_type):
+    session = SolverSession(manipulator_model, solver_type, bracket_half_width=0.01)
+    n_warm_evaluations = n_cold_evaluations = 0
+    for k in range(20):
+        tension_inputs = to_tension_inputs(manipulator_model, tensions[0] + 0.05*k)
+        state = session.solve(tension_inputs)
+        assert(state is session.state)
+        
+        cold_state = eval_manipulator_state(manipulator_model, tension_inputs, solver_type)
+        assert(np.allclose([s.bottom_joint_angle for s in state.disk_states],
+                           [s.bottom_joint_angle for s in cold_state.disk_states], atol=1e-9))
+        if k > 0:
+            n_warm_evaluations += sum(s.n_evaluations for s in state.solver_stats)
+            n_cold_evaluations += sum(s.n_evaluations for s in cold_state.solver_stats)
+    if solver_type != SolverType.BINARY:
+        assert(n_warm_evaluations < n_cold_evaluations)
+
+
+def test_solver_session_root_outside_bracket(manipulator_model, tensions):
+    session = SolverSession(manipulator_model, SolverType.BRENT, bracket_half_width=1e-4)
+    session.solve(to_tension_inputs(manipulator_model, tensions[0]))
+    state = session.solve(to_tension_inputs(manipulator_model, tensions[1]))
+    direct_state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[1]), SolverType.DIRECT)
+    assert(np.allclose([s.bottom_joint_angle for s in state.disk_states],
+                       [s.bottom_joint_angle for s in direct_state.disk_states], atol=1e-9))
+
+
+@pytest.mark.parametrize("backend", [SolverBackend.NUMPY, SolverBackend.NUMBA])
+def test_solver_session_buffers(manipulator_model, tensions, backend):
+    session = SolverSession(manipulator_model, SolverType.BRENT, backend=backend)
+    joint_angles, contact_reactions = session.solve_joint_angles(tensions[0])
+    for k in range(10):
+        t = tensions[0] + 0.05*k
+        # Only the tendons of the last segment change
+        t[:-3] = tensions[0][:-3]
+        res = session.solve_joint_angles(t)
+        assert(res[0] is joint_angles and res[1] is contact_reactions)
+        expected_angles, expected_reactions = eval_joint_angles(manipulator_model, t, SolverType.DIRECT)
+        assert(np.allclose(joint_angles, expected_angles, rtol=0, atol=1e-9))
+        assert(np.allclose(contact_reactions, expected_reactions, rtol=0, atol=1e-6))
+
+    # Warm start of solve from solve_joint_angles and back
+    state = session.solve(to_tension_inputs(manipulator_model, tensions[1]))
+    assert(np.allclose([s.bottom_joint_angle for s in state.disk_states], eval_joint_angles(manipulator_model, tensions[1])[0], rtol=0, atol=1e-9))
+    assert(session.solve_joint_angles(tensions[2])[0] is joint_angles)
+    assert(session.state is None)
+    assert(np.allclose(joint_angles, eval_joint_angles(manipulator_model, tensions[2])[0], rtol=0, atol=1e-9))
+    with pytest.raises(ValueError):
+        session.solve_joint_angles(tensions[0][:-1])
@@ -0,0 +1,223 @@
+from math import pi
+
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..batch import *
+from ..inverse import solve_inverse
+from ..benchmark import create_model
+from .conftest import to_tension_inputs
+
+
+@pytest.mark.parametrize("solver_type", [SolverType.BINARY, SolverType.NEWTON, SolverType.BRENT, SolverType.ILLINOIS])
+def test_numerical_solvers_match_direct_solver(manipulator_model, tensions, solver_type):
+    for t in tensions[:5]:
+        tension_inputs = to_tension_inputs(manipulator_model, t)
+        direct_state = eval_manipulator_state(manipulator_model, tension_inputs, SolverType.DIRECT)
+        state = eval_manipulator_state(manipulator_model, tension_inputs, solver_type)
+        assert(np.allclose([s.bottom_joint_angle for s in state.disk_states],
+                           [s.bottom_joint_angle for s in direct_state.disk_states], atol=1e-9))
+        assert(np.allclose(state.get_TF(-1, "t", "bd"), direct_state.get_TF(-1, "t", "bd"), atol=1e-8))
+        assert(all(s.converged for s in state.solver_stats))
+
+
+def test_equation_newton_search():
+    # Newton steps from init=-1.4 overshoot the bracket and must fall back to bisection
+    x, res, _ = equation_newton_search(lambda x: (np.arctan(x - 0.3), 1/(1 + (x - 0.3)**2), "res"), lower=-pi/2, upper=pi/2, init=-1.4)
+    assert(abs(x - 0.3) < 1e-9)
+    assert(res == "res")
+    
+    # Decreasing function
+    x, _, _ = equation_newton_search(lambda x: (0.2 - x**3, -3*x**2, None), lower=-pi/2, upper=pi/2)
+    assert(abs(x**3 - 0.2) < 1e-9)
+    
+    assert(equation_newton_search(lambda x: (x**2 + 1, 2*x, None), lower=-1, upper=1) is None)
+
+
+@pytest.mark.parametrize("search", [equation_binary_search, equation_brent_search, equation_illinois_search])
+def test_bracketed_searches(search):
+    x, res, stats = search(lambda x: (np.arctan(x - 0.3), x), lower=-pi/2, upper=pi/2, init=-1.4)
+    assert(abs(x - 0.3) < 1e-9)
+    assert(res == x)
+    assert(stats.converged)
+    assert(stats.n_evaluations >= stats.n_iterations + 2)
+    
+    # Decreasing function
+    x, _, _ = search(lambda x: (0.2 - x**3, None), lower=-pi/2, upper=pi/2)
+    assert(abs(x**3 - 0.2) < 1e-9)
+    
+    assert(search(lambda x: (x**2 + 1, None), lower=-1, upper=1) is None)
+
+
+@pytest.mark.parametrize("search", [equation_binary_search, equation_brent_search, equation_illinois_search])
+def test_bracketed_searches_limits(search):
+    # Flat residual which never satisfies the y threshold
+    x, _, stats = search(lambda x: (np.sign(x - 0.3), None), lower=-pi/2, upper=pi/2, threshold=0)
+    assert(abs(x - 0.3) < 1e-9)
+    assert(stats.n_iterations <= 100)
+    
+    _, _, stats = search(lambda x: (np.sign(x - 0.3), None), lower=-pi/2, upper=pi/2, threshold=0, max_iterations=5)
+    assert(not stats.converged)
+    assert(stats.n_iterations == 5)
+
+
+@pytest.mark.parametrize("solver_type", [SolverType.DIRECT, SolverType.BRENT])
+def test_eval_manipulator_state_incremental(manipulator_model, tensions, solver_type):
+    plan = manipulator_model.compile()
+    previous_state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[0]), solver_type)
+    
+    # Change the tensions of the first segment only
+    t = tensions[0].copy()
+    t[:plan.knob_ends[4]] = tensions[1][:plan.knob_ends[4]]
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), solver_type, previous_state=previous_state)
+    full_state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), solver_type)
+    assert(np.allclose([s.bottom_joint_angle for s in state.disk_states],
+                       [s.bottom_joint_angle for s in full_state.disk_states], atol=1e-9))
+    assert(all(s is p for s, p in zip(state.disk_states[4:], previous_state.disk_states[4:])))
+    assert(all(s is not p for s, p in zip(state.disk_states[:4], previous_state.disk_states[:4])))
+    
+    # Unchanged tensions
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), solver_type, previous_state=full_state)
+    assert(all(s is p for s, p in zip(state.disk_states, full_state.disk_states)))
+    
+    # Previous state of another generation is ignored
+    manipulator_model.update(outer_diameter=4)
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), solver_type, previous_state=full_state)
+    assert(all(s is not p for s, p in zip(state.disk_states, full_state.disk_states)))
+
+
+def test_eval_manipulator_state_many_disks():
+    model = create_model(600)
+    tensions = np.random.RandomState(0).uniform(0, 1, len(model.tendons))
+    state = eval_manipulator_state(model, [list(tensions[:4]), list(tensions[4:])], SolverType.DIRECT)
+    assert(len(state.disk_states) == 600)
+    assert(np.allclose([s.bottom_joint_angle for s in state.disk_states], eval_manipulator_state_batch(model, tensions)[0]))
+    assert(np.allclose(state.get_TF(-1, "t", "bd"), eval_manipulator_jacobian_batch(model, tensions).tip_TF[0]))
+
+
+def test_manipulator_state_TFs(manipulator_model, tensions):
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[0]), SolverType.DIRECT)
+    disks = manipulator_model.disks
+    assert(state.TFs.shape == (len(disks), 3, 3, 4, 4))
+    for i, (d, tf) in enumerate(zip(disks, state.TFs_DF)):
+        for side, length in (("b", 0), ("c", d.length/2), ("t", d.length)):
+            side_tf = np.matmul(tf, m4MatrixTranslation((0, 0, length)))
+            for frame_sys, orientation_change in (("bd", -d.bottom_orientationBF), ("bc", 0), ("tc", d.top_orientationBF - d.bottom_orientationBF)):
+                assert(np.allclose(state.get_TF(i, side, frame_sys), np.matmul(side_tf, m4MatrixRotation((0, 0, 1.0), orientation_change))))
+    for side, frame_sys in (("x", "bd"), ("b", "x")):
+        with pytest.raises(AttributeError):
+            state.get_TF(0, side, frame_sys)
+
+
+def test_disk_states_share_tensions(manipulator_model, tensions):
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[0]), SolverType.DIRECT)
+    tendons = manipulator_model.tendons
+    for i, s in enumerate(state.disk_states, 1):
+        assert(s.tensions is state.tensions)
+        active = [k for k, t in enumerate(tendons) if t.n_joints >= i]
+        assert(np.array_equal(s.tensions_in_disk, state.tensions[active]))
+        assert([t.tension_in_disk for t in s.tendon_states] == list(state.tensions[active]))
+        assert([t.is_knob for t in s.tendon_states] == [tendons[k].n_joints == i for k in active])
+        assert(not any(t.is_knob for t in s.marked_unknobbed_tendon_states))
+        if i > 1:
+            assert(np.allclose(s.eval_proximal_disk_top_components(manipulator_model.disks[i-1]),
+                               eval_proximal_disk_top_components(manipulator_model.compile(), i, state.tensions, s.bottom_joint_angle, 
+                                                                 s.bottom_contact_reactionDF.flat_total)))
+
+
+def test_closed_form_components(manipulator_model, tensions):
+    from ..solver import _eval_equilibrium_coefficients
+    plan = manipulator_model.compile()
+    disks = manipulator_model.disks
+    tendons = manipulator_model.tendons
+    rng = np.random.RandomState(1)
+    for i in range(2, plan.n_disks):
+        top_vec = rng.uniform(-5, 5, 6)
+        contact = rng.uniform(-5, 5, 6)
+        angle = rng.uniform(-1, 1)
+        active = range(plan.tendon_starts[i], plan.n_tendons)
+        
+        # Per tendon sums, as before the closed forms
+        bottom_vec = np.zeros(6)
+        top_components = np.concatenate((distalToProximalFrame(contact[:3], angle, plan.top_orientationsDF[i-1]), 
+                                         distalToProximalFrame(contact[3:], angle, plan.top_orientationsDF[i-1])))
+        for k in active:
+            t = tendons[k]
+            bottom_vec += ForceMomentVec(evalBottomGuideForce(tensions[0, k], angle),
+                                         evalBottomGuideEndDisp(disks[i].length, disks[i].bottom_curve_radius, t.dist_from_axis, 
+                                                                t.orientationBF - disks[i].bottom_orientationBF)).flat_total
+            top_components += ForceMomentVec(evalTopGuideForce(tensions[0, k], angle, plan.top_orientationsDF[i-1]),
+                                             evalTopGuideEndDisp(disks[i-1].length, disks[i].bottom_curve_radius, t.dist_from_axis, 
+                                                                 t.orientationBF - disks[i-1].bottom_orientationBF, plan.top_orientationsDF[i-1])).flat_total
+        sum_comp = top_vec + bottom_vec
+        pure_moment = -sum_comp[3:] + np.cross(evalBottomContactDisp(disks[i].length, disks[i].bottom_curve_radius, angle), sum_comp[:3])
+        
+        assert(np.allclose(eval_bottom_tendon_components(plan, i, tensions[0], angle), bottom_vec))
+        P, Q, R = _eval_equilibrium_coefficients(plan, i, eval_bottom_guide_weights(plan, i, tensions[0]), top_vec)
+        assert(np.isclose(-(P*np.sin(angle/2) + Q*np.cos(angle/2) + R), pure_moment[0]))
+        assert(np.allclose(eval_proximal_disk_top_components(plan, i, tensions[0], angle, contact), top_components))
+
+
+def _with_friction(manipulator_model, friction_coefficient):
+    return ManipulatorMathModel([SegmentMathConfig(**dict(vars(c), friction_coefficient=friction_coefficient)) for c in manipulator_model.segment_configs],
+                                base_disk_length=manipulator_model.base_disk_length, outer_diameter=manipulator_model.outer_diameter)
+
+
+def test_friction(manipulator_model, tensions):
+    model = _with_friction(manipulator_model, 0.3)
+    plan = model.compile()
+    for t in tensions[:3]:
+        tension_inputs = to_tension_inputs(model, t)
+        frictionless_state = eval_manipulator_state(manipulator_model, tension_inputs, SolverType.DIRECT)
+        assert(frictionless_state.fixed_point_stats is None)
+        assert(np.allclose(eval_manipulator_state(_with_friction(manipulator_model, 0.0), tension_inputs, SolverType.DIRECT).TFs, 
+                           frictionless_state.TFs))
+        
+        state = eval_manipulator_state(model, tension_inputs, SolverType.DIRECT)
+        assert(state.fixed_point_stats.converged)
+        joint_angles = np.array([s.bottom_joint_angle for s in state.disk_states])
+        assert(np.sum(np.abs(joint_angles)) < np.sum(np.abs([s.bottom_joint_angle for s in frictionless_state.disk_states])))
+        
+        # Joint angles are in equilibrium with the span tensions they determine
+        span_tensions = eval_span_tensions(plan, t, joint_angles)
+        assert(np.allclose(span_tensions[0], t))
+        for s, span in zip(state.disk_states, span_tensions[1:]):
+            assert(np.allclose(s.tensions_in_disk, span[s.tendon_start:]))
+        resolved = np.zeros(plan.n_disks-1)
+        from ..solver import _solve_statics
+        assert(_solve_statics(plan, span_tensions, SolverType.DIRECT, resolved, np.zeros((plan.n_disks-1, 6)), None, plan.n_disks-1, np.zeros(6)))
+        assert(np.allclose(resolved, joint_angles, rtol=0, atol=1e-9))
+        
+        for solver_type, backend in ((SolverType.DIRECT, SolverBackend.NUMBA), (SolverType.BRENT, SolverBackend.NUMPY)):
+            other_angles, _ = eval_joint_angles(model, t, solver_type, backend=backend)
+            assert(np.allclose(other_angles, joint_angles, rtol=0, atol=1e-8))
+    
+    state = eval_manipulator_state(model, to_tension_inputs(model, tensions[0]), SolverType.DIRECT, max_fixed_point_iterations=2)
+    assert(not state.fixed_point_stats.converged and state.fixed_point_stats.n_iterations == 2)
+    with pytest.raises(NotImplementedError):
+        eval_manipulator_state_batch(model, tensions)
+    with pytest.raises(NotImplementedError):
+        eval_manipulator_jacobian_batch(model, tensions)
+    with pytest.raises(NotImplementedError):
+        eval_manipulator_state_with_jacobian(model, to_tension_inputs(model, tensions[0]))
+    with pytest.raises(NotImplementedError):
+        solve_inverse(model, np.identity(4))
+
+
+@pytest.mark.parametrize("backend", [SolverBackend.NUMPY, SolverBackend.NUMBA])
+def test_tip_pose_only(manipulator_model, tensions, backend):
+    plan = manipulator_model.compile()
+    for model in (manipulator_model, _with_friction(manipulator_model, 0.3)):
+        for t in tensions[:3]:
+            tension_inputs = to_tension_inputs(model, t)
+            state = eval_manipulator_state(model, tension_inputs, SolverType.DIRECT)
+            tip_TF = eval_manipulator_state(model, tension_inputs, SolverType.DIRECT, backend=backend, tip_pose_only=True)
+            assert(tip_TF.shape == (4, 4))
+            assert(np.allclose(tip_TF, state.get_TF(-1, "t", "bd"), rtol=0, atol=1e-12))
+    
+    joint_angles = eval_manipulator_state_batch(manipulator_model, tensions)
+    tip_TFs = eval_tip_TF(plan, joint_angles.reshape(4, 5, -1), backend)
+    assert(tip_TFs.shape == (4, 5, 4, 4))
+    end_TF = m4MatrixTranslation((0, 0, plan.lengths[-1])) @ m4MatrixRotation((0, 0, 1.0), -plan.bottom_orientationsBF[-1])
+    assert(np.allclose(tip_TFs.reshape(-1, 4, 4), [eval_TFs_DF(plan, a)[-1] @ end_TF for a in joint_angles], rtol=0, atol=1e-12))
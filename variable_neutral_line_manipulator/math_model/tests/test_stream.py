@@ -0,0 +1,45 @@
+import io
+
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..batch import *
+from ..stream import *
+from .conftest import to_tension_inputs
+
+
+@pytest.mark.parametrize("solver_type", [SolverType.DIRECT, SolverType.BRENT])
+def test_iter_states(manipulator_model, tensions, solver_type):
+    consumed = []
+
+    def _source():
+        for t in tensions:
+            consumed.append(t)
+            yield t
+
+    results = iter_states(manipulator_model, _source(), outputs=(StateOutput.JOINT_ANGLES,),
+                          solver_type=solver_type, chunk_size=6)
+    next(results)
+    # Reads a chunk ahead only
+    assert(len(consumed) == 6)
+
+    results = list(iter_states(manipulator_model, tensions, outputs=(StateOutput.TENSIONS, StateOutput.JOINT_ANGLES, StateOutput.TIP_TF,
+                                                                     StateOutput.COMPACT_STATE), solver_type=solver_type, chunk_size=6))
+    jacobian = eval_manipulator_jacobian_batch(manipulator_model, tensions)
+    assert(np.array_equal([r[StateOutput.TENSIONS] for r in results], tensions))
+    assert(np.allclose([r[StateOutput.JOINT_ANGLES] for r in results], jacobian.joint_angles, rtol=0, atol=1e-9))
+    assert(np.allclose([r[StateOutput.TIP_TF] for r in results], jacobian.tip_TF, rtol=0, atol=1e-9))
+    state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[-1]), solver_type)
+    compact_state = results[-1][StateOutput.COMPACT_STATE]
+    assert(np.allclose(compact_state.bottom_contact_reactionsDF, [s.bottom_contact_reactionDF.flat_total for s in state.disk_states]))
+    assert((compact_state.solver_stats is None) == (solver_type == SolverType.DIRECT))
+
+
+def test_iter_states_inputs(manipulator_model, tensions):
+    log = io.StringIO("# tensions\n" + "\n".join(",".join(map(repr, t)) for t in tensions[:4]) + "\n\n")
+    from_file = [r[StateOutput.TIP_TF] for r in iter_states(manipulator_model, read_tensions(log))]
+    nested = [r[StateOutput.TIP_TF] for r in iter_states(manipulator_model, (to_tension_inputs(manipulator_model, t) for t in tensions[:4]))]
+    assert(len(from_file) == 4 and np.allclose(from_file, nested))
+    with pytest.raises(ValueError):
+        next(iter_states(manipulator_model, tensions, outputs=("tip",)))
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from ..solver import *
+from ..batch import *
+from ..sweep import *
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("solver_type,backend", [(SolverType.DIRECT, SolverBackend.NUMPY), (SolverType.DIRECT, SolverBackend.NUMBA),
+                                                 (SolverType.BRENT, SolverBackend.NUMBA)])
+def test_sweep(manipulator_model, tensions, workers, solver_type, backend):
+    progress = []
+    result = sweep(manipulator_model, tensions, workers=workers, chunksize=6, solver_type=solver_type, backend=backend,
+                   progress=lambda n_solved, n_samples: progress.append((n_solved, n_samples)))
+    jacobian = eval_manipulator_jacobian_batch(manipulator_model, tensions)
+    assert(np.allclose(result.joint_angles, jacobian.joint_angles, rtol=0, atol=1e-9))
+    assert(np.allclose(result.tip_TFs, jacobian.tip_TF, rtol=0, atol=1e-9))
+    assert(np.all(result.is_solved))
+    # Chunks of 6, 6, 6 and 2 samples, completed in any order
+    assert(len(progress) == 4 and progress[-1] == (len(tensions), len(tensions)))
+    assert(all(n_samples == len(tensions) for _, n_samples in progress))
+    assert(np.all(np.diff([n_solved for n_solved, _ in progress]) > 0))
+
+
+def test_sweep_tension_chunks(manipulator_model, tensions):
+    result = sweep(manipulator_model, (tensions[start:start+7] for start in range(0, len(tensions), 7)), workers=1)
+    assert(np.array_equal(result.tensions, tensions))
+    assert(np.allclose(result.tip_TFs, sweep(manipulator_model, tensions, workers=1).tip_TFs))
+    with pytest.raises(ValueError):
+        sweep(manipulator_model, tensions[:, 1:], workers=1)
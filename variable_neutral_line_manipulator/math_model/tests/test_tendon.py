@@ -0,0 +1,66 @@
+import numpy as np
+
+from ..solver import *
+from ..batch import *
+from ..compact import *
+from ..tendon import *
+from .conftest import to_tension_inputs
+
+
+def test_tendon_lengths_match_guide_ends(manipulator_model, tensions):
+    plan = manipulator_model.compile()
+    disks = manipulator_model.disks
+    tendons = manipulator_model.tendons
+    for t in tensions[:3]:
+        state = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, t), SolverType.DIRECT)
+        
+        # Straight guides between the guide ends located by the transformations of the disks
+        expected = np.zeros(len(tendons))
+        for k, tendon in enumerate(tendons):
+            orientationDF = tendon.orientationBF - disks[0].bottom_orientationBF
+            points = [np.array((tendon.dist_from_axis*np.cos(orientationDF), tendon.dist_from_axis*np.sin(orientationDF), 0, 1))]
+            for i in range(tendon.n_joints + 1):
+                d = disks[i]
+                orientationDF = tendon.orientationBF - d.bottom_orientationBF
+                if i > 0:
+                    disp = evalBottomGuideEndDisp(d.length, d.bottom_curve_radius, tendon.dist_from_axis, orientationDF)
+                    points.append(np.matmul(state.TFs_DF[i], np.append(disp + (0, 0, d.length/2), 1)))
+                if i < len(disks) - 1:
+                    disp = evalTopGuideEndDisp(d.length, disks[i+1].bottom_curve_radius, tendon.dist_from_axis, orientationDF, 
+                                               d.top_orientationBF - d.bottom_orientationBF)
+                else:
+                    disp = (tendon.dist_from_axis*np.cos(orientationDF), tendon.dist_from_axis*np.sin(orientationDF), d.length/2)
+                points.append(np.matmul(state.TFs_DF[i], np.append(np.add(disp, (0, 0, d.length/2)), 1)))
+            expected[k] = np.sum(np.linalg.norm(np.diff(points, axis=0)[:, :3], axis=1))
+        
+        lengths = eval_tendon_lengths(manipulator_model, state.bottom_joint_angles)
+        assert(lengths.shape == (len(tendons),))
+        assert(np.allclose(lengths, expected))
+        assert(np.allclose(eval_tendon_displacements(manipulator_model, state.bottom_joint_angles),
+                           eval_tendon_lengths(manipulator_model, np.zeros(plan.n_disks-1)) - lengths))
+
+
+def test_tendon_lengths_batch(manipulator_model, tensions):
+    joint_angles = eval_manipulator_state_batch(manipulator_model, tensions)
+    lengths = eval_tendon_lengths(manipulator_model, joint_angles)
+    assert(lengths.shape == (len(tensions), len(manipulator_model.tendons)))
+    assert(np.allclose(lengths, [eval_tendon_lengths(manipulator_model, a) for a in joint_angles]))
+    
+    states = eval_compact_manipulator_states(manipulator_model, tensions[:4])
+    states[0] = eval_manipulator_state(manipulator_model, to_tension_inputs(manipulator_model, tensions[0]), SolverType.DIRECT)
+    assert(np.allclose(stack_joint_angles(states), joint_angles[:4]))
+    assert(eval_tendon_displacements(manipulator_model, stack_joint_angles(states)).shape == (4, len(manipulator_model.tendons)))
+
+
+def test_tendon_displacements_1_DoF():
+    # As the 1-DoF extension of the MATLAB scripts, with the tendon pair at curvature angle 2*asin(d/r)
+    r, d, n = 3, 1, 4
+    model = ManipulatorMathModel([SegmentMathConfig(is_2_DoF=False, n_joints=n, disk_length=5, orientationBF=0, curve_radius=r, 
+                                                    tendon_dist_from_axis=d, end_disk_length=5)], base_disk_length=5, outer_diameter=5)
+    half_curvature_angle = np.arcsin(d/r)
+    bending_angle = 0.8
+    extensions = 2*n*r*(np.cos(half_curvature_angle) - np.cos(half_curvature_angle + np.array((-1, 1))*bending_angle/n/2))
+    displacements = eval_tendon_displacements(model, np.full(n, bending_angle/n))
+    orientations = [t.orientationBF for t in model.tendons]
+    assert(np.allclose(sorted(-displacements), sorted(extensions)))
+    assert(np.isclose(np.sin(orientations[np.argmax(displacements)]), -1))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from ..batch import *
+from ..workspace import *
+
+
+@pytest.mark.parametrize("sampling_type", [SamplingType.LATIN_HYPERCUBE, SamplingType.SOBOL])
+def test_sample_tensions_stratified(sampling_type):
+    n_samples = 256
+    tensions = sample_tensions(6, (1.0, 5.0), n_samples, sampling_type, seed=0)
+    assert(tensions.shape == (n_samples, 6))
+    # Every axis has exactly one sample in each of the n_samples strata
+    for k in range(6):
+        assert(np.array_equal(np.sort(np.floor((tensions[:, k] - 1.0)/4.0*n_samples)), np.arange(n_samples)))
+
+
+@pytest.mark.parametrize("sampling_type", [SamplingType.GRID, SamplingType.LATIN_HYPERCUBE, SamplingType.SOBOL])
+def test_sample_tensions_chunks(sampling_type):
+    tensions = sample_tensions(4, (0.0, 10.0), 1000, sampling_type, seed=1)
+    chunks = [sample_tensions(4, (0.0, 10.0), 1000, sampling_type, seed=1, start=start, stop=start + 300)
+              for start in range(0, len(tensions), 300)]
+    assert(np.array_equal(tensions, np.concatenate(chunks)))
+
+
+def test_sample_tensions_grid():
+    tensions = sample_tensions(3, (0.0, (1.0, 2.0, 3.0)), 1000, SamplingType.GRID)
+    assert(tensions.shape == (1000, 3))
+    assert(np.allclose(tensions.min(axis=0), 0.0) and np.allclose(tensions.max(axis=0), (1.0, 2.0, 3.0)))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sample_workspace(manipulator_model, workers):
+    workspace = sample_workspace(manipulator_model, (0.0, 10.0), 500, SamplingType.SOBOL, seed=0, with_orientations=True,
+                                 workers=workers, memory_budget=2**24)
+    tensions = sample_tensions(len(manipulator_model.tendons), (0.0, 10.0), 500, SamplingType.SOBOL, seed=0)
+    tip_TFs = eval_manipulator_jacobian_batch(manipulator_model, tensions).tip_TF
+    assert(np.allclose(workspace.tip_positions, tip_TFs[:, :3, 3]))
+    assert(np.allclose(workspace.tip_orientations, tip_TFs[:, :3, :3]))
+
+    assert(workspace.voxel_counts.sum() == 500)
+    voxels = np.floor((workspace.tip_positions - workspace.voxel_origin)/workspace.voxel_size).astype(int)
+    assert(np.array_equal(np.argwhere(workspace.occupancy), np.unique(voxels, axis=0)))
+
+
+def test_sample_workspace_memory_budget(manipulator_model):
+    with pytest.raises(ValueError):
+        sample_workspace(manipulator_model, (0.0, 10.0), 10**7, memory_budget=2**20)
+    workspace = sample_workspace(manipulator_model, (0.0, 10.0), 2000, with_positions=False, workers=1, memory_budget=2**24)
+    assert(workspace.tip_positions is None and workspace.voxel_counts.sum() == 2000)
@@ -0,0 +1,290 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from .models import *
+from .plan import *
+from .solver import eval_tip_TF
+from .batch import _eval_joint_angles_batch
+
+
+class SamplingType:
+    GRID="grid"
+    LATIN_HYPERCUBE="Latin hypercube"
+    SOBOL="Sobol"
+
+
+# Primitive polynomials (degree s, coefficients a) and initial direction numbers m of Sobol sequence (Joe & Kuo), from the 2nd dimension
+_SOBOL_POLYNOMIALS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+_SOBOL_BITS = 32
+SOBOL_MAX_DIMENSION = len(_SOBOL_POLYNOMIALS) + 1
+
+
+def _eval_sobol_directions(dimension):
+    """
+        (dimension, 32) direction numbers of Sobol sequence, scaled to 32-bit integers
+    """
+    if dimension > SOBOL_MAX_DIMENSION:
+        raise ValueError(f"Sobol sampling supports up to {SOBOL_MAX_DIMENSION} tendons, but got {dimension}")
+    directions = np.zeros((dimension, _SOBOL_BITS), dtype=np.uint64)
+    directions[0] = [1 << (_SOBOL_BITS - 1 - k) for k in range(_SOBOL_BITS)]
+    for d in range(1, dimension):
+        s, a, m = _SOBOL_POLYNOMIALS[d-1]
+        v = [m[k] << (_SOBOL_BITS - 1 - k) for k in range(s)]
+        for k in range(s, _SOBOL_BITS):
+            value = v[k-s] ^ (v[k-s] >> s)
+            for j in range(1, s):
+                if (a >> (s - 1 - j)) & 1:
+                    value ^= v[k-j]
+            v.append(value)
+        directions[d] = v
+    return directions
+
+
+def _hash(x: np.ndarray, key):
+    """
+        Mix 64-bit integers with a key (splitmix64 finalizer), for index-addressable random numbers
+    """
+    x = (x ^ np.uint64(key))*np.uint64(0xbf58476d1ce4e5b9)
+    x = (x ^ (x >> np.uint64(31)))*np.uint64(0x94d049bb133111eb)
+    return x ^ (x >> np.uint64(29))
+
+
+def _permute(indices: np.ndarray, n, keys):
+    """
+        Random permutation of [0, n) evaluated at indices, by a Feistel network with cycle walking,
+        so that any chunk of a permutation is evaluated without holding the whole permutation
+    """
+    half_bits = max((int(n) - 1).bit_length() + 1, 2)//2
+    mask = np.uint64((1 << half_bits) - 1)
+
+    def _feistel(x):
+        left, right = x >> np.uint64(half_bits), x & mask
+        for key in keys:
+            left, right = right, left ^ (_hash(right, key) & mask)
+        return (left << np.uint64(half_bits)) | right
+
+    permuted = _feistel(indices)
+    is_outside = permuted >= np.uint64(n)
+    while np.any(is_outside):
+        permuted[is_outside] = _feistel(permuted[is_outside])
+        is_outside = permuted >= np.uint64(n)
+    return permuted
+
+
+def _eval_grid_shape(n_samples, dimension):
+    """
+        Number of grid points on each tendon axis, being the largest with at most n_samples points in total (at least 1)
+    """
+    n_points = max(int(round(n_samples**(1/dimension))), 1)
+    while n_points**dimension > n_samples and n_points > 1:
+        n_points -= 1
+    return (n_points,)*dimension
+
+
+def _eval_n_samples(sampling_type, n_samples, dimension):
+    if sampling_type == SamplingType.GRID:
+        return int(np.prod(_eval_grid_shape(n_samples, dimension)))
+    return n_samples
+
+
+def _eval_unit_samples(sampling_type, start, stop, n_samples, dimension, seed):
+    """
+        Samples [start, stop) of the sampling sequence in the unit hypercube, as (stop - start, dimension) array
+        Each sample depends only on its index, so chunks are evaluated independently
+    """
+    indices = np.arange(start, stop, dtype=np.uint64)
+    if sampling_type == SamplingType.GRID:
+        shape = _eval_grid_shape(n_samples, dimension)
+        coords = np.stack(np.unravel_index(indices.astype(np.int64), shape), axis=1).astype(float)
+        return coords/np.maximum(np.array(shape) - 1, 1)
+
+    keys = np.random.RandomState(seed).randint(0, 2**62, size=(dimension, 5), dtype=np.int64)
+    if sampling_type == SamplingType.LATIN_HYPERCUBE:
+        # One sample in each of the n_samples strata of every axis, at a random position in the stratum
+        samples = np.zeros((len(indices), dimension))
+        for d in range(dimension):
+            strata = _permute(indices, n_samples, keys[d, :4])
+            offsets = (_hash(indices, keys[d, 4]) >> np.uint64(11)).astype(float)/2.0**53
+            samples[:, d] = (strata.astype(float) + offsets)/n_samples
+        return samples
+
+    if sampling_type == SamplingType.SOBOL:
+        directions = _eval_sobol_directions(dimension)
+        samples = np.zeros((len(indices), dimension), dtype=np.uint64)
+        for k in range(_SOBOL_BITS):
+            has_bit = ((indices >> np.uint64(k)) & np.uint64(1)).astype(bool)
+            samples[has_bit] ^= directions[:, k]
+        if seed is not None:
+            # Random digital shift
+            samples ^= (keys[:, 0] & ((1 << _SOBOL_BITS) - 1)).astype(np.uint64)
+        return samples.astype(float)/2.0**_SOBOL_BITS
+
+    raise ValueError(f"Unknown sampling type {sampling_type}")
+
+
+def sample_tensions(n_tendons, bounds, n_samples, sampling_type=SamplingType.SOBOL, seed=None, start=0, stop=None):
+    """
+        Tensions indexed by tendon sampled within bounds, as (N, n_tendons) array
+        bounds: (lower, upper) tension bounds, each either a scalar or an array indexed by tendon
+        n_samples: number of samples. For SamplingType.GRID, the grid has the largest equal number of points on each axis within n_samples
+        seed: random seed of Latin hypercube, and of the digital shift of Sobol sequence (unshifted if None)
+        start, stop: evaluate only the samples [start, stop) of the sequence
+    """
+    lower = np.broadcast_to(np.asarray(bounds[0], dtype=float), (n_tendons,))
+    upper = np.broadcast_to(np.asarray(bounds[1], dtype=float), (n_tendons,))
+    n_samples = _eval_n_samples(sampling_type, n_samples, n_tendons)
+    stop = n_samples if stop is None else min(stop, n_samples)
+    return lower + (upper - lower)*_eval_unit_samples(sampling_type, start, stop, n_samples, n_tendons, seed)
+
+
+class Workspace:
+    """
+        Sampled tip poses (top of end disk, base-disk-orientation) of a manipulator,
+        and the occupancy of a voxel grid with origin at the corner of voxel (0, 0, 0)
+    """
+    def __init__(self, n_samples, tip_positions, tip_orientations, voxel_counts, voxel_origin, voxel_size):
+        self.n_samples = n_samples
+        self.tip_positions = tip_positions          # (N, 3) or None
+        self.tip_orientations = tip_orientations    # (N, 3, 3) or None
+        self.voxel_counts = voxel_counts            # (nx, ny, nz) numbers of samples in voxels
+        self.voxel_origin = voxel_origin
+        self.voxel_size = voxel_size
+
+    @property
+    def occupancy(self):
+        return self.voxel_counts > 0
+
+    @property
+    def occupied_voxel_centers(self):
+        return self.voxel_origin + (np.argwhere(self.occupancy) + 0.5)*self.voxel_size
+
+    def __repr__(self):
+        return f"<Workspace> [samples={self.n_samples}, voxels={self.voxel_counts.shape}, occupied={np.count_nonzero(self.voxel_counts)}]"
+
+
+def _sample_workspace_chunk(plan: SolvePlan, bounds, n_samples, sampling_type, seed, start, stop,
+                            voxel_origin, voxel_size, voxel_shape, with_orientations):
+    """
+        Solve samples [start, stop) and count them in the voxels
+        return tip positions, tip orientations (None if not with_orientations),
+               flat indices of voxels hit and their counts
+    """
+    tensions = sample_tensions(plan.n_tendons, bounds, n_samples, sampling_type, seed, start, stop)
+    tip_TFs = eval_tip_TF(plan, _eval_joint_angles_batch(plan, tensions))
+    positions = tip_TFs[:, :3, 3]
+
+    voxel_indices = np.floor((positions - voxel_origin)/voxel_size).astype(np.int64)
+    is_inside = np.all((voxel_indices >= 0) & (voxel_indices < voxel_shape), axis=1)
+    voxels, counts = np.unique(np.ravel_multi_index(voxel_indices[is_inside].T, voxel_shape), return_counts=True)
+    return positions, tip_TFs[:, :3, :3] if with_orientations else None, voxels, counts
+
+
+# Context of a workspace worker process, set once by _init_workspace_worker
+_worker_context = {}
+
+
+def _init_workspace_worker(plan: SolvePlan, chunk_args, voxel_args):
+    _worker_context.update(plan=plan, chunk_args=chunk_args, voxel_args=voxel_args)
+
+
+def _workspace_worker_chunk(start, stop):
+    return _sample_workspace_chunk(_worker_context["plan"], *_worker_context["chunk_args"], start, stop, *_worker_context["voxel_args"])
+
+
+def sample_workspace(manipulator_model: ManipulatorMathModel, bounds, n_samples, sampling_type=SamplingType.SOBOL, seed=None,
+                     voxel_size=None, voxel_bounds=None, with_positions=True, with_orientations=False,
+                     workers=None, memory_budget=2**30) -> Workspace:
+    """
+        Sample the tip poses of tensions within bounds (see sample_tensions) with the direct solver,
+        in chunks solved across a process pool
+        voxel_size: edge length of voxels. Defaults to 1/50 of the total length of the manipulator
+        voxel_bounds: ((x, y, z) lower, (x, y, z) upper) corners of the voxel grid. Defaults to a cube enclosing any reachable tip position
+                      Samples outside are not counted
+        with_positions, with_orientations: keep the tip positions (N, 3) and tip rotation matrices (N, 3, 3) of all samples.
+                                           Set both to False to keep only the voxel counts for a large number of samples
+        workers: number of processes, defaults to the number of CPUs. Solve in the calling process if workers <= 1
+        memory_budget: bytes for the results and the chunks in flight
+    """
+    plan = manipulator_model.compile()
+    if plan is None:
+        return None
+
+    n_samples = _eval_n_samples(sampling_type, n_samples, plan.n_tendons)
+    workers = os.cpu_count() if workers is None else workers
+
+    # Voxel grid
+    total_length = np.sum(plan.lengths)
+    if voxel_size is None:
+        voxel_size = total_length/50
+    if voxel_bounds is None:
+        # Padded to include the tip of straight manipulator at the boundary
+        reach = total_length + voxel_size
+        voxel_bounds = ((-reach, -reach, -reach), (reach, reach, reach))
+    voxel_origin = np.asarray(voxel_bounds[0], dtype=float)
+    voxel_shape = tuple(np.maximum(np.ceil((np.asarray(voxel_bounds[1], dtype=float) - voxel_origin)/voxel_size), 1).astype(int))
+
+    # Memory: results, then working arrays of chunks in flight (tensions, joint angles, solver intermediates and TFs of each sample)
+    result_bytes = (n_samples*(3*with_positions + 9*with_orientations) + np.prod(voxel_shape))*8
+    if result_bytes >= memory_budget:
+        raise ValueError(f"Results of {n_samples} samples take {result_bytes} bytes, exceeding the memory budget of {memory_budget} bytes")
+    n_chunks_in_flight = 2*max(workers, 1)
+    sample_bytes = (2*plan.n_tendons + plan.n_disks + 12*9 + 16*4)*8
+    chunk_size = int(max(min((memory_budget - result_bytes)//(n_chunks_in_flight*sample_bytes), n_samples), 1))
+
+    tip_positions = np.zeros((n_samples, 3)) if with_positions else None
+    tip_orientations = np.zeros((n_samples, 3, 3)) if with_orientations else None
+    voxel_counts = np.zeros(voxel_shape, dtype=np.int64)
+
+    def _collect(start, result):
+        positions, orientations, voxels, counts = result
+        if with_positions:
+            tip_positions[start:start+len(positions)] = positions
+        if with_orientations:
+            tip_orientations[start:start+len(positions)] = orientations
+        voxel_counts.ravel()[voxels] += counts
+
+    chunk_args = (bounds, n_samples, sampling_type, seed)
+    voxel_args = (voxel_origin, voxel_size, voxel_shape, with_orientations)
+    starts = range(0, n_samples, chunk_size)
+    if workers <= 1:
+        for start in starts:
+            _collect(start, _sample_workspace_chunk(plan, *chunk_args, start, start + chunk_size, *voxel_args))
+    else:
+        # The plan is sent to each worker once, so only chunk bounds are passed per chunk
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_workspace_worker,
+                                 initargs=(plan, chunk_args, voxel_args)) as executor:
+            # Submit lazily to bound the number of chunks in flight
+            futures = {}
+            for start in starts:
+                if len(futures) >= n_chunks_in_flight:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _collect(futures.pop(future), future.result())
+                futures[executor.submit(_workspace_worker_chunk, start, start + chunk_size)] = start
+            for future in futures:
+                _collect(futures[future], future.result())
+
+    return Workspace(n_samples, tip_positions, tip_orientations, voxel_counts, voxel_origin, voxel_size)